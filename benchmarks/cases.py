@@ -0,0 +1,171 @@
+"""Benchmark cases for the memory, semantic and loop hot paths."""
+import asyncio
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+
+from mnemosyne.core.schemas import ReasoningLoop, IntentType, Watermark
+from mnemosyne.core.semantic import SemanticEngine
+from mnemosyne.memory.manager import MemoryManager
+from mnemosyne.memory.comment_store import CommentStore
+from mnemosyne.memory.checkpoints import CheckpointStore
+from mnemosyne.loop.agents import InterpretAgent
+from mnemosyne.loop.ingestion import CommentIngestor
+from mnemosyne.loop.topics import TopicClusterer
+from mnemosyne.loop.connectors import HTTPConnector, StubSignalServer, fetch_posts
+from mnemosyne.analytics.temporal import TemporalAnalyzer
+
+from .generators import make_assumptions, make_raw_comments, make_contradictions, make_strategy_changes, make_loops
+from .harness import Case
+
+def _fresh_dir(path: str) -> str:
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    return path
+
+def _populated_memory(storage_dir: str, scale: int, n_assumptions: int) -> MemoryManager:
+    memory = MemoryManager(storage_dir=_fresh_dir(storage_dir))
+    assumptions = make_assumptions(n_assumptions)
+    memory.assumptions = {a.id: a for a in assumptions}
+    memory.contradictions = make_contradictions(scale, [a.id for a in assumptions])
+    memory.strategy_changes = make_strategy_changes(max(1, scale // 100), [a.id for a in assumptions])
+    memory.loops = {l.id: l for l in make_loops(max(1, scale // 100))}
+    return memory
+
+def memory_cases(workdir: str, scale: int, n_assumptions: int) -> List[Case]:
+    storage_dir = os.path.join(workdir, "memory")
+    memory = _populated_memory(storage_dir, scale, n_assumptions)
+    memory._save()
+    assumption_ids = list(memory.assumptions)
+
+    # Same data written without indentation and read back without per-row validation
+    compact_dir = os.path.join(workdir, "memory_compact")
+    compact = _populated_memory(compact_dir, scale, n_assumptions)
+    compact.compact_json = True
+    compact._save()
+
+    def setup_process():
+        fresh = MemoryManager(storage_dir=storage_dir)
+        return fresh, make_contradictions(scale, assumption_ids, days=1, seed=99)
+
+    def setup_decay():
+        fresh = MemoryManager(storage_dir=storage_dir)
+        stale = datetime.utcnow() - timedelta(days=3)
+        for a in fresh.assumptions.values():
+            a.last_validated_at = stale
+        return fresh
+
+    return [
+        Case("memory.save", lambda _: memory._save(), items=scale),
+        Case("memory.load", lambda _: MemoryManager(storage_dir=storage_dir), items=scale),
+        Case("memory.save_compact", lambda _: compact._save(), items=scale),
+        Case("memory.load_compact_trusted", lambda _: MemoryManager(storage_dir=compact_dir, trust_storage=True), items=scale),
+        Case("memory.process_contradictions", lambda s: s[0].process_contradictions(s[1]), setup=setup_process, items=scale),
+        Case("memory.apply_decay", lambda m: m.apply_decay(), setup=setup_decay, items=n_assumptions),
+    ]
+
+def temporal_cases(scale: int, n_assumptions: int) -> List[Case]:
+    assumptions = make_assumptions(n_assumptions)
+    target = assumptions[0]
+    contradictions = make_contradictions(scale, [target.id], days=60)
+    analyzer = TemporalAnalyzer()
+    return [
+        Case(
+            "temporal.analyze_assumption_trajectory",
+            lambda _: analyzer.analyze_assumption_trajectory(target.current_confidence, target.created_at, contradictions, lookback_days=30),
+            items=scale
+        )
+    ]
+
+def semantic_cases(scale: int) -> List[Case]:
+    """Single-text encode() calls, one caller vs. many concurrent callers sharing the micro-batcher."""
+    engine = SemanticEngine()
+    texts = [f"signal {i}: the engineering narrative feels like marketing" for i in range(scale)]
+    pool = ThreadPoolExecutor(max_workers=16)
+    return [
+        Case("semantic.encode_sequential", lambda _: [engine.encode(t) for t in texts], items=scale),
+        Case("semantic.encode_concurrent_16", lambda _: list(pool.map(engine.encode, texts)), items=scale),
+    ]
+
+def loop_cases(workdir: str, scale: int, n_assumptions: int) -> List[Case]:
+    comments_path = os.path.join(workdir, "raw_comments.json")
+    raw_comments = make_raw_comments(scale)
+    with open(comments_path, "w") as f:
+        json.dump(raw_comments, f)
+
+    # Without near-duplicate collapsing, so the interpret cases keep scoring every synthetic comment.
+    # In-memory topic clusterers (no path), so benchmark runs never touch saved centroids.
+    ingestor = CommentIngestor(dedup=False, topics=TopicClusterer())
+    dedup_ingestor = CommentIngestor(dedup=True, topics=TopicClusterer())
+    comments = ingestor.ingest_from_file(comments_path, post_id="post_001")
+    critiques = sum(1 for c in comments if c.intent == IntentType.CRITIQUE)
+
+    # Watermark covering the first 90% of the export, as left by an earlier cycle
+    head_path = os.path.join(workdir, "raw_comments_head.json")
+    with open(head_path, "w") as f:
+        json.dump(raw_comments[:scale * 9 // 10], f)
+    _, watermark = ingestor.ingest_since(head_path, "post_001", Watermark(key="bench"))
+    agent = InterpretAgent(prefilter=None)
+    prefilter_agent = InterpretAgent(prefilter="int8")
+
+    # Ingested comments persisted with their embeddings; reading critiques back replaces re-ingestion
+    comment_store = CommentStore(_fresh_dir(os.path.join(workdir, "comments")))
+    comment_store.append(comments)
+
+    # Stage checkpoint holding the ingested comments (with embeddings), as LoopOrchestrator writes after OBSERVE
+    checkpoints = CheckpointStore(_fresh_dir(os.path.join(workdir, "checkpoints")))
+    checkpoint_loop = ReasoningLoop(id="loop_bench", org_id="org_bench")
+    checkpoints.save(checkpoint_loop, {"comments": comments})
+
+    # Same export spread over 8 posts behind a local HTTP server with 5 ms per request
+    server = StubSignalServer([dict(r, post_id=f"post_{i % 8}") for i, r in enumerate(raw_comments)], latency=0.005).start()
+    connector = HTTPConnector(server.url)
+    post_ids = [f"post_{i}" for i in range(8)]
+
+    async def fetch(concurrency: int):
+        try:
+            await fetch_posts(connector, post_ids, concurrency=concurrency, limit=100)
+        finally:
+            await connector.aclose()
+
+    def run_fetch(concurrency: int):
+        asyncio.run(fetch(concurrency))
+
+    def setup_interpret():
+        # Fresh assumptions each run (InterpretAgent lazily embeds missing statements)
+        assumptions = make_assumptions(n_assumptions)
+        return {"comments": comments, "assumptions": assumptions}
+
+    def run_interpret(context, agent=agent):
+        loop = ReasoningLoop(id="loop_bench", org_id="org_bench")
+        asyncio.run(agent.process(loop, context))
+
+    return [
+        Case("ingestion.ingest_from_file", lambda _: ingestor.ingest_from_file(comments_path, post_id="post_001"), items=scale),
+        Case("ingestion.ingest_from_file_dedup", lambda _: dedup_ingestor.ingest_from_file(comments_path, post_id="post_001"), items=scale),
+        Case("ingestion.ingest_since_tail", lambda _: ingestor.ingest_since(comments_path, "post_001", watermark), items=scale),
+        Case("memory.comment_store.scan_critiques", lambda _: comment_store.scan(intents=[IntentType.CRITIQUE]), items=critiques),
+        Case("memory.checkpoint.save", lambda _: checkpoints.save(checkpoint_loop, {"comments": comments}), items=scale),
+        Case("memory.checkpoint.load", lambda _: checkpoints.load("loop_bench"), items=scale),
+        Case("connectors.fetch_posts_http_serial", lambda _: run_fetch(1), items=scale),
+        Case("connectors.fetch_posts_http", lambda _: run_fetch(8), items=scale),
+        Case("loop.interpret_agent.process", run_interpret, setup=setup_interpret, items=critiques * n_assumptions),
+        Case("loop.interpret_agent.process_int8", lambda context: run_interpret(context, prefilter_agent), setup=setup_interpret, items=critiques * n_assumptions),
+    ]
+
+def all_cases(workdir: str, scale: int, n_assumptions: int) -> List[Case]:
+    return (
+        memory_cases(workdir, scale, n_assumptions)
+        + temporal_cases(scale, n_assumptions)
+        + semantic_cases(scale)
+        + loop_cases(workdir, scale, n_assumptions)
+    )
+
+def install_stub_embeddings(dimensions: int = 384):
+    """Routes SemanticEngine to the deterministic offline model."""
+    from .stub_embeddings import HashingEmbeddingModel
+    SemanticEngine.set_model(HashingEmbeddingModel(dimensions))
@@ -0,0 +1,119 @@
+"""Synthetic, seeded data generators for the benchmark suite."""
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from mnemosyne.core.schemas import (
+    Assumption, InsightContradiction, LinkStrength, ReasoningLoop, ReasoningStep, LoopStage, StrategyChange
+)
+
+SUBJECTS = ["engineers", "customers", "candidates", "executives", "developers", "designers", "founders", "analysts"]
+VERBS = ["trust", "prefer", "ignore", "distrust", "share", "question", "value", "reward"]
+OBJECTS = [
+    "transparent communication", "polished marketing", "visible complexity", "minimal visuals",
+    "employee stories", "technical documentation", "dark-mode visuals", "consistent posting",
+    "viral campaigns", "customer case studies", "founder interviews", "product demos"
+]
+CRITIQUE_TEMPLATES = [
+    "This feels wrong, {obj} is not what {subj} want.",
+    "Honestly {obj} looks bad and fake to most {subj}.",
+    "I'm skeptical, {subj} are showing fatigue with {obj}.",
+    "The {obj} angle is slow and fails to land with {subj}.",
+]
+OTHER_TEMPLATES = [
+    "Where can I read more about {obj}?",
+    "Love the {obj}, great work!",
+    "Nice post about {obj} for {subj}",
+    "ok",
+]
+AUTHOR_TYPES = ["employee", "candidate", "customer", "unknown"]
+
+def make_assumptions(count: int, seed: int = 7) -> List[Assumption]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    assumptions = []
+    for i in range(count):
+        statement = f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(VERBS)} {rng.choice(OBJECTS)}."
+        assumptions.append(Assumption(
+            id=f"asm_{i:07d}",
+            statement=statement,
+            supporting_insights=[],
+            current_confidence=rng.uniform(0.3, 1.0),
+            last_validated_at=now - timedelta(days=rng.randint(0, 30)),
+            created_at=now - timedelta(days=rng.randint(30, 365))
+        ))
+    return assumptions
+
+def make_raw_comments(count: int, critique_ratio: float = 0.4, seed: int = 11) -> List[Dict[str, Any]]:
+    """Raw platform-export records in the shape CommentIngestor reads (see raw_comments.json)."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    comments = []
+    for i in range(count):
+        templates = CRITIQUE_TEMPLATES if rng.random() < critique_ratio else OTHER_TEMPLATES
+        text = rng.choice(templates).format(obj=rng.choice(OBJECTS), subj=rng.choice(SUBJECTS))
+        comments.append({
+            "comment_id": f"c{i}",
+            "post_id": "post_001",
+            "author": f"user_{rng.randint(0, count // 4 + 1)}",
+            "author_type": rng.choice(AUTHOR_TYPES),
+            "text": text,
+            "timestamp": (start + timedelta(seconds=i * 37)).isoformat()
+        })
+    return comments
+
+def make_contradictions(count: int, assumption_ids: List[str], days: int = 60, seed: int = 13) -> List[InsightContradiction]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    strengths = [(LinkStrength.STRONG, 0.15), (LinkStrength.MODERATE, 0.08), (LinkStrength.WEAK, 0.02)]
+    contradictions = []
+    for i in range(count):
+        strength, delta = rng.choice(strengths)
+        score = rng.uniform(0.25, 0.9)
+        contradictions.append(InsightContradiction(
+            insight_id=rng.choice(assumption_ids),
+            source_id=f"cmt_{i}",
+            rationale=f"Semantic contradiction detected (Score: {score:.2f}) with: '{rng.choice(CRITIQUE_TEMPLATES)[:50]}...'",
+            confidence_delta=delta,
+            timestamp=now - timedelta(seconds=rng.randint(0, days * 86400)),
+            link_strength=strength,
+            semantic_score=score
+        ))
+    return contradictions
+
+def make_strategy_changes(count: int, assumption_ids: List[str], seed: int = 17) -> List[StrategyChange]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        StrategyChange(
+            insight_id=rng.choice(assumption_ids),
+            related_assumption_ids=[rng.choice(assumption_ids)],
+            previous_assumption="Existing strategy is robust.",
+            triggering_signals=["Synthetic critique signal."],
+            confidence_from=1.0,
+            confidence_to=0.85,
+            decision="Maintain current strategy.",
+            justification="Synthetic benchmark record.",
+            acknowledged_risks=["None"],
+            review_horizon=now + timedelta(days=30),
+            timestamp=now - timedelta(minutes=i)
+        )
+        for i in range(count)
+    ]
+
+def make_loops(count: int, steps_per_loop: int = 6) -> List[ReasoningLoop]:
+    stages = list(LoopStage)
+    loops = []
+    for i in range(count):
+        steps = [
+            ReasoningStep(
+                stage=stages[j % len(stages)],
+                intent="Synthetic step",
+                context_used=["org_bench"],
+                decisions=["Synthetic decision"],
+                rationale="Synthetic rationale for benchmarking."
+            )
+            for j in range(steps_per_loop)
+        ]
+        loops.append(ReasoningLoop(id=f"loop_{i:07d}", org_id="org_bench", steps=steps))
+    return loops
@@ -0,0 +1,81 @@
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+class Case:
+    """A single timed operation. setup() runs untimed before every repetition and its result is passed to run()."""
+    def __init__(self, name: str, run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None, items: int = 1):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.items = items # Work units per run, for per-item cost
+
+class CaseResult:
+    def __init__(self, name: str, items: int):
+        self.name = name
+        self.items = items
+        self.timings_s: List[float] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        best = min(self.timings_s)
+        return {
+            "items": self.items,
+            "repeat": len(self.timings_s),
+            "min_s": best,
+            "median_s": statistics.median(self.timings_s),
+            "mean_s": statistics.fmean(self.timings_s),
+            "per_item_us": best / max(self.items, 1) * 1e6,
+        }
+
+def run_case(case: Case, repeat: int = 3, quiet: bool = True) -> CaseResult:
+    """Times case.run `repeat` times. With quiet=True, stdout goes to /dev/null (writes still cost, as in production)."""
+    result = CaseResult(case.name, case.items)
+    for _ in range(repeat):
+        state = case.setup() if case.setup else None
+        with open(os.devnull, "w") as sink, (contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext()):
+            start = time.perf_counter()
+            case.run(state)
+            result.timings_s.append(time.perf_counter() - start)
+    return result
+
+def environment_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit or None,
+    }
+
+def write_report(path: str, meta: Dict[str, Any], results: List[CaseResult]):
+    report = {"meta": meta, "results": {r.name: r.to_dict() for r in results}}
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def compare_reports(baseline_path: str, results: List[CaseResult], tolerance: float = 0.10) -> List[str]:
+    """Returns human-readable lines comparing min timings against a baseline report; flags regressions beyond tolerance."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)["results"]
+    lines = []
+    for r in results:
+        if r.name not in baseline:
+            lines.append(f"  {r.name:<40} (new)")
+            continue
+        before = baseline[r.name]["min_s"]
+        after = min(r.timings_s)
+        ratio = after / before if before else float("inf")
+        flag = "REGRESSION" if ratio > 1 + tolerance else ("faster" if ratio < 1 - tolerance else "")
+        lines.append(f"  {r.name:<40} {before * 1e3:10.2f} ms -> {after * 1e3:10.2f} ms  x{ratio:5.2f} {flag}")
+    return lines
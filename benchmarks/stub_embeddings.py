@@ -0,0 +1,34 @@
+import hashlib
+import re
+from typing import List, Union
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+class HashingEmbeddingModel:
+    """
+    Deterministic offline stand-in for SentenceTransformer.
+    Hashes word unigrams and bigrams into a fixed number of signed dimensions and L2-normalises,
+    so texts sharing vocabulary get high cosine similarity. No downloads, no torch.
+    """
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self._embed(sentences)
+        if not sentences:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.stack([self._embed(s) for s in sentences])
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimensions] += 1.0 if (value >> 63) else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import tempfile
+
+# Ensure 'src' is in python path
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from benchmarks.harness import run_case, environment_info, write_report, compare_reports
+from benchmarks.cases import all_cases, install_stub_embeddings
+from mnemosyne.core.log import configure_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Mnemosyne hot-path benchmarks")
+    parser.add_argument("--scale", type=int, default=1000, help="Records per collection (comments, contradictions)")
+    parser.add_argument("--assumptions", type=int, default=20, help="Number of assumptions")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="Comma-separated case name prefixes to run")
+    parser.add_argument("--out", default="bench_results.json", help="JSON report path")
+    parser.add_argument("--compare", default=None, help="Baseline JSON report to compare against")
+    parser.add_argument("--real-model", action="store_true", help="Use the real sentence-transformers model instead of the offline stub")
+    parser.add_argument("--verbose", action="store_true", help="Show stdout of the code under test")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        configure_logging(level="ERROR", force=True)
+    if not args.real_model:
+        install_stub_embeddings()
+
+    prefixes = [p for p in args.only.split(",") if p]
+    print(f"--- MNEMOSYNE BENCHMARKS (scale={args.scale}, assumptions={args.assumptions}) ---")
+
+    with tempfile.TemporaryDirectory(prefix="mnemosyne_bench_") as workdir:
+        cases = all_cases(workdir, args.scale, args.assumptions)
+        if prefixes:
+            cases = [c for c in cases if any(c.name.startswith(p) for p in prefixes)]
+
+        results = []
+        for case in cases:
+            result = run_case(case, repeat=args.repeat, quiet=not args.verbose)
+            stats = result.to_dict()
+            print(f"  {case.name:<40} min {stats['min_s'] * 1e3:10.2f} ms  median {stats['median_s'] * 1e3:10.2f} ms  {stats['per_item_us']:9.2f} us/item")
+            results.append(result)
+
+    meta = environment_info()
+    meta.update({"scale": args.scale, "assumptions": args.assumptions, "embedding_model": "real" if args.real_model else "stub"})
+    write_report(args.out, meta, results)
+    print(f"\nReport written to {args.out}")
+
+    if args.compare:
+        print(f"\n[COMPARISON vs {args.compare}]")
+        for line in compare_reports(args.compare, results):
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import os
+import resource
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Ensure 'src' is in python path
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from benchmarks.generators import make_assumptions, make_raw_comments
+from mnemosyne.core.schemas import IntentType
+from mnemosyne.core.semantic import MODEL_BACKENDS, load_model
+from mnemosyne.loop.agents import LINK_BANDS
+from mnemosyne.loop.ingestion import CommentIngestor
+from mnemosyne.memory.manager import MemoryManager
+
+# InterpretAgent's link-strength band edges, ascending
+LINK_THRESHOLDS = sorted(threshold for threshold, _, _ in LINK_BANDS)
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size (Linux); falls back to the peak from getrusage elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def load_pairs(args) -> Tuple[List[str], List[str]]:
+    """Assumption statements and critique texts, from real storage/exports where given, synthetic otherwise."""
+    if args.storage:
+        assumptions = [a.statement for a in MemoryManager(storage_dir=args.storage).get_assumptions()]
+    else:
+        assumptions = [a.statement for a in make_assumptions(args.assumptions)]
+
+    if args.comments:
+        comments = CommentIngestor().ingest_from_file(args.comments, post_id=args.post_id)
+        critiques = [c.content for c in comments if c.intent == IntentType.CRITIQUE]
+    else:
+        critiques = [c["text"] for c in make_raw_comments(args.critiques, critique_ratio=1.0)]
+    return assumptions, critiques[:args.critiques]
+
+def encode(model, texts: List[str], batch_size: int) -> Tuple[np.ndarray, float]:
+    """L2-normalised embeddings and the best-of-3 wall time per text."""
+    model.encode(texts[:batch_size], batch_size=batch_size) # warm-up
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        vectors = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+        best = min(best, time.perf_counter() - start)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors, best / len(texts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares a quantized embedding backend against fp32 torch on assumption/critique pairs")
+    parser.add_argument("--backend", default="onnx-int8", choices=[b for b in MODEL_BACKENDS if b != "torch"])
+    parser.add_argument("--storage", default=None, help="Take assumptions from this MemoryManager storage dir instead of synthetic ones")
+    parser.add_argument("--comments", default=None, help="Take critiques from this raw comment export (e.g. raw_comments.json)")
+    parser.add_argument("--post-id", default="post_001")
+    parser.add_argument("--assumptions", type=int, default=50, help="Synthetic assumptions when --storage is not given")
+    parser.add_argument("--critiques", type=int, default=500, help="Max critiques to compare")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--min-cosine", type=float, default=0.97, help="Fail if any text's quantized embedding is less similar than this to fp32")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="Fail if fewer pairs than this land in the same link-strength band")
+    args = parser.parse_args()
+
+    assumptions, critiques = load_pairs(args)
+    if not assumptions or not critiques:
+        sys.exit("Need at least one assumption and one critique")
+    texts = assumptions + critiques
+    print(f"--- EMBEDDING ACCURACY: torch (fp32) vs {args.backend} ---")
+    print(f"{len(assumptions)} assumptions x {len(critiques)} critiques = {len(assumptions) * len(critiques)} pairs")
+
+    results = {}
+    for backend in ("torch", args.backend):
+        before = rss_mb()
+        start = time.perf_counter()
+        model = load_model(backend)
+        load_s = time.perf_counter() - start
+        after = rss_mb()
+        vectors, per_text_s = encode(model, texts, args.batch_size)
+        results[backend] = vectors
+        print(f"  {backend:<11} load {load_s:6.2f} s  rss +{after - before:7.1f} MB  {per_text_s * 1e3:7.3f} ms/text")
+        del model
+
+    ref, cand = results["torch"], results[args.backend]
+    self_cos = np.sum(ref * cand, axis=1)
+
+    n = len(assumptions)
+    ref_scores = ref[:n] @ ref[n:].T
+    cand_scores = cand[:n] @ cand[n:].T
+    score_err = np.abs(ref_scores - cand_scores)
+    bands_agree = float(np.mean(np.digitize(ref_scores, LINK_THRESHOLDS) == np.digitize(cand_scores, LINK_THRESHOLDS)))
+    top1_agree = float(np.mean(ref_scores.argmax(axis=0) == cand_scores.argmax(axis=0)))
+
+    print("\n[ACCURACY]")
+    print(f"  embedding cosine to fp32   min {self_cos.min():.4f}  mean {self_cos.mean():.4f}")
+    print(f"  pair score |error|         max {score_err.max():.4f}  mean {score_err.mean():.4f}")
+    print(f"  link-strength band agree   {bands_agree:.2%}")
+    print(f"  top-1 assumption agree     {top1_agree:.2%}")
+
+    ok = self_cos.min() >= args.min_cosine and bands_agree >= args.min_agreement
+    print(f"\n{'PASS' if ok else 'FAIL'}: min cosine >= {args.min_cosine}, band agreement >= {args.min_agreement:.0%}")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -118,8 +118,8 @@ def run_stress_test():
     memory.process_contradictions(contradictions)
     
     # 6. Round 2: Final State
-    updated_chaos = memory.assumptions["asm_chaos_trust"]
-    updated_order = memory.assumptions["asm_order_trust"]
+    updated_chaos = memory.get_assumption("asm_chaos_trust")
+    updated_order = memory.get_assumption("asm_order_trust")
     
     print("\n[ROUND 2: RESULT]")
     print(f"  {updated_chaos.id}: Confidence {updated_chaos.current_confidence:.2f} (Delta: {updated_chaos.current_confidence - 1.0:.2f})")
@@ -0,0 +1,172 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_AUDIT_DIR = "storage/audit/prompts"
+
+class PromptAuditLog:
+    """
+    Append-only, compressed audit trail of compiled prompts.
+
+    record() only enqueues; a background writer batches records and appends each batch as one
+    gzip member to a daily segment (<day>.<pid>.jsonl.gz — concatenated members are still a valid
+    gzip file). Every record also gets a line in index.<pid>.jsonl pointing at its member, so a
+    lookup by brief id decompresses a single small member instead of scanning logs.
+    Segments and index files are per process, so several workers can share one directory.
+    """
+    def __init__(self, root: str = DEFAULT_AUDIT_DIR, batch_size: int = 64, flush_interval: float = 1.0):
+        self.root = root
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        os.makedirs(self.root, exist_ok=True)
+
+        # brief_id -> [(segment, offset, length)]
+        self._index: Dict[str, List[Tuple[str, int, int]]] = {}
+        self._index_offsets: Dict[str, int] = {}
+        self._index_lock = threading.Lock()
+        self._refresh_index()
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="prompt-audit-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # --- Write path ---
+
+    def record(self, brief_id: str, prompt: str, **metadata: Any):
+        """Queues a prompt for persistence. Never blocks on I/O."""
+        entry = {"brief_id": brief_id, "ts": datetime.utcnow().isoformat(), "prompt": prompt}
+        entry.update(metadata)
+        self._queue.put(entry)
+
+    def flush(self):
+        """Blocks until everything recorded so far is on disk."""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _run(self):
+        batch: List[Dict[str, Any]] = []
+        deadline = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+            except queue.Empty:
+                # Flush interval elapsed with a partial batch
+                self._commit(batch)
+                batch = []
+                continue
+            if item is None:
+                self._commit(batch)
+                self._queue.task_done()
+                return
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._commit(batch)
+                batch = []
+
+    def _commit(self, batch: List[Dict[str, Any]]):
+        self._write_batch(batch)
+        for _ in batch:
+            self._queue.task_done()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        # One member per (day, batch) so range reads can go straight to the right segment
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in batch:
+            by_day.setdefault(entry["ts"][:10], []).append(entry)
+        try:
+            index_lines = []
+            for day, entries in by_day.items():
+                segment = f"{day}.{os.getpid()}.jsonl.gz"
+                payload = gzip.compress("".join(json.dumps(e, default=str) + "\n" for e in entries).encode("utf-8"))
+                with open(os.path.join(self.root, segment), "ab") as f:
+                    offset = f.tell()
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                for e in entries:
+                    index_lines.append(json.dumps({"brief_id": e["brief_id"], "ts": e["ts"], "segment": segment, "offset": offset, "length": len(payload)}))
+            with open(os.path.join(self.root, f"index.{os.getpid()}.jsonl"), "a") as f:
+                f.write("\n".join(index_lines) + "\n")
+        except Exception as e:
+            logger.error("Prompt audit write failed: %s", e, extra={"records": len(batch)})
+
+    # --- Read path ---
+
+    def lookup(self, brief_id: str) -> List[Dict[str, Any]]:
+        """All recorded prompts for a brief, oldest first (point read through the index)."""
+        self._refresh_index()
+        with self._index_lock:
+            locations = sorted(set(self._index.get(brief_id, [])))
+        results = []
+        for segment, offset, length in locations:
+            with open(os.path.join(self.root, segment), "rb") as f:
+                f.seek(offset)
+                member = gzip.decompress(f.read(length))
+            for line in member.decode("utf-8").splitlines():
+                entry = json.loads(line)
+                if entry["brief_id"] == brief_id:
+                    results.append(entry)
+        return sorted(results, key=lambda e: e["ts"])
+
+    def range(self, start: date, end: date) -> Iterator[Dict[str, Any]]:
+        """Streams every record whose day falls in [start, end], reading only those days' segments."""
+        day = start
+        while day <= end:
+            prefix = day.isoformat()
+            for name in sorted(os.listdir(self.root)):
+                if name.startswith(prefix) and name.endswith(".jsonl.gz"):
+                    with gzip.open(os.path.join(self.root, name), "rt", encoding="utf-8") as f:
+                        for line in f:
+                            yield json.loads(line)
+            day += timedelta(days=1)
+
+    def _refresh_index(self):
+        """Reads index lines appended (by any process) since the last refresh."""
+        with self._index_lock:
+            for name in os.listdir(self.root):
+                if not (name.startswith("index.") and name.endswith(".jsonl")):
+                    continue
+                path = os.path.join(self.root, name)
+                seen = self._index_offsets.get(name, 0)
+                if os.path.getsize(path) <= seen:
+                    continue
+                with open(path, "rb") as f:
+                    f.seek(seen)
+                    chunk = f.read()
+                # Only consume complete lines; a partial tail is picked up next time
+                complete = chunk[:chunk.rfind(b"\n") + 1]
+                for line in complete.splitlines():
+                    if line.strip():
+                        row = json.loads(line)
+                        self._index.setdefault(row["brief_id"], []).append((row["segment"], row["offset"], row["length"]))
+                self._index_offsets[name] = seen + len(complete)
+
+_default_log: Optional[PromptAuditLog] = None
+_default_lock = threading.Lock()
+
+def default_audit_log() -> PromptAuditLog:
+    """Process-wide audit log rooted at MNEMOSYNE_AUDIT_DIR (default storage/audit/prompts)."""
+    global _default_log
+    with _default_lock:
+        if _default_log is None:
+            _default_log = PromptAuditLog(os.environ.get("MNEMOSYNE_AUDIT_DIR", DEFAULT_AUDIT_DIR))
+    return _default_log
@@ -1,8 +1,23 @@
 import cv2
 import numpy as np
-import easyocr
+import logging
 import os
-from typing import List, Dict, Any, Tuple
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from src.mnemosyne.core.metrics import metrics, timed
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
+
+# SAM post-processing
+MASK_BATCH_SIZE = 32 # Masks resized and scored together at most
+MASK_BATCH_PIXELS = 64 * 1024 * 1024 # Full-resolution mask pixels per batch (bounds peak memory on large images)
+TEXT_OVERLAP_THRESHOLD = 0.15
+MIN_OBJECT_SIZE = 10
+
+# Background reconstruction
+INPAINT_RADIUS = 3
+ROI_MARGIN = 16 # Context pixels kept around each masked region when inpainting ROI tiles
 
 class Layer:
     def __init__(self, type: str, content: Any, bbox: List[int], style: Dict[str, Any]):
@@ -31,24 +46,75 @@ class ImageDecomposer:
     """
     Intelligent layer separation service.
     Uses EasyOCR for text detection and MobileSAM for generic segmentation.
+
+    single_pass_inpaint: accumulate text and object masks and reconstruct the background
+        with one inpaint pass instead of one pass per layer type. SAM then runs on the image
+        before text removal, so object cut-outs include the text pixels overlapping them.
+    roi_inpaint: inpaint only padded tiles around masked regions instead of the whole frame.
+    analysis_max_side: run OCR and segmentation on a copy downscaled so its longest side is
+        at most this many pixels. Boxes and masks are mapped back to full resolution, so
+        layers and background keep full fidelity. None analyses at full resolution.
+
+    EasyOCR and MobileSAM are loaded on first use, or ahead of time via warm_up().
     """
-    def __init__(self):
-        print("DEBUG: Initializing ImageDecomposer...")
-        print("DEBUG: Initializing EasyOCR Reader...")
-        self.reader = easyocr.Reader(['en']) 
-        print("DEBUG: Initializing MobileSAM...")
-        try:
-            # Lazy import to avoid OpenCV conflicts
-            from ultralytics import SAM
-            # Ultralytics SAM wrapper downloads mobile_sam.pt automatically
-            self.model = SAM("mobile_sam.pt") 
-            print("DEBUG: MobileSAM Model Loaded.")
-        except Exception as e:
-            print(f"DEBUG: SAM Init Failed: {e}")
-            self.model = None
+    def __init__(self, single_pass_inpaint: bool = False, roi_inpaint: bool = False, analysis_max_side: Optional[int] = None):
+        self.single_pass_inpaint = single_pass_inpaint
+        self.roi_inpaint = roi_inpaint
+        self.analysis_max_side = analysis_max_side
+        self._reader = None
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """True once the OCR and segmentation models have been loaded."""
+        return self._ready.is_set()
 
+    @property
+    def reader(self):
+        self._load_models()
+        return self._reader
+
+    @property
+    def model(self):
+        self._load_models()
+        return self._model
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Loads the models now instead of on the first decompose() call."""
+        if not background:
+            self._load_models()
+            return None
+        thread = threading.Thread(target=self._load_models, name="decomposer-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_models(self):
+        if self._ready.is_set():
+            return
+        with self._load_lock:
+            if self._ready.is_set():
+                return
+            logger.debug("Initializing ImageDecomposer...")
+            logger.debug("Initializing EasyOCR Reader...")
+            import easyocr
+            self._reader = easyocr.Reader(['en']) 
+            logger.debug("Initializing MobileSAM...")
+            try:
+                # Lazy import to avoid OpenCV conflicts
+                from ultralytics import SAM
+                # Ultralytics SAM wrapper downloads mobile_sam.pt automatically
+                self._model = SAM("mobile_sam.pt") 
+                logger.debug("MobileSAM Model Loaded.")
+            except Exception as e:
+                logger.warning("SAM Init Failed: %s", e)
+                self._model = None
+            self._ready.set()
+
+    @timed("mnemosyne_decompose_seconds")
     def decompose(self, image_path: str) -> DecomposedAsset:
-        print(f"DEBUG: Decomposing {image_path}...")
+        logger.debug("Decomposing %s...", image_path)
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image not found: {image_path}")
 
@@ -61,19 +127,25 @@ class ImageDecomposer:
         mask_accumulator = np.zeros(img.shape[:2], dtype=np.uint8)
         
         # 2. Extract Text First (Text is usually top layer)
-        print("DEBUG: Step 1 - Extract Text")
+        logger.debug("Step 1 - Extract Text")
         # capture the specific mask of text areas
         text_structure_mask = np.zeros(img.shape[:2], dtype=np.uint8)
-        img_no_text = self._extract_text(img, image_path, layers, mask_accumulator, text_structure_mask)
+        # In single-pass mode the extractors only contribute their dilated masks here
+        deferred_mask = np.zeros(img.shape[:2], dtype=np.uint8) if self.single_pass_inpaint else None
+        img_no_text = self._extract_text(img, image_path, layers, mask_accumulator, text_structure_mask, deferred_mask)
         
         # 3. Extract Objects (from image with text removed)
         if self.model:
-            print("DEBUG: Step 2 - Extract Objects (MobileSAM)")
+            logger.debug("Step 2 - Extract Objects (MobileSAM)")
             # Pass the text mask so we can ignore objects that are actually text
-            img_clean_bg = self._extract_objects(img_no_text, image_path, layers, mask_accumulator, text_structure_mask)
+            img_clean_bg = self._extract_objects(img_no_text, image_path, layers, mask_accumulator, text_structure_mask, deferred_mask)
         else:
             img_clean_bg = img_no_text
 
+        if deferred_mask is not None and cv2.countNonZero(deferred_mask) > 0:
+            logger.debug("Step 3 - Single-pass inpainting")
+            img_clean_bg = self._inpaint(img, deferred_mask)
+
         # 4. Save Final Background
         dir_name = os.path.dirname(image_path)
         base_name = os.path.basename(image_path)
@@ -81,29 +153,33 @@ class ImageDecomposer:
         bg_path = os.path.join(dir_name, bg_filename)
         cv2.imwrite(bg_path, img_clean_bg)
 
-        print(f"DEBUG: Decomposition Complete. Layers: {len(layers)}")
+        metrics.inc("mnemosyne_decompose_layers_total", len(layers))
+        logger.info("Decomposition complete", extra={"image": image_path, "layers": len(layers)})
         return DecomposedAsset(bg_filename, layers)
 
-    def _extract_text(self, img, image_path, layers, mask_accumulator, text_structure_mask):
-        """Finds text, creates layers, and returns image with text removed."""
+    def _extract_text(self, img, image_path, layers, mask_accumulator, text_structure_mask, deferred_mask=None):
+        """Finds text, creates layers, and returns image with text removed (or untouched if inpainting is deferred)."""
         try:
             # Pass GRAYSCALE numpy array to avoid shape unpacking errors (3 dims vs 2 dims)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            results = self.reader.readtext(gray)
-            print(f"DEBUG: Found {len(results)} text blocks.")
+            analysis_img, scale = self._analysis_copy(img)
+            gray = cv2.cvtColor(analysis_img, cv2.COLOR_BGR2GRAY)
+            with metrics.timer("mnemosyne_decompose_stage_seconds", stage="ocr"):
+                results = self.reader.readtext(gray)
+            logger.debug("Found %d text blocks.", len(results))
         except Exception as e:
-            print(f"DEBUG: EasyOCR Failed: {e}")
+            logger.warning("EasyOCR Failed: %s", e)
             return img.copy()
 
         inpainting_mask = np.zeros(img.shape[:2], dtype=np.uint8)
         
         for (bbox, text, prob) in results:
+            # Map the detection back from analysis to full resolution
             top_left = bbox[0]
             bottom_right = bbox[2]
-            x = int(top_left[0])
-            y = int(top_left[1])
-            w = int(bottom_right[0] - x)
-            h = int(bottom_right[1] - y)
+            x = int(top_left[0] / scale)
+            y = int(top_left[1] / scale)
+            w = int(bottom_right[0] / scale - x)
+            h = int(bottom_right[1] / scale - y)
             
             # Color detection
             roi = img[y:y+h, x:x+w]
@@ -129,113 +205,155 @@ class ImageDecomposer:
         if layers:
              kernel = np.ones((3,3), np.uint8)
              dilated_mask = cv2.dilate(inpainting_mask, kernel, iterations=2)
-             return cv2.inpaint(img, dilated_mask, 3, cv2.INPAINT_NS)
+             if deferred_mask is not None:
+                 cv2.bitwise_or(deferred_mask, dilated_mask, dst=deferred_mask)
+                 return img
+             return self._inpaint(img, dilated_mask)
         return img.copy()
 
-    def _extract_objects(self, img, image_path, layers, mask_accumulator, text_structure_mask):
+    def _extract_objects(self, img, image_path, layers, mask_accumulator, text_structure_mask, deferred_mask=None):
         """Use MobileSAM to segment generic objects."""
-        print("DEBUG: Running MobileSAM Inference...")
+        logger.debug("Running MobileSAM Inference...")
         try:
             # Check image
-            print(f"DEBUG: Image shape: {img.shape}, dtype: {img.dtype}")
+            analysis_img, scale = self._analysis_copy(img)
+            logger.debug("Image shape: %s, analysis shape: %s, dtype: %s", img.shape, analysis_img.shape, img.dtype)
             
-            # Run inference
-            print("DEBUG: Calling self.model()...")
-            results = self.model(img, verbose=False)
-            print("DEBUG: Inference returned.")
+            # Run inference (masks are thresholded, then upscaled back to full resolution in _binarize_masks)
+            with metrics.timer("mnemosyne_decompose_stage_seconds", stage="segment"):
+                results = self.model(analysis_img, verbose=False)
             
             result = results[0]
-            print("DEBUG: Got result object.")
         except Exception as e:
-             print(f"DEBUG: SAM Inference Failed: {e}")
-             import traceback
-             traceback.print_exc()
+             logger.exception("SAM Inference Failed: %s", e)
              return img.copy()
 
         dir_name = os.path.dirname(image_path)
         base_name = os.path.basename(image_path)
         
         inpainting_mask = np.zeros(img.shape[:2], dtype=np.uint8)
+        text_region = text_structure_mask > 0
+        height, width = img.shape[:2]
         
         try:
             if result.masks:
-                print(f"DEBUG: Found {len(result.masks)} masks.")
-                # Iterate through masks. Note: SAM can return A LOT of small masks.
-                # We might want to filter by size or confidence if needed.
-                for i, mask in enumerate(result.masks.data):
-                    # Mask might be bool or float. Ensure uint8 for OpenCV.
-                    mask_np = mask.cpu().numpy()
-                    if mask_np.dtype == bool:
-                        mask_np = mask_np.astype(np.uint8) * 255
-                    
-                    mask_resized = cv2.resize(mask_np, (img.shape[1], img.shape[0]))
-                    binary_mask = (mask_resized > 127).astype(np.uint8) * 255
-
-                    # --- OVERLAP CHECK ---
-                    # Calculate overlapping pixels with known text
-                    overlap = cv2.bitwise_and(binary_mask, text_structure_mask)
-                    overlap_pixels = cv2.countNonZero(overlap)
-                    mask_pixels = cv2.countNonZero(binary_mask)
+                logger.debug("Found %d masks.", len(result.masks))
+                # SAM can return hundreds of masks. Resize, score and filter them as stacked
+                # batches so the per-mask work below only runs for masks we actually keep.
+                masks = result.masks.data
+                batch_size = max(1, min(MASK_BATCH_SIZE, MASK_BATCH_PIXELS // (height * width)))
+                for start in range(0, len(masks), batch_size):
+                    batch = self._binarize_masks(masks[start:start + batch_size], height, width)
+                    keep, boxes = self._filter_masks(batch, text_region)
                     
-                    if mask_pixels > 0:
-                        overlap_ratio = overlap_pixels / mask_pixels
-                        if overlap_ratio > 0.15: # If >15% matches text, assume it IS the text
-                            print(f"DEBUG: Skipping Object {i} (Overlap {overlap_ratio:.2f}) - likely text.")
-                            continue
+                    for j in np.flatnonzero(keep):
+                        i = start + int(j)
+                        x, y, w, h = (int(v) for v in boxes[j])
+                        binary_mask = batch[j].view(np.uint8) * 255
 
+                        # Cut Object (BGRA)
+                        obj_rgba = np.dstack((img[y:y+h, x:x+w], binary_mask[y:y+h, x:x+w]))
+                        
+                        # Save Object Layer
+                        obj_filename = f"sam_obj_{i}_{base_name}.png"
+                        obj_path = os.path.join(dir_name, obj_filename)
+                        
+                        cv2.imwrite(obj_path, obj_rgba)
+                        
+                        # SAM doesn't give class names, just "Segment"
+                        label = f"Object {i+1}"
+                        
+                        layers.append(Layer(
+                            type="object",
+                            content=obj_filename,
+                            bbox=[x, y, w, h],
+                            style={"label": label}
+                        ))
                     
-                    # Get BBox using robust findContours
-                    try:
-                        cnts = cv2.findContours(binary_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                        contours = cnts[0] if len(cnts) == 2 else cnts[1]
-                    except Exception as e:
-                        print(f"DEBUG: findContours error: {e}")
-                        continue
-                    
-                    if not contours: continue
-                    x, y, w, h = cv2.boundingRect(contours[0])
-                    
-                    # Filter tiny noise masks
-                    if w < 10 or h < 10: continue
-
-                    # Cut Object (BGRA)
-                    obj_roi = img[y:y+h, x:x+w]
-                    mask_roi = binary_mask[y:y+h, x:x+w]
-                    
-                    # Add Alpha channel
-                    b, g, r = cv2.split(obj_roi)
-                    rgba = [b, g, r, mask_roi]
-                    obj_rgba = cv2.merge(rgba, 4)
-                    
-                    # Save Object Layer
-                    obj_filename = f"sam_obj_{i}_{base_name}.png"
-                    obj_path = os.path.join(dir_name, obj_filename)
-                    
-                    cv2.imwrite(obj_path, obj_rgba)
-                    
-                    # SAM doesn't give class names, just "Segment"
-                    label = f"Object {i+1}"
-                    
-                    layers.append(Layer(
-                        type="object",
-                        content=obj_filename,
-                        bbox=[x, y, w, h],
-                        style={"label": label}
-                    ))
-                    
-                    inpainting_mask = cv2.bitwise_or(inpainting_mask, binary_mask)
+                    if keep.any():
+                        inpainting_mask[batch[keep].any(axis=0)] = 255
             else:
-                print("DEBUG: No masks found by SAM.")
+                logger.debug("No masks found by SAM.")
         except Exception as e:
-            print(f"DEBUG: Error processing masks: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing masks: %s", e)
         
         # Inpaint Objects
         if len(layers) > 0:
-             print("DEBUG: Inpainting objects...")
+             logger.debug("Inpainting objects...")
              kernel = np.ones((5,5), np.uint8)
              dilated_mask = cv2.dilate(inpainting_mask, kernel, iterations=3)
-             return cv2.inpaint(img, dilated_mask, 3, cv2.INPAINT_NS)
+             if deferred_mask is not None:
+                 cv2.bitwise_or(deferred_mask, dilated_mask, dst=deferred_mask)
+                 return img
+             return self._inpaint(img, dilated_mask)
         
         return img.copy()
+
+    def _analysis_copy(self, img) -> Tuple[np.ndarray, float]:
+        """Returns the image used for detection and its scale relative to the full-resolution image."""
+        height, width = img.shape[:2]
+        if not self.analysis_max_side or max(height, width) <= self.analysis_max_side:
+            return img, 1.0
+        scale = self.analysis_max_side / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(img, size, interpolation=cv2.INTER_AREA), scale
+
+    @timed("mnemosyne_decompose_stage_seconds", stage="inpaint")
+    def _inpaint(self, img, mask):
+        """Reconstructs masked pixels, either over the full frame or per ROI tile."""
+        if not self.roi_inpaint:
+            return cv2.inpaint(img, mask, INPAINT_RADIUS, cv2.INPAINT_NS)
+
+        result = img.copy()
+        height, width = mask.shape[:2]
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        # Label 0 is the unmasked background
+        for x, y, w, h, _area in stats[1:count]:
+            x0, y0 = max(0, x - ROI_MARGIN), max(0, y - ROI_MARGIN)
+            x1, y1 = min(width, x + w + ROI_MARGIN), min(height, y + h + ROI_MARGIN)
+            result[y0:y1, x0:x1] = cv2.inpaint(
+                np.ascontiguousarray(result[y0:y1, x0:x1]),
+                np.ascontiguousarray(mask[y0:y1, x0:x1]),
+                INPAINT_RADIUS, cv2.INPAINT_NS
+            )
+        logger.debug("Inpainted %d ROI tile(s).", count - 1)
+        return result
+
+    def _binarize_masks(self, masks, height: int, width: int) -> np.ndarray:
+        """
+        Thresholds a stack of SAM masks at analysis resolution, then resizes them to (height, width)
+        as uint8 (nearest neighbour) in one batched op, so no float copy exists at full resolution.
+        Returns an (N, H, W) bool array.
+        """
+        import torch.nn.functional as F
+
+        masks = (masks > 0.5).cpu().byte()
+        if tuple(masks.shape[-2:]) != (height, width):
+            masks = F.interpolate(masks.unsqueeze(1), size=(height, width), mode="nearest").squeeze(1)
+        return masks.numpy().view(np.bool_)
+
+    def _filter_masks(self, masks: np.ndarray, text_region: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores a stack of binary masks with array reductions.
+        Returns a keep flag per mask and its [x, y, w, h] bounding box.
+        """
+        n = len(masks)
+        flat = masks.reshape(n, -1)
+        mask_pixels = np.count_nonzero(flat, axis=1)
+        overlap_pixels = np.count_nonzero(flat & text_region.reshape(1, -1), axis=1)
+        # If >15% of a mask matches text, assume it IS the text
+        overlap_ratio = overlap_pixels / np.maximum(mask_pixels, 1)
+
+        rows = masks.any(axis=2)
+        cols = masks.any(axis=1)
+        y0 = rows.argmax(axis=1)
+        x0 = cols.argmax(axis=1)
+        h = masks.shape[1] - rows[:, ::-1].argmax(axis=1) - y0
+        w = masks.shape[2] - cols[:, ::-1].argmax(axis=1) - x0
+        boxes = np.stack([x0, y0, w, h], axis=1)
+
+        # Filter empty masks, text masks and tiny noise masks
+        keep = (mask_pixels > 0) & (overlap_ratio <= TEXT_OVERLAP_THRESHOLD) & (w >= MIN_OBJECT_SIZE) & (h >= MIN_OBJECT_SIZE)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Kept %d/%d masks in batch.", int(keep.sum()), n)
+        return keep, boxes
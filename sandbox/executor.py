@@ -3,6 +3,9 @@ from datetime import datetime
 from src.monthly_production.schemas import PostBrief
 from .gemini_client import GeminiImageClient
 from .prompt_compiler import PromptCompiler
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
 
 class GeneratedAsset:
     def __init__(self, path: str, prompt: str, metadata: Dict[str, Any]):
@@ -29,7 +32,7 @@ class ContentExecutor:
         prompt = self.compiler.compile(brief)
         
         # 2. Execution
-        print(f"  > Executing Image Generation for Post {brief.id}...")
+        logger.info("Executing image generation", extra={"post_id": brief.id})
         path = self.client.generate_image(prompt)
         
         # 3. Traceability Metadata
@@ -3,6 +3,10 @@ import random
 from PIL import Image, ImageDraw, ImageFont
 from google import genai
 from typing import Optional
+from src.mnemosyne.core.metrics import metrics
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
 
 class GeminiImageClient:
     """
@@ -12,7 +16,7 @@ class GeminiImageClient:
     def __init__(self):
         api_key = os.environ.get("GEMINI_API_KEY")
         if not api_key:
-            print("WARNING: GEMINI_API_KEY not found. Sandbox will mock generation.")
+            logger.warning("GEMINI_API_KEY not found. Sandbox will mock generation.")
             self.mock_mode = True
             self.client = None
         else:
@@ -25,16 +29,18 @@ class GeminiImageClient:
         Returns: Path to saved image (simulated or real).
         """
         if self.mock_mode:
-            return self._generate_mock_placeholder(prompt)
+            with metrics.timer("mnemosyne_image_generation_seconds", mode="mock"):
+                return self._generate_mock_placeholder(prompt)
         
         try:
             # CORRECT PATTERN: Use the specific endpoint for Image Generation.
             # 3.0 is missing. 4.0-fast hit quota. Trying 4.0-standard.
-            response = self.client.models.generate_images(
-                model='imagen-4.0-generate-001',
-                prompt=prompt,
-                config=dict(number_of_images=1)
-            )
+            with metrics.timer("mnemosyne_image_generation_seconds", mode="api"):
+                response = self.client.models.generate_images(
+                    model='imagen-4.0-generate-001',
+                    prompt=prompt,
+                    config=dict(number_of_images=1)
+                )
             
             if response.generated_images:
                 image = response.generated_images[0]
@@ -51,12 +57,14 @@ class GeminiImageClient:
                 # So we should return the BASENAME only, but save to the SUBDIR.
                 return os.path.basename(filename)
             else:
-                 print("[ERROR] No images returned from Gemini. Falling back to mock.")
+                 metrics.inc("mnemosyne_image_generation_failures_total", reason="empty")
+                 logger.error("No images returned from Gemini. Falling back to mock.")
                  return self._generate_mock_placeholder(prompt)
 
         except Exception as e:
             # Graceful error handling - return a placeholder instead of crashing or text
-            print(f"[ERROR] Generation failed: {str(e)}")
+            metrics.inc("mnemosyne_image_generation_failures_total", reason="error")
+            logger.exception("Generation failed: %s", e)
             return self._generate_mock_placeholder(prompt)
 
     def _generate_mock_placeholder(self, prompt: str) -> str:
@@ -76,5 +84,5 @@ class GeminiImageClient:
             img.save(filename)
             return os.path.basename(filename)
         except Exception as e:
-            print(f"Failed to generate mock image: {e}")
+            logger.exception("Failed to generate mock image: %s", e)
             return "sandbox_output_FALLBACK.png" # Last resort
@@ -1,11 +1,17 @@
 from typing import Optional
 from src.monthly_production.schemas import PostBrief
+from src.mnemosyne.core.log import get_logger
+from .audit_log import PromptAuditLog, default_audit_log
+
+logger = get_logger(__name__)
 
 class PromptCompiler:
     """
     Internal component that translates semantic PostBriefs into detailed technical prompts.
     Invisible to the user.
     """
+    def __init__(self, audit_log: Optional[PromptAuditLog] = None):
+        self.audit_log = audit_log or default_audit_log()
     
     def compile(self, brief: PostBrief) -> str:
         """
@@ -23,11 +29,12 @@ class PromptCompiler:
         )
         
         # Log purely for traceability (simulated internal logging)
-        self._log_trace(brief.id, prompt)
+        self._log_trace(brief.id, prompt, assumptions=[a.id for a in brief.governing_assumptions], objective=brief.objective.value)
         
         return prompt
 
-    def _log_trace(self, brief_id: str, prompt: str):
-        # In a real system, this goes to a secure audit log
-        # Here we just print or could append to a file
-        print(f"[INTERNAL_LOG] Compiled Prompt for {brief_id}: {prompt}")
+    def _log_trace(self, brief_id: str, prompt: str, **metadata):
+        # Persisted to the append-only audit log (batched off the request path)
+        self.audit_log.record(brief_id, prompt, **metadata)
+        # Emitted at DEBUG: skipped entirely at higher levels, written by the background log thread otherwise
+        logger.debug("[INTERNAL_LOG] Compiled Prompt for %s: %s", brief_id, prompt, extra={"brief_id": brief_id})
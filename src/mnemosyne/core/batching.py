@@ -0,0 +1,96 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from .metrics import metrics
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+class MicroBatcher:
+    """
+    Coalesces single-item requests from many threads into batched calls on one worker thread.
+
+    submit() returns a Future. The worker takes whatever is queued (up to max_batch) and, when
+    there is evidence of concurrent callers (more work already queued, or the previous batch had
+    several items), keeps collecting for up to `window` seconds, stopping early once no new request
+    has arrived for `window / 5`. A lone sequential caller therefore pays no batching delay, and a
+    fixed set of callers that are all already waiting does not sit out the whole window.
+    Because only the worker thread calls `process_batch`, the underlying model never sees
+    concurrent calls.
+    """
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]], max_batch: int = 64, window: float = 0.005, name: str = "micro-batcher"):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: "queue.SimpleQueue[Optional[Tuple[Any, Future]]]" = queue.SimpleQueue()
+        self._last_batch_size = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = self._fill(batch)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _fill(self, batch: List[Tuple[Any, Future]]) -> bool:
+        """Adds queued requests to the batch. Returns True if close() was requested meanwhile."""
+        concurrent = not self._queue.empty() or self._last_batch_size > 1
+        deadline = time.monotonic() + self.window if concurrent else 0.0
+        gap = self.window / 5
+        while len(batch) < self.max_batch:
+            try:
+                remaining = min(deadline - time.monotonic(), gap)
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]):
+        self._last_batch_size = len(batch)
+        # Skip requests whose callers gave up (Future.cancel() before we started)
+        live = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        metrics.inc("mnemosyne_microbatch_batches_total")
+        metrics.inc("mnemosyne_microbatch_items_total", len(live))
+        try:
+            results = self.process_batch([item for item, _ in live])
+        except Exception as e:
+            logger.error("Batched call failed: %s", e, extra={"batch_size": len(live)})
+            for _, future in live:
+                future.set_exception(e)
+            return
+        results = list(results)
+        if len(results) != len(live):
+            logger.error("Batched call returned %d results for %d items", len(results), len(live), extra={"batch_size": len(live)})
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
+        # Callers without a result must not wait forever
+        for _, future in live[len(results):]:
+            future.set_exception(RuntimeError(f"Batched call returned {len(results)} results for {len(live)} items"))
@@ -0,0 +1,212 @@
+"""
+Local embedding sidecar: one warm model shared by every process on the host.
+
+Run it with
+    python -m src.mnemosyne.core.embedding_service --address unix:/tmp/mnemosyne-embed.sock
+and point workers at it with MNEMOSYNE_EMBED_SERVICE=unix:/tmp/mnemosyne-embed.sock
+(or tcp:127.0.0.1:8765). SemanticEngine then sends texts here instead of loading torch itself,
+and falls back to an in-process model if the service cannot be reached.
+
+Wire format: length-prefixed frames (4-byte big-endian size). Requests are one JSON frame
+({"op": "encode", "texts": [...]} or {"op": "ping"}); encode replies are a JSON header frame
+({"ok": true, "count": n, "dim": d}) followed by one frame of float32 row-major vectors.
+Connections handled in parallel all feed the engine's micro-batcher, so concurrent requests
+from different processes share forward passes.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ADDRESS = "unix:/tmp/mnemosyne-embed.sock"
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+_HEADER = struct.Struct("!I")
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """'unix:/path', '/path', 'tcp:host:port' or 'host:port' -> (socket family, address)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("/"):
+        return socket.AF_UNIX, address
+    if address.startswith("tcp:"):
+        address = address[len("tcp:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+def send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+def recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """Returns None when the peer closed the connection cleanly."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds limit")
+    payload = _recv_exact(sock, size)
+    if payload is None:
+        raise ConnectionError("Connection closed mid-frame")
+    return payload
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ConnectionError("Connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+class EmbeddingServiceClient:
+    """Blocking client with one persistent connection per thread."""
+    def __init__(self, address: str, timeout: float = 30.0):
+        self.address = address
+        self.timeout = timeout
+        self._family, self._target = parse_address(address)
+        self._local = threading.local()
+
+    def ping(self) -> bool:
+        try:
+            return bool(self._request({"op": "ping"}).get("ok"))
+        except (OSError, ValueError):
+            return False
+
+    def encode_many(self, texts: List[str]) -> List[List[float]]:
+        """Raises OSError if the service is unreachable and RuntimeError if it failed to encode."""
+        if not texts:
+            return []
+        header = self._request({"op": "encode", "texts": list(texts)}, expect_payload=True)
+        return header["vectors"]
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, message: dict, expect_payload: bool = False) -> dict:
+        try:
+            return self._exchange(message, expect_payload)
+        except (OSError, ValueError):
+            # Retry once on a fresh connection; covers a service restart between calls
+            self.close()
+        try:
+            return self._exchange(message, expect_payload)
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _exchange(self, message: dict, expect_payload: bool) -> dict:
+        sock = self._connection()
+        send_frame(sock, json.dumps(message).encode("utf-8"))
+        raw = recv_frame(sock)
+        if raw is None:
+            raise ConnectionError("Embedding service closed the connection")
+        header = json.loads(raw)
+        if not header.get("ok"):
+            raise RuntimeError(header.get("error", "embedding service error"))
+        if expect_payload:
+            payload = recv_frame(sock) or b""
+            vectors = np.frombuffer(payload, dtype=np.float32).reshape(header["count"], header["dim"])
+            header["vectors"] = vectors.tolist()
+        return header
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(self._family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self._target)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        engine = self.server.engine
+        while True:
+            try:
+                raw = recv_frame(self.request)
+            except (OSError, ValueError):
+                return
+            if raw is None:
+                return
+            try:
+                message = json.loads(raw)
+                if message.get("op") == "ping":
+                    send_frame(self.request, json.dumps({"ok": True, "status": engine.status()}).encode("utf-8"))
+                    continue
+                vectors = engine.encode_many(message.get("texts", []))
+                if any(v is None for v in vectors):
+                    raise RuntimeError("model unavailable or encoding failed")
+                matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+                header = {"ok": True, "count": matrix.shape[0], "dim": matrix.shape[1]}
+                send_frame(self.request, json.dumps(header).encode("utf-8"))
+                send_frame(self.request, matrix.tobytes())
+            except OSError:
+                return
+            except Exception as e:
+                try:
+                    send_frame(self.request, json.dumps({"ok": False, "error": str(e)}).encode("utf-8"))
+                except OSError:
+                    return
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Every worker thread of every client process holds a connection; the default backlog of 5
+    # makes simultaneous connects fail with EAGAIN on Unix sockets
+    request_queue_size = 256
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+def serve(address: str = DEFAULT_ADDRESS):
+    from .semantic import SemanticEngine
+
+    # The sidecar itself must use the local model
+    SemanticEngine.configure_service(None)
+    engine = SemanticEngine()
+    engine.warm_up(background=False)
+    if not engine.is_ready():
+        raise SystemExit("Embedding model unavailable; is sentence-transformers installed?")
+
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)
+        server = _UnixServer(target, _Handler)
+    else:
+        server = _TCPServer(target, _Handler)
+    server.engine = engine
+    logger.info("Embedding service listening on %s", address)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if family == socket.AF_UNIX and os.path.exists(target):
+            os.unlink(target)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared local embedding service")
+    parser.add_argument("--address", default=os.environ.get("MNEMOSYNE_EMBED_SERVICE", DEFAULT_ADDRESS))
+    serve(parser.parse_args().address)
@@ -1,5 +1,6 @@
-from typing import Protocol, runtime_checkable, Any, Dict
-from .schemas import ReasoningLoop, ReasoningStep, LoopStage
+from typing import Protocol, runtime_checkable, Any, Dict, Optional
+from .schemas import ReasoningLoop, ReasoningStep, LoopStage, SignalPage
+from .metrics import metrics
 
 @runtime_checkable
 class ReasoningAgent(Protocol):
@@ -18,11 +19,36 @@ class ReasoningAgent(Protocol):
         """
         ...
 
+@runtime_checkable
+class SignalConnector(Protocol):
+    """Interface for a paginated source of raw comment/engagement records."""
+
+    name: str  # Stable identifier of the source, used in watermark keys
+
+    async def fetch_page(self, post_id: str, cursor: Optional[str], limit: int) -> SignalPage:
+        """
+        Fetch up to `limit` records for one post, starting after `cursor` (None = from the beginning).
+
+        Returns:
+            A SignalPage whose cursor resumes after the returned records. Raises ConnectorError
+            (retryable or not) on failure.
+        """
+        ...
+
 class LoopOrchestrator:
-    """Manages the transition between stages of the reasoning loop."""
-    
-    def __init__(self):
+    """
+    Manages the transition between stages of the reasoning loop.
+    With a checkpoint store (memory.checkpoints.CheckpointStore) the loop and its context artifacts
+    are saved after every completed stage, and resume() restarts an interrupted cycle at the first
+    stage that had not completed.
+    """
+    # Context keys holding live state the caller supplies on every run (fresh from memory); never
+    # checkpointed, so a resume cannot roll them back to what they were when the stage finished
+    LIVE_KEYS = frozenset({"assumptions"})
+
+    def __init__(self, checkpoints: Optional[Any] = None):
         self.stages: Dict[LoopStage, ReasoningAgent] = {}
+        self.checkpoints = checkpoints
 
     def register_agent(self, stage: LoopStage, agent: ReasoningAgent):
         self.stages[stage] = agent
@@ -32,10 +58,43 @@ class LoopOrchestrator:
             raise ValueError(f"No agent registered for stage: {loop.current_stage}")
             
         agent = self.stages[loop.current_stage]
-        step = await agent.process(loop, context)
+        with metrics.timer("mnemosyne_loop_stage_seconds", stage=loop.current_stage.value):
+            step = await agent.process(loop, context)
         
         loop.steps.append(step)
         loop.current_stage = self._get_next_stage(loop.current_stage)
+        if self.checkpoints is not None:
+            if loop.current_stage == list(LoopStage)[0]:
+                # Cycle complete: its artifacts must not leak into the next one
+                self.checkpoints.clear(loop.id)
+            else:
+                self.checkpoints.save(loop, {k: v for k, v in context.items() if k not in self.LIVE_KEYS})
+        return loop
+
+    async def run_cycle(self, loop: ReasoningLoop, context: Dict[str, Any]) -> ReasoningLoop:
+        """Runs stages until the loop is back at the first one (from wherever it currently is)."""
+        first = list(LoopStage)[0]
+        while True:
+            loop = await self.run_next(loop, context)
+            if loop.current_stage == first:
+                return loop
+
+    def resume(self, loop_id: str, context: Dict[str, Any]) -> Optional[ReasoningLoop]:
+        """
+        The checkpointed loop, with its saved artifacts added to `context`, or None if there is
+        nothing to resume. Keys already in `context` (live objects such as the memory manager, and
+        LIVE_KEYS such as current assumptions, must already be there) are kept as given.
+        """
+        if self.checkpoints is None:
+            return None
+        restored = self.checkpoints.load(loop_id)
+        if restored is None:
+            return None
+        loop, artifacts = restored
+        for key, value in artifacts.items():
+            if key not in self.LIVE_KEYS:
+                context.setdefault(key, value)
+        metrics.inc("mnemosyne_loop_resumes_total", stage=loop.current_stage.value)
         return loop
 
     def _get_next_stage(self, current: LoopStage) -> LoopStage:
@@ -0,0 +1,80 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+ROOT_LOGGER = "mnemosyne"
+
+# Attributes present on every LogRecord; anything else came in via `extra=` and is emitted as a field
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg plus any `extra` fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines, with `extra` fields appended as key=value."""
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [f"{k}={v}" for k, v in record.__dict__.items() if k not in _STANDARD_ATTRS and not k.startswith("_")]
+        return f"{line} {' '.join(fields)}" if fields else line
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, force: bool = False) -> logging.Logger:
+    """
+    Routes the 'mnemosyne' logger through a QueueHandler so callers never block on stream I/O;
+    a background QueueListener does the formatting and writing.
+    Level and format default to MNEMOSYNE_LOG_LEVEL (INFO) and MNEMOSYNE_LOG_FORMAT ('text' or 'json').
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    # The flag lives on the stdlib logger so it holds even if this module is imported under two names
+    listener = getattr(logger, "_mnemosyne_listener", None)
+    if listener is not None and not force:
+        return logger
+    if listener is not None:
+        atexit.unregister(listener.stop)
+        listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+    level = (level or os.environ.get("MNEMOSYNE_LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.environ.get("MNEMOSYNE_LOG_FORMAT", "text")).lower()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    logger._mnemosyne_listener = listener
+    return logger
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a child of the 'mnemosyne' logger, configuring the queue pipeline on first use."""
+    configure_logging()
+    short = name.split("mnemosyne.", 1)[-1] if "mnemosyne." in name else name
+    return logging.getLogger(f"{ROOT_LOGGER}.{short}")
@@ -0,0 +1,147 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Histogram bucket upper bounds (seconds) shared by all timers
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class _NullTimer:
+    """Shared no-op context manager returned while metrics are disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: LabelKey):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry._observe(self.name, self.labels, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.registry._inc(f"{self.name.removesuffix('_seconds')}_errors_total", self.labels, 1.0)
+        return False
+
+class MetricsRegistry:
+    """
+    In-process counters and timing histograms, rendered in the Prometheus text format.
+    When disabled, timer() hands back a shared no-op object and inc()/observe() return
+    after a single attribute check.
+    """
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> labels -> [count, sum, bucket counts...]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        if self.enabled:
+            self._inc(name, _label_key(labels), value)
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        if self.enabled:
+            self._observe(name, _label_key(labels), seconds)
+
+    def timer(self, name: str, **labels: str):
+        """Context manager recording the block's wall time into histogram `name` (seconds)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, _label_key(labels))
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _inc(self, name: str, labels: LabelKey, value: float):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def _observe(self, name: str, labels: LabelKey, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(labels)
+            if state is None:
+                state = series[labels] = [0.0, 0.0] + [0.0] * len(self.buckets)
+            state[0] += 1
+            state[1] += seconds
+            if index < len(self.buckets):
+                state[2 + index] += 1
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in self._counters[name].items():
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, state in self._histograms[name].items():
+                    cumulative = 0.0
+                    for bound, count in zip(self.buckets, state[2:]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {_format_value(cumulative)}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {_format_value(state[0])}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {state[1]!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {_format_value(state[0])}")
+        return "\n".join(lines) + "\n"
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+# Process-wide registry. Disable with MNEMOSYNE_METRICS=0.
+metrics = MetricsRegistry(enabled=os.environ.get("MNEMOSYNE_METRICS", "1") != "0")
+
+def timed(name: str, **labels: str):
+    """Decorator form of metrics.timer() for sync and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not metrics.enabled:
+                    return await fn(*args, **kwargs)
+                with metrics.timer(name, **labels):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            with metrics.timer(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,122 @@
+"""
+Compact embedding codes for candidate prefiltering.
+
+A QuantizedVectors set keeps the full float vectors for exact rescoring and, next to them, either
+sign-bit binary codes (1 bit per dimension, 32x smaller than float32) or int8 codes with one scale
+per dimension (4x smaller). Codes may cover only the leading `dims` dimensions (Matryoshka-style
+truncation) for a further reduction; the prefix is renormalised so approximate scores stay on the
+cosine scale. search() scans the codes, keeps pairs whose approximate score clears
+`min_score - margin`, and returns exact cosine scores for those only.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+MODES = ("binary", "int8")
+
+# Default slack between the approximate score and the threshold it must clear; binary estimates are coarser
+DEFAULT_MARGINS = {"binary": 0.15, "int8": 0.05}
+
+# Vectors scanned per step, so the scan never materialises a full float score or dequantised matrix
+SCAN_CHUNK = 8192
+
+_M1, _M2, _M4, _H01 = (np.uint64(m) for m in (0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F, 0x0101010101010101))
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    """Bits set per uint64 element (SWAR; numpy < 2 has no bitwise_count)."""
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return (x * _H01) >> np.uint64(56)
+
+def _pack_signs(prefix: np.ndarray) -> np.ndarray:
+    """Sign bits packed into uint64 words (zero-padded to a whole word, which never affects Hamming distance)."""
+    packed = np.packbits(prefix > 0, axis=1)
+    pad = -packed.shape[1] % 8
+    if pad:
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Unit-length rows as float32; zero rows stay zero (cosine 0 with everything)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+class QuantizedVectors:
+    """Full-precision vectors plus binary or int8 codes of their leading `dims` dimensions."""
+    def __init__(self, vectors: np.ndarray, mode: str = "binary", dims: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown quantization mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.vectors = normalize_rows(vectors)
+        self.mode = mode
+        self.dims = min(dims or self.vectors.shape[1], self.vectors.shape[1])
+        prefix = normalize_rows(self.vectors[:, :self.dims])
+        if mode == "binary":
+            self.codes = _pack_signs(prefix)
+            self.scales = None
+        else:
+            # Symmetric per-dimension scale so each dimension uses the full int8 range
+            self.scales = np.maximum(np.abs(prefix).max(axis=0, initial=0.0), 1e-12) / 127.0
+            self.codes = np.round(prefix / self.scales).astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def code_bytes(self) -> int:
+        """Bytes per vector in the scanned representation (vs. 4 * full dims for float32)."""
+        return self.codes.shape[1] * self.codes.itemsize
+
+    def approximate_scores(self, queries: np.ndarray) -> np.ndarray:
+        """(len(queries), len(self)) cosine estimates computed from the codes only."""
+        prepared = self._prepare(queries)
+        return np.hstack([self._scan(prepared, i, i + SCAN_CHUNK) for i in range(0, len(self), SCAN_CHUNK)] or [np.zeros((len(queries), 0), dtype=np.float32)])
+
+    def search(self, queries: np.ndarray, min_score: float, margin: Optional[float] = None) -> List[Tuple[int, int, float]]:
+        """
+        (query index, vector index, exact cosine) for every pair scoring above min_score, in
+        query-major order. Only pairs whose approximate score reaches min_score - margin are
+        rescored, so a pair is missed only if the codes underestimate it by more than the margin.
+        """
+        if not len(self) or not len(queries):
+            return []
+        cutoff = min_score - (DEFAULT_MARGINS[self.mode] if margin is None else margin)
+        queries = normalize_rows(queries)
+        prepared = self._prepare(queries)
+        rows, cols = [], []
+        for start in range(0, len(self), SCAN_CHUNK):
+            r, c = np.nonzero(self._scan(prepared, start, start + SCAN_CHUNK) >= cutoff)
+            rows.append(r)
+            cols.append(c + start)
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+        exact = np.einsum("ij,ij->i", queries[rows], self.vectors[cols])
+        keep = exact > min_score
+        return list(zip(rows[keep].tolist(), cols[keep].tolist(), exact[keep].tolist()))
+
+    def _prepare(self, queries: np.ndarray) -> np.ndarray:
+        prefix = normalize_rows(np.asarray(queries, dtype=np.float32)[:, :self.dims])
+        if self.mode == "binary":
+            return _pack_signs(prefix)
+        # Asymmetric int8: float query against int8 codes, with the scales folded into the query
+        return prefix * self.scales
+
+    def _scan(self, prepared: np.ndarray, start: int, stop: int) -> np.ndarray:
+        codes = self.codes[start:stop]
+        if self.mode == "int8":
+            return prepared @ codes.T.astype(np.float32)
+        distances = np.empty((len(prepared), len(codes)), dtype=np.float32)
+        for i, query_code in enumerate(prepared):
+            distances[i] = _popcount64(np.bitwise_xor(codes, query_code)).sum(axis=1)
+        # Sign codes of two vectors at angle t differ in about t/pi of their bits
+        return np.cos(np.pi * distances / self.dims)
+
+def exact_search(queries: np.ndarray, vectors: np.ndarray, min_score: float) -> List[Tuple[int, int, float]]:
+    """search() without a prefilter: full float cosine for every pair."""
+    if not len(queries) or not len(vectors):
+        return []
+    scores = normalize_rows(queries) @ normalize_rows(vectors).T
+    rows, cols = np.nonzero(scores > min_score)
+    return list(zip(rows.tolist(), cols.tolist(), scores[rows, cols].tolist()))
@@ -52,7 +52,9 @@ class Assumption(BaseModel):
     current_confidence: float = 1.0  # 0.0 to 1.0
     risk_level: RiskLevel = RiskLevel.LOW
     last_validated_at: datetime = Field(default_factory=datetime.utcnow)
-    invalidation_signals: List[str] = [] # Human-readable descriptions of what would break this
+    # What would break this: free text, or "ref:contradiction:<seq>" references into the contradiction log
+    # as stored by MemoryManager (its public getters return them resolved to text)
+    invalidation_signals: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     decay_rate: float = 0.01
     embedding: Optional[List[float]] = None # V1 Semantic Vector
@@ -76,6 +78,7 @@ class InsightContradiction(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     link_strength: Optional[LinkStrength] = None # V1 Semantic Link Strength
     semantic_score: Optional[float] = None # V1 Similarity score
+    multiplicity: int = 1 # Source signals this row stands for; confidence_delta already covers all of them
 
 class StrategyChange(BaseModel):
     """A first-class record of a strategic pivot or adjustment."""
@@ -170,6 +173,26 @@ class Comment(BaseModel):
     sentiment_score: Optional[float] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     embedding: Optional[List[float]] = None # V1 Semantic Vector
+    duplicate_count: int = 1 # Near-identical comments this one stands for (itself included)
+    duplicate_ids: List[str] = [] # IDs of the collapsed near-duplicates
+
+class Watermark(BaseModel):
+    """How far incremental interpretation has got through one signal source (e.g. one post's comments)."""
+    key: str  # "<connector name>:<post_id>"
+    last_timestamp: Optional[datetime] = None  # naive UTC
+    last_ids: List[str] = []  # IDs at last_timestamp, so ties are neither skipped nor reprocessed
+    undated_ids: List[str] = []  # IDs of processed comments without a timestamp, which have no position
+    processed_count: int = 0
+    cursor: Optional[str] = None  # Connector resume point; only pages after it are fetched
+    # Fingerprint of each assumption embedding that has been scored against everything up to here
+    scored_assumptions: Dict[str, str] = {}
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class SignalPage(BaseModel):
+    """One page of raw signal records (comment export dicts) from a SignalConnector."""
+    records: List[Dict[str, Any]] = []
+    cursor: Optional[str] = None  # Where the next fetch resumes, also when there is nothing more yet
+    has_more: bool = False
 
 class Performance(BaseModel):
     """Raw metrics and initial interpretation."""
@@ -1,55 +1,255 @@
+import asyncio
+import importlib.util
 import logging
+import os
+import threading
+import time
 import warnings
+from concurrent.futures import Future
 from typing import List, Optional
 
+import numpy as np
+
+from .metrics import metrics
+from .log import get_logger
+from .batching import MicroBatcher
+from .embedding_service import EmbeddingServiceClient
+
+logger = get_logger(__name__)
+
 # Suppress warnings from libraries (e.g. huggingface tokenizers parallelism)
 warnings.filterwarnings("ignore")
 
-try:
+# Only check availability here; sentence-transformers (and torch) are imported on first use
+HAS_SEMANTICS = importlib.util.find_spec("sentence_transformers") is not None
+if not HAS_SEMANTICS:
+    logger.warning("'sentence-transformers' not found. Semantic features disabled.")
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Inference backend for the local model (see load_model); quantized variants trade a little accuracy for CPU speed
+MODEL_BACKEND = os.environ.get("MNEMOSYNE_EMBED_BACKEND", "torch")
+MODEL_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+# Quantized ONNX export shipped in the model repo; the avx2 build runs on any x86-64 server core
+ONNX_INT8_FILE = os.environ.get("MNEMOSYNE_EMBED_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+
+# Micro-batching of concurrent encode() calls; MNEMOSYNE_EMBED_BATCHING=0 encodes inline instead
+BATCHING_ENABLED = os.environ.get("MNEMOSYNE_EMBED_BATCHING", "1") != "0"
+BATCH_WINDOW_SECONDS = float(os.environ.get("MNEMOSYNE_EMBED_BATCH_WINDOW_MS", "5")) / 1000.0
+MAX_BATCH_SIZE = int(os.environ.get("MNEMOSYNE_EMBED_MAX_BATCH", "64"))
+
+# After the embedding sidecar fails, use the in-process model for this long before trying it again
+SERVICE_RETRY_SECONDS = 30.0
+
+def load_model(backend: str = MODEL_BACKEND):
+    """
+    Loads MODEL_NAME for one of MODEL_BACKENDS:
+    'torch' is the fp32 PyTorch model, 'torch-int8' the same with Linear layers dynamically quantized
+    to int8, 'onnx' runs the fp32 export under ONNX Runtime and 'onnx-int8' the quantized export
+    (both ONNX variants need `sentence-transformers[onnx]`). All produce the same 384-d embeddings
+    up to quantization error; check with run_embedding_accuracy.py before switching.
+    """
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {', '.join(MODEL_BACKENDS)}")
     from sentence_transformers import SentenceTransformer
-    from sentence_transformers.util import cos_sim
-    HAS_SEMANTICS = True
-except ImportError:
-    HAS_SEMANTICS = False
-    print("WARNING: 'sentence-transformers' not found. Semantic features disabled.")
+
+    if backend == "torch":
+        return SentenceTransformer(MODEL_NAME)
+    if backend == "torch-int8":
+        import torch
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if backend == "onnx":
+        return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx")
+    return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx", model_kwargs={"file_name": ONNX_INT8_FILE})
 
 class SemanticEngine:
+    """
+    Process-wide embedding engine.
+    The model is loaded lazily on the first encode() or explicitly via warm_up().
+    Concurrent encode() calls are coalesced into batched model calls on a single worker thread.
+    With MNEMOSYNE_EMBED_SERVICE set, texts go to the shared embedding sidecar instead
+    (see embedding_service.py) and the local model is only loaded if the sidecar is unreachable.
+    """
     _instance = None
     _model = None
+    _model_backend: Optional[str] = None
+    _status = "cold" # cold -> loading -> ready | unavailable
+    _load_lock = threading.Lock()
+    _batcher: Optional[MicroBatcher] = None
+    _encode_lock = threading.Lock() # serializes inline model calls when batching is disabled
+    _service: Optional[EmbeddingServiceClient] = None
+    _service_retry_at = 0.0
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(SemanticEngine, cls).__new__(cls)
-            cls._instance._initialize_model()
         return cls._instance
 
+    @classmethod
+    def status(cls) -> str:
+        """Readiness signal: 'cold', 'loading', 'ready' or 'unavailable'."""
+        return cls._status
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._status == "ready"
+
+    @classmethod
+    def backend(cls) -> str:
+        """Where encode() currently runs: 'service', 'local' or 'none'."""
+        if cls._service is not None and time.monotonic() >= cls._service_retry_at:
+            return "service"
+        return "local" if cls._model is not None else "none"
+
+    @classmethod
+    def model_backend(cls) -> Optional[str]:
+        """Which of MODEL_BACKENDS the in-process model was loaded with (None until loaded or for set_model())."""
+        return cls._model_backend
+
+    @classmethod
+    def configure_service(cls, address: Optional[str]):
+        """Points the engine at an embedding sidecar ('unix:/path' or 'tcp:host:port'); None for in-process only."""
+        cls._service = EmbeddingServiceClient(address) if address else None
+        cls._service_retry_at = 0.0
+
+    @classmethod
+    def set_model(cls, model):
+        """Installs a preloaded model with a sentence-transformers style encode() (e.g. an offline stub)."""
+        with cls._load_lock:
+            cls._model = model
+            cls._status = "ready"
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Loads the model now instead of on the first encode() call."""
+        if not background:
+            self._initialize_model()
+            return None
+        thread = threading.Thread(target=self._initialize_model, name="semantic-warmup", daemon=True)
+        thread.start()
+        return thread
+
     def _initialize_model(self):
-        """Loads the local embedding model."""
-        if HAS_SEMANTICS and self._model is None:
+        """Connects to the embedding sidecar if configured, otherwise loads the local model."""
+        cls = type(self)
+        if cls._status in ("ready", "unavailable"):
+            return
+        if cls._service is not None and cls._service.ping():
+            cls._status = "ready"
+            logger.info("Using embedding service at %s", cls._service.address)
+            return
+        self._load_local_model()
+
+    def _load_local_model(self):
+        cls = type(self)
+        if cls._model is not None or cls._status == "unavailable":
+            return
+        with cls._load_lock:
+            if cls._model is not None or cls._status == "unavailable":
+                return
+            if not HAS_SEMANTICS:
+                cls._status = "unavailable"
+                return
+            cls._status = "loading"
             try:
                 # 'all-MiniLM-L6-v2' is fast, efficient, and good for general semantic similarity
-                self._model = SentenceTransformer('all-MiniLM-L6-v2')
+                cls._model, cls._model_backend = self._load_backend(MODEL_BACKEND)
+                cls._status = "ready"
+            except Exception as e:
+                logger.error("Failed to load semantic model: %s", e)
+                cls._model = None
+                cls._status = "unavailable"
+
+    def _load_backend(self, backend: str):
+        """(model, backend) from load_model(), degrading to fp32 torch if a quantized backend cannot be loaded here."""
+        if backend != "torch":
+            try:
+                model = load_model(backend)
+                logger.info("Loaded embedding model with %s backend", backend)
+                return model, backend
             except Exception as e:
-                print(f"ERROR: Failed to load semantic model: {e}")
-                self._model = None
+                logger.warning("Embedding backend %s unavailable, using fp32 torch: %s", backend, e)
+        return load_model("torch"), "torch"
 
     def encode(self, text: str) -> Optional[List[float]]:
         """Computes embedding for a given text."""
+        return self.encode_many([text])[0]
+
+    def encode_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embeds several texts; they share batches with any concurrent callers."""
+        if not texts:
+            return []
+        self._initialize_model()
+        vectors = self._encode_via_service(texts)
+        if vectors is not None:
+            return vectors
+        self._load_local_model()
         if not self._model:
-            return None
+            return [None] * len(texts)
+        try:
+            if not BATCHING_ENABLED:
+                with type(self)._encode_lock:
+                    return self._encode_batch(list(texts))
+            futures = [self._submit(t) for t in texts]
+            return [f.result() for f in futures]
+        except Exception as e:
+            logger.error("Encoding failed: %s", e)
+            return [None] * len(texts)
+
+    async def encode_async(self, text: str) -> Optional[List[float]]:
+        """encode() for coroutines: awaits the batched result without blocking the event loop."""
+        if not self.is_ready():
+            await asyncio.to_thread(self._initialize_model)
+        if not BATCHING_ENABLED or self.backend() != "local":
+            return await asyncio.to_thread(self.encode, text)
         try:
-            embedding = self._model.encode(text, convert_to_tensor=True)
-            return embedding.tolist()
+            return await asyncio.wrap_future(self._submit(text))
         except Exception as e:
-            print(f"ERROR: Encoding failed: {e}")
+            logger.error("Encoding failed: %s", e)
+            return None
+
+    def _encode_via_service(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Sidecar result, or None if no sidecar is configured or it just failed (caller falls back)."""
+        cls = type(self)
+        if cls._service is None or time.monotonic() < cls._service_retry_at:
+            return None
+        try:
+            with metrics.timer("mnemosyne_embedding_service_seconds"):
+                vectors = cls._service.encode_many(texts)
+            metrics.inc("mnemosyne_embedding_texts_total", len(texts))
+            return vectors
+        except (OSError, RuntimeError, ValueError) as e:
+            cls._service_retry_at = time.monotonic() + SERVICE_RETRY_SECONDS
+            metrics.inc("mnemosyne_embedding_service_fallbacks_total")
+            logger.warning("Embedding service unavailable, using in-process model: %s", e, extra={"service": cls._service.address})
             return None
 
+    def _submit(self, text: str) -> Future:
+        cls = type(self)
+        if cls._batcher is None:
+            with cls._load_lock:
+                if cls._batcher is None:
+                    cls._batcher = MicroBatcher(self._encode_batch, max_batch=MAX_BATCH_SIZE, window=BATCH_WINDOW_SECONDS, name="semantic-batcher")
+        return cls._batcher.submit(text)
+
+    def _encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """One forward pass for the whole batch. Only ever called from one thread at a time."""
+        with metrics.timer("mnemosyne_embedding_encode_seconds"):
+            embeddings = np.asarray(self._model.encode(texts, batch_size=len(texts)))
+        metrics.inc("mnemosyne_embedding_texts_total", len(texts))
+        return embeddings.tolist()
+
     def similarity(self, emb1: List[float], emb2: List[float]) -> float:
         """Computes cosine similarity between two embeddings."""
-        if not HAS_SEMANTICS or not emb1 or not emb2:
+        if not emb1 or not emb2:
             return 0.0
         try:
-            return float(cos_sim(emb1, emb2)[0][0])
+            a = np.asarray(emb1, dtype=np.float32)
+            b = np.asarray(emb2, dtype=np.float32)
+            denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+            return float(a @ b) / denom if denom else 0.0
         except Exception as e:
-            print(f"ERROR: Similarity computation failed: {e}")
+            logger.error("Similarity computation failed: %s", e)
             return 0.0
+
+SemanticEngine.configure_service(os.environ.get("MNEMOSYNE_EMBED_SERVICE") or None)
@@ -1,12 +1,33 @@
+import hashlib
+import os
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
 from ..core.schemas import (
     ReasoningLoop, ReasoningStep, LoopStage, Post, Creative, 
     Insight, InsightContradiction, IntentType, AuthorType, StrategyChange, RiskLevel,
-    LinkStrength
+    LinkStrength, Comment, Assumption, Watermark
 )
 from ..core.interfaces import ReasoningAgent
 from ..core.semantic import SemanticEngine
+from ..core.quantization import QuantizedVectors, exact_search
+
+# Semantic score bands for assumption/critique links: (score must exceed, strength, confidence delta)
+LINK_BANDS = [
+    (0.6, LinkStrength.STRONG, 0.15),
+    (0.4, LinkStrength.MODERATE, 0.08),
+    (0.25, LinkStrength.WEAK, 0.02),
+]
+
+# Optional compact-code prefilter for InterpretAgent ('binary' or 'int8'; unset scores every pair exactly)
+PREFILTER_MODE = os.environ.get("MNEMOSYNE_PREFILTER") or None
+PREFILTER_DIMS = int(os.environ["MNEMOSYNE_PREFILTER_DIMS"]) if os.environ.get("MNEMOSYNE_PREFILTER_DIMS") else None
+
+def _fingerprint(embedding: List[float]) -> str:
+    """Short digest of an embedding, to tell whether an assumption changed since it was last scored."""
+    return hashlib.blake2b(np.asarray(embedding, dtype=np.float32).tobytes(), digest_size=8).hexdigest()
 
 class BaseMockAgent:
     """Helper for mock agents to create steps with rationale."""
@@ -114,18 +135,89 @@ class PublishAgent(BaseMockAgent, ReasoningAgent):
         # In a real app, human_approved would be set by a controller/UI
         return step
 
-from .ingestion import CommentIngestor
+from .ingestion import CommentIngestor, topics_for
+from .connectors import SIGNAL_SOURCE, fetch_posts, open_connector
+
+# Persist ingested comments (and embeddings) in MemoryManager.comment_store when memory is in context
+STORE_COMMENTS = os.environ.get("MNEMOSYNE_STORE_COMMENTS", "1") != "0"
 
 class ObserveAgent(BaseMockAgent, ReasoningAgent):
+    """
+    Fetches comments for context["post_ids"] (or context["post_id"]) from context["connector"], or
+    from a connector for context["comments_path"] / MNEMOSYNE_SIGNAL_SOURCE. Posts are fetched
+    concurrently, page by page.
+    With a MemoryManager in context["memory"], each post resumes from its saved watermark: only pages
+    after its cursor are fetched and only comments past it are ingested. The advanced watermarks go to
+    context["watermarks"] for InterpretAgent to commit, and context["history"] is an async callable
+    loading the already-processed comments on demand. New comments are also kept in the memory's
+    CommentStore (unless MNEMOSYNE_STORE_COMMENTS=0), which then serves that history with its stored
+    embeddings instead of refetching and re-embedding.
+    """
     async def process(self, loop: ReasoningLoop, context: Dict[str, Any]) -> ReasoningStep:
         intent = "Collect signals from the published post."
         rationale = "Ingesting raw comment data to extract high-signal feedback."
         
-        ingestor = CommentIngestor()
-        # In a real scenario, this path would be dynamic or provided via context
-        comments = ingestor.ingest_from_file("raw_comments.json", post_id="post_001")
-        
-        decisions = [f"Ingested {len(comments)} comments from platform export"]
+        # A connector opened here (rather than passed in) is closed here once fetching is done
+        owned = not context.get("connector")
+        connector = context.get("connector") or open_connector(context.get("comments_path", SIGNAL_SOURCE))
+        post_ids = context.get("post_ids") or [context.get("post_id", "post_001")]
+        memory = context.get("memory")
+        # Topic centroids are kept next to the memory they label
+        ingestor = CommentIngestor(topics=topics_for(memory.storage_dir if memory is not None else None))
+        watermarks = {}
+        if memory is not None:
+            for post_id in post_ids:
+                key = f"{connector.name}:{post_id}"
+                watermark = memory.get_watermark(key)
+                # File sources used to be keyed by the path as given; carry such watermarks over
+                legacy = getattr(connector, "path", None)
+                if watermark is None and legacy and legacy != connector.name:
+                    watermark = memory.get_watermark(f"{legacy}:{post_id}")
+                    watermark = watermark.model_copy(update={"key": key}) if watermark is not None else None
+                watermarks[post_id] = watermark or Watermark(key=key)
+
+        try:
+            pages = await fetch_posts(connector, post_ids, {p: w.cursor for p, w in watermarks.items()})
+        finally:
+            if owned:
+                await connector.aclose()
+        fetched = sum(len(page.records) for page in pages.values())
+        comments = []
+        if memory is None:
+            for post_id, page in pages.items():
+                comments.extend(ingestor.ingest_records(page.records, post_id))
+            ingestor.save_topics()
+            decisions = [f"Ingested {len(comments)} comments for {len(post_ids)} post(s) from {connector.name}"]
+        else:
+            advanced = []
+            for post_id, page in pages.items():
+                new, watermark = ingestor.ingest_records_since(page.records, post_id, watermarks[post_id])
+                watermark.cursor = page.cursor
+                comments.extend(new)
+                advanced.append(watermark)
+            ingestor.save_topics()
+            context["watermarks"] = advanced
+            if STORE_COMMENTS:
+                memory.comment_store.append(comments)
+            seen = context["history_posts"] = [p for p, w in watermarks.items() if w.processed_count]
+            if seen:
+                new_ids = {c.id for c in comments}
+                async def load_history() -> List[Comment]:
+                    stored = set(memory.comment_store.post_ids()) if STORE_COMMENTS else set()
+                    history = [c for c in memory.comment_store.scan(post_ids=[p for p in seen if p in stored], intents=[IntentType.CRITIQUE]) if c.id not in new_ids]
+                    # Posts processed before the store existed (or with it disabled) are refetched
+                    unstored = [p for p in seen if p not in stored]
+                    if unstored:
+                        try:
+                            pages = await fetch_posts(connector, unstored)
+                        finally:
+                            if owned:
+                                await connector.aclose()
+                        history += [c for p in unstored for c in ingestor.ingest_records(pages[p].records, p, until=watermarks[p])]
+                    return history
+                context["history"] = load_history
+            earlier = sum(w.processed_count for w in watermarks.values())
+            decisions = [f"Ingested {len(comments)} new comments for {len(post_ids)} post(s) from {connector.name} ({fetched} fetched, {earlier} processed in earlier cycles)"]
         context["comments"] = comments
         
         return self.create_step(
@@ -136,8 +228,20 @@ class ObserveAgent(BaseMockAgent, ReasoningAgent):
         )
 
 class InterpretAgent(BaseMockAgent, ReasoningAgent):
-    def __init__(self):
+    """
+    Links critiques to assumptions by embedding similarity.
+    With a prefilter ('binary' or 'int8', default from MNEMOSYNE_PREFILTER), pairs are first screened
+    on compact codes of the critique embeddings (optionally truncated to prefilter_dims) and only the
+    survivors are scored exactly. The codes are 4-32x smaller than the float vectors they stand in for,
+    at a small recall risk for pairs just above the WEAK threshold.
+    When ObserveAgent left watermarks in context, only the new comments are scored against every
+    assumption; history is rescored only for assumptions whose embedding changed since the watermark
+    last covered them. Contradictions and the advanced watermark are then committed together.
+    """
+    def __init__(self, prefilter: Optional[str] = PREFILTER_MODE, prefilter_dims: Optional[int] = PREFILTER_DIMS):
         self.semantic = SemanticEngine()
+        self.prefilter = prefilter or None
+        self.prefilter_dims = prefilter_dims
 
     async def process(self, loop: ReasoningLoop, context: Dict[str, Any]) -> ReasoningStep:
         intent = "Analyze signals and evaluate hypothesis."
@@ -151,63 +255,70 @@ class InterpretAgent(BaseMockAgent, ReasoningAgent):
         contradictions = []
         
         # V1 Semantic Logic: Check for semantic clashes with Assumptions
-        for assumption in assumptions:
-            # Generate embedding for assumption if missing (lazy load for demo)
-            if not assumption.embedding:
-                assumption.embedding = self.semantic.encode(assumption.statement)
-            
-            for critique in critiques:
-                if not critique.embedding or not assumption.embedding:
-                    continue
+        # Generate embeddings for assumptions if missing (lazy load for demo)
+        missing = [a for a in assumptions if not a.embedding]
+        for assumption, embedding in zip(missing, self.semantic.encode_many([a.statement for a in missing])):
+            assumption.embedding = embedding
+
+        pairs = self._score_pairs(assumptions, critiques)
+        watermarks = context.get("watermarks")
+        deferred: List[Assumption] = []
+        if watermarks:
+            history_pairs, deferred = await self._rescore_history(assumptions, watermarks, context, decisions)
+            pairs += history_pairs
+
+        for assumption, critique, score in pairs:
+            # Determine Link Strength based on semantic score
+            link_strength, confidence_delta = next((strength, delta) for threshold, strength, delta in LINK_BANDS if score > threshold)
 
-                # Compute Similarity
-                score = self.semantic.similarity(assumption.embedding, critique.embedding)
-                
-                # Determine Link Strength based on semantic score
-                link_strength = None
-                if score > 0.6:
-                    link_strength = LinkStrength.STRONG
-                elif score > 0.4:
-                    link_strength = LinkStrength.MODERATE
-                elif score > 0.25:
-                    link_strength = LinkStrength.WEAK
-                
-                if link_strength:
-                    # Calculate weighted delta
-                    delta_map = {
-                        LinkStrength.STRONG: 0.15,
-                        LinkStrength.MODERATE: 0.08,
-                        LinkStrength.WEAK: 0.02
-                    }
-                    confidence_delta = delta_map[link_strength]
+            # A collapsed near-duplicate group weighs as much as its members would have separately
+            multiplicity = critique.duplicate_count
+            repeated = f" (x{multiplicity} near-identical comments)" if multiplicity > 1 else ""
+            contradiction = InsightContradiction(
+                insight_id=assumption.id, # We allow assumptions here as per schema update logic
+                source_id=critique.id,
+                rationale=f"Semantic contradiction detected (Score: {score:.2f}) with: '{critique.content[:50]}...'{repeated}",
+                confidence_delta=confidence_delta * multiplicity,
+                link_strength=link_strength,
+                semantic_score=score,
+                multiplicity=multiplicity
+            )
+            contradictions.append(contradiction)
+            decisions.append(f"DETECTED SEMANTIC CONTRADICTION ({link_strength.value.upper()}) for {assumption.id} (Score: {score:.2f}){repeated}")
 
-                    contradiction = InsightContradiction(
-                        insight_id=assumption.id, # We allow assumptions here as per schema update logic
-                        source_id=critique.id,
-                        rationale=f"Semantic contradiction detected (Score: {score:.2f}) with: '{critique.content[:50]}...'",
-                        confidence_delta=confidence_delta,
-                        link_strength=link_strength,
-                        semantic_score=score
-                    )
-                    contradictions.append(contradiction)
-                    decisions.append(f"DETECTED SEMANTIC CONTRADICTION ({link_strength.value.upper()}) for {assumption.id} (Score: {score:.2f})")
-                    
-                    # Store pivot data for first Strong hit (for StrategyChange demo flow)
-                    if link_strength == LinkStrength.STRONG and "pivot_data" not in context:
-                        context["pivot_data"] = {
-                            "insight_id": assumption.id, # Using assumption ID as the key for now
-                            "previous_assumption": assumption.statement,
-                            "confidence_from": assumption.current_confidence,
-                            "confidence_to": max(0.0, assumption.current_confidence - confidence_delta),
-                            "triggering_signals": [critique.content]
-                        }
+            # Store pivot data for first Strong hit (for StrategyChange demo flow)
+            if link_strength == LinkStrength.STRONG and "pivot_data" not in context:
+                context["pivot_data"] = {
+                    "insight_id": assumption.id, # Using assumption ID as the key for now
+                    "previous_assumption": assumption.statement,
+                    "confidence_from": assumption.current_confidence,
+                    "confidence_to": max(0.0, assumption.current_confidence - contradiction.confidence_delta),
+                    "triggering_signals": [critique.content]
+                }
 
         
         if not contradictions:
             decisions.append("No active contradictions detected in high-signal comments.")
         
         context["contradictions"] = contradictions
-        rationale = f"Analyzed {len(comments)} comments. Found {len(critiques)} critique(s) with {len(contradictions)} semantic links."
+        if watermarks:
+            memory = context["memory"]
+            scored = {a.id: _fingerprint(a.embedding) for a in assumptions if a.embedding}
+            deferred_ids = {a.id for a in deferred}
+            for watermark in watermarks:
+                # Assumptions whose history could not be rescored keep their old fingerprint, so a later cycle retries
+                previous = watermark.scored_assumptions
+                watermark.scored_assumptions = {a_id: fp for a_id, fp in scored.items() if a_id not in deferred_ids}
+                watermark.scored_assumptions.update({a_id: previous[a_id] for a_id in deferred_ids if a_id in previous})
+            # A resumed cycle may re-run this stage after its commit already landed; the saved watermarks tell
+            stored = [memory.get_watermark(w.key) for w in watermarks]
+            if all(saved is not None and saved.updated_at == w.updated_at for saved, w in zip(stored, watermarks)):
+                decisions.append("Signals already committed by an earlier attempt of this cycle; not recording them again.")
+            else:
+                memory.process_contradictions(contradictions, watermarks=watermarks)
+        total = sum(c.duplicate_count for c in comments)
+        collapsed = f" ({len(comments)} after collapsing near-duplicates)" if total != len(comments) else ""
+        rationale = f"Analyzed {total} comments{collapsed}. Found {len(critiques)} critique(s) with {len(contradictions)} semantic links."
         
         return self.create_step(
             stage=LoopStage.INTERPRET, 
@@ -216,6 +327,42 @@ class InterpretAgent(BaseMockAgent, ReasoningAgent):
             decisions=decisions
         )
 
+    def _score_pairs(self, assumptions: List[Assumption], critiques: List[Comment]) -> List[Tuple[Assumption, Comment, float]]:
+        """(assumption, critique, cosine) for every pair above the weakest link threshold, assumption-major."""
+        assumptions = [a for a in assumptions if a.embedding]
+        critiques = [c for c in critiques if c.embedding]
+        if not assumptions or not critiques:
+            return []
+        queries = np.asarray([a.embedding for a in assumptions], dtype=np.float32)
+        vectors = np.asarray([c.embedding for c in critiques], dtype=np.float32)
+        min_score = LINK_BANDS[-1][0]
+        if self.prefilter:
+            # Compact codes select candidates; only those are rescored with full float cosine
+            pairs = QuantizedVectors(vectors, self.prefilter, self.prefilter_dims).search(queries, min_score)
+        else:
+            pairs = exact_search(queries, vectors, min_score)
+        return [(assumptions[i], critiques[j], score) for i, j, score in pairs]
+
+    async def _rescore_history(self, assumptions: List[Assumption], watermarks: List[Watermark], context: Dict[str, Any], decisions: List[str]) -> Tuple[List[Tuple[Assumption, Comment, float]], List[Assumption]]:
+        """
+        Pairs between already-processed critiques and assumptions that are new or re-embedded since,
+        plus the stale assumptions that could not be rescored (no history loader, e.g. after a resume).
+        """
+        stale = [a for a in assumptions if a.embedding and any(w.scored_assumptions.get(a.id) != _fingerprint(a.embedding) for w in watermarks)]
+        if not stale or not context.get("history_posts"):
+            return [], []
+        if "history" not in context:
+            decisions.append(f"Deferred rescoring earlier critiques for {len(stale)} new or changed assumption(s): history not available")
+            return [], stale
+        history = [c for c in await context["history"]() if c.intent == IntentType.CRITIQUE]
+        memory = context["memory"]
+        # A re-embedded assumption may already be linked to some of these critiques, including links
+        # archived out of the hot table; don't count them twice
+        linked = {(a.id, c.source_id) for a in stale for c in memory.iter_contradictions(insight_id=a.id)}
+        pairs = [(a, c, score) for a, c, score in self._score_pairs(stale, history) if (a.id, c.id) not in linked]
+        decisions.append(f"Rescored {len(history)} earlier critique(s) against {len(stale)} new or changed assumption(s)")
+        return pairs, []
+
 class AdaptAgent(BaseMockAgent, ReasoningAgent):
     async def process(self, loop: ReasoningLoop, context: Dict[str, Any]) -> ReasoningStep:
         intent = "Refine strategy based on interpretations and emit rationale."
@@ -0,0 +1,320 @@
+"""
+Paginated signal source connectors for ObserveAgent.
+
+A connector (core.interfaces.SignalConnector) returns one SignalPage of raw comment records per
+call, plus a cursor to resume from. fetch_posts() pages through several posts concurrently (pages of
+one post are sequential, since each needs the previous cursor), retrying transient failures with
+exponential backoff. Cursors are persisted on the source's Watermark, so a later cycle only fetches
+what arrived since.
+
+Shipped connectors:
+    FileConnector  - a JSON array export (cursor: array index plus a fingerprint of the records
+                     before it) or JSONL file (cursor: byte offset)
+    HTTPConnector  - GET <base>/posts/<post_id>/comments?cursor=&limit= returning
+                     {"comments": [...], "cursor": "...", "has_more": bool}
+    StubSignalServer - local threaded HTTP server speaking that protocol, with injectable failures
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from ..core.interfaces import SignalConnector
+from ..core.log import get_logger
+from ..core.metrics import metrics
+from ..core.schemas import SignalPage
+
+logger = get_logger(__name__)
+
+PAGE_SIZE = int(os.environ.get("MNEMOSYNE_CONNECTOR_PAGE_SIZE", "500"))
+# Retries after the first attempt; delays grow as BACKOFF * 2^attempt with jitter
+RETRIES = int(os.environ.get("MNEMOSYNE_CONNECTOR_RETRIES", "4"))
+BACKOFF_SECONDS = float(os.environ.get("MNEMOSYNE_CONNECTOR_BACKOFF", "0.5"))
+# Page requests in flight at once across all posts
+CONCURRENCY = int(os.environ.get("MNEMOSYNE_CONNECTOR_CONCURRENCY", "8"))
+# Default source when the loop context names none: a file path or an http(s):// base URL
+SIGNAL_SOURCE = os.environ.get("MNEMOSYNE_SIGNAL_SOURCE", "raw_comments.json")
+
+class ConnectorError(Exception):
+    """A page fetch failed; retryable errors (timeouts, 5xx, 429) are retried with backoff."""
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+def open_connector(source: str) -> SignalConnector:
+    """HTTPConnector for http(s):// URLs, FileConnector for anything else."""
+    if source.startswith(("http://", "https://")):
+        return HTTPConnector(source)
+    return FileConnector(source)
+
+def _for_post(record: Dict[str, Any], post_id: str) -> bool:
+    # Single-post exports often omit post_id; those records belong to whichever post is asked for
+    return record.get("post_id", post_id) == post_id
+
+class FileConnector:
+    """
+    Reads a local export page by page. JSONL files are assumed to be append-only. JSON array exports
+    are usually rewritten wholesale, so their cursor carries a fingerprint of every record before it:
+    if the export was regenerated, reordered or shrunk since, the cursor no longer matches and reading
+    restarts from the top (the Watermark's timestamps then skip what was already processed).
+    """
+    def __init__(self, path: str):
+        self.path = path
+        # Watermarks are keyed by name, so spell one file one way
+        self.name = os.path.abspath(path)
+        self._jsonl = path.endswith(".jsonl")
+        self._lock = threading.Lock()
+        # (file stamp, records, running fingerprint after each record)
+        self._cached: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]], List[str]]] = None
+
+    async def fetch_page(self, post_id: str, cursor: Optional[str], limit: int) -> SignalPage:
+        if self._jsonl:
+            return await asyncio.to_thread(self._read_jsonl, post_id, int(cursor or 0), limit)
+        return await asyncio.to_thread(self._read_json, post_id, cursor, limit)
+
+    async def aclose(self):
+        """Nothing to release (files are opened per page); present so callers can close any connector."""
+
+    def _read_json(self, post_id: str, cursor: Optional[str], limit: int) -> SignalPage:
+        records, fingerprints = self._load()
+        position = self._resume_position(cursor, fingerprints)
+        page = []
+        while position < len(records) and len(page) < limit:
+            if _for_post(records[position], post_id):
+                page.append(records[position])
+            position += 1
+        cursor = f"{position}:{fingerprints[position - 1]}" if position else "0"
+        return SignalPage(records=page, cursor=cursor, has_more=position < len(records))
+
+    def _resume_position(self, cursor: Optional[str], fingerprints: List[str]) -> int:
+        """Index a "<index>:<fingerprint>" cursor resumes at, or 0 if the records before it changed."""
+        if not cursor or cursor == "0":
+            return 0
+        index, _, fingerprint = cursor.partition(":")
+        try:
+            position = int(index)
+        except ValueError:
+            position = -1
+        if 0 < position <= len(fingerprints) and fingerprints[position - 1] == fingerprint:
+            return position
+        metrics.inc("mnemosyne_connector_cursor_resets_total", source=type(self).__name__)
+        logger.info("%s changed since cursor %s was saved; reading it from the start", self.path, cursor)
+        return 0
+
+    def _load(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """The parsed array and its running fingerprints, reused across pages and posts until the file changes."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return [], []
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._cached is None or self._cached[0] != stamp:
+                try:
+                    with open(self.path, "r") as f:
+                        records = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise ConnectorError(f"{self.path} is not a JSON array export: {e}") from e
+                digest = hashlib.blake2b(digest_size=8)
+                fingerprints = []
+                for record in records:
+                    digest.update(json.dumps(record, sort_keys=True, default=str).encode("utf-8"))
+                    fingerprints.append(digest.copy().hexdigest())
+                self._cached = (stamp, records, fingerprints)
+            return self._cached[1], self._cached[2]
+
+    def _read_jsonl(self, post_id: str, offset: int, limit: int) -> SignalPage:
+        if not os.path.exists(self.path):
+            return SignalPage(cursor=str(offset))
+        page = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while len(page) < limit:
+                line = f.readline()
+                # A line without its newline is still being written; resume before it next time
+                if not line.endswith(b"\n"):
+                    return SignalPage(records=page, cursor=str(offset))
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ConnectorError(f"{self.path}: malformed line ending at byte {offset}: {e}") from e
+                if _for_post(record, post_id):
+                    page.append(record)
+            has_more = bool(f.read(1))
+        return SignalPage(records=page, cursor=str(offset), has_more=has_more)
+
+class HTTPConnector:
+    """Client for the paginated comments endpoint (see module docstring)."""
+    def __init__(self, base_url: str, timeout: float = 10.0, headers: Optional[Dict[str, str]] = None):
+        self.base_url = base_url.rstrip("/")
+        self.name = self.base_url
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _http(self) -> httpx.AsyncClient:
+        # Connections belong to the event loop that opened them; agents may run under a fresh asyncio.run()
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is not loop:
+            await self.aclose()
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, headers=self.headers)
+            self._client_loop = loop
+        return self._client
+
+    async def fetch_page(self, post_id: str, cursor: Optional[str], limit: int) -> SignalPage:
+        params = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        try:
+            response = await (await self._http()).get(f"/posts/{post_id}/comments", params=params)
+        except httpx.TransportError as e:
+            raise ConnectorError(f"{self.base_url}: {e!r}", retryable=True) from e
+        if response.status_code == 429 or response.status_code >= 500:
+            raise ConnectorError(f"{self.base_url}: HTTP {response.status_code}", retryable=True)
+        if response.status_code >= 400:
+            raise ConnectorError(f"{self.base_url}: HTTP {response.status_code} for post {post_id}")
+        body = response.json()
+        return SignalPage(records=body.get("comments", []), cursor=body.get("cursor", cursor), has_more=bool(body.get("has_more")))
+
+    async def aclose(self):
+        client, self._client, self._client_loop = self._client, None, None
+        if client is None:
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            # A client from an event loop that has since closed can't shut its sockets down cleanly
+            logger.debug("Closing %s client failed: %r", self.base_url, e)
+
+async def fetch_page_with_retry(connector: SignalConnector, post_id: str, cursor: Optional[str], limit: int = PAGE_SIZE,
+                                retries: int = RETRIES, backoff: float = BACKOFF_SECONDS) -> SignalPage:
+    source = type(connector).__name__
+    for attempt in range(retries + 1):
+        try:
+            with metrics.timer("mnemosyne_connector_fetch_seconds", source=source):
+                return await connector.fetch_page(post_id, cursor, limit)
+        except ConnectorError as e:
+            if not e.retryable or attempt == retries:
+                raise
+            # Equal jitter: half the exponential delay fixed, half random, so parallel posts spread out
+            delay = backoff * 2 ** attempt
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            metrics.inc("mnemosyne_connector_retries_total", source=source)
+            logger.warning("Retrying %s page fetch in %.2fs: %s", source, delay, e, extra={"post_id": post_id, "attempt": attempt + 1})
+            await asyncio.sleep(delay)
+
+async def fetch_all(connector: SignalConnector, post_id: str, cursor: Optional[str] = None,
+                    limit: int = PAGE_SIZE, semaphore: Optional[asyncio.Semaphore] = None) -> SignalPage:
+    """Every record after `cursor`, as one SignalPage whose cursor resumes after the last of them."""
+    records: List[Dict[str, Any]] = []
+    while True:
+        if semaphore is None:
+            page = await fetch_page_with_retry(connector, post_id, cursor, limit)
+        else:
+            async with semaphore:
+                page = await fetch_page_with_retry(connector, post_id, cursor, limit)
+        metrics.inc("mnemosyne_connector_pages_total", source=type(connector).__name__)
+        records.extend(page.records)
+        cursor = page.cursor if page.cursor is not None else cursor
+        if not page.has_more:
+            return SignalPage(records=records, cursor=cursor)
+
+async def fetch_posts(connector: SignalConnector, post_ids: Sequence[str], cursors: Optional[Dict[str, Optional[str]]] = None,
+                      concurrency: int = CONCURRENCY, limit: int = PAGE_SIZE) -> Dict[str, SignalPage]:
+    """fetch_all() for several posts at once, with at most `concurrency` page requests in flight."""
+    cursors = cursors or {}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pages = await asyncio.gather(*(fetch_all(connector, post_id, cursors.get(post_id), limit, semaphore) for post_id in post_ids))
+    return dict(zip(post_ids, pages))
+
+class StubSignalServer:
+    """
+    Local HTTP server for the HTTPConnector protocol, for tests and demos.
+    Every `fail_every`-th request answers 503 and each response waits `latency` seconds, to exercise
+    retries and concurrency. Use as a context manager; add() appends records while it runs.
+    """
+    def __init__(self, records: Optional[List[Dict[str, Any]]] = None, fail_every: int = 0, latency: float = 0.0, port: int = 0):
+        self.records: List[Dict[str, Any]] = list(records or [])
+        self.fail_every = fail_every
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, records: List[Dict[str, Any]]):
+        with self._lock:
+            self.records.extend(records)
+
+    def start(self) -> "StubSignalServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-signal-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubSignalServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _page(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "posts" or parts[2] != "comments":
+            return 404, {"error": "not found"}
+        with self._lock:
+            self.requests += 1
+            if self.fail_every and self.requests % self.fail_every == 0:
+                return 503, {"error": "injected failure"}
+            records = [r for r in self.records if _for_post(r, parts[1])]
+        try:
+            start = int(query.get("cursor", ["0"])[0])
+            limit = int(query.get("limit", [str(PAGE_SIZE)])[0])
+        except ValueError:
+            return 400, {"error": "bad cursor or limit"}
+        page = records[start:start + limit]
+        end = start + len(page)
+        return 200, {"comments": page, "cursor": str(end), "has_more": end < len(records)}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                status, body = stub._page(url.path, parse_qs(url.query))
+                payload = json.dumps(body, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,119 @@
+"""
+Near-duplicate grouping for comment exports (bot floods, copy-paste replies).
+
+Texts are normalised (case, URLs, @mentions, punctuation, whitespace) and exact matches grouped
+first. The remaining texts are compared on their sets of word unigrams and bigrams: MinHash
+signatures are split into LSH bands so only texts sharing a band become candidates, and a
+candidate joins a group when its Jaccard similarity to the group's representative (the earliest
+member) reaches the threshold. Comparing against representatives only keeps groups from drifting
+through chains of small edits.
+"""
+import hashlib
+import re
+from typing import Dict, List, Set
+
+import numpy as np
+
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_MENTION = re.compile(r"@\w+")
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+# 16 bands x 4 rows: pairs at Jaccard 0.8 share a band with probability >0.999, at 0.3 with ~0.12
+BANDS = 16
+ROWS = 4
+_PERMUTATIONS = BANDS * ROWS
+_rng = np.random.default_rng(0x5EED)
+# Multiply-shift hash family on 64-bit feature hashes (wraparound arithmetic is intended)
+_A = _rng.integers(1, 2**63, size=_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, size=_PERMUTATIONS, dtype=np.uint64)
+
+def normalize(text: str) -> str:
+    text = _MENTION.sub(" ", _URL.sub(" ", text.lower()))
+    return " ".join(_TOKEN.findall(text))
+
+def shingles(normalized: str) -> Set[str]:
+    tokens = normalized.split()
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+def minhash_signatures(shingle_sets: List[Set[str]], chunk: int = 1024) -> np.ndarray:
+    """(len(shingle_sets), BANDS * ROWS) uint32 MinHash signatures. Sets must be non-empty."""
+    vocabulary: Dict[str, int] = {}
+    ids = [[vocabulary.setdefault(f, len(vocabulary)) for f in features] for features in shingle_sets]
+    # Each distinct shingle is hashed once; exports repeat the same words and phrases a lot
+    feature_hashes = np.array([_feature_hash(f) for f in vocabulary], dtype=np.uint64)
+    signatures = np.empty((len(shingle_sets), _PERMUTATIONS), dtype=np.uint32)
+    for start in range(0, len(ids), chunk):
+        block = ids[start:start + chunk]
+        lengths = [len(row) for row in block]
+        with np.errstate(over="ignore"):
+            permuted = (feature_hashes[np.fromiter((i for row in block for i in row), dtype=np.int64)][:, None] * _A + _B) >> np.uint64(32)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        signatures[start:start + len(block)] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures
+
+def _band_keys(signatures: np.ndarray) -> np.ndarray:
+    """One uint64 key per (text, band); collisions only add candidates, which Jaccard then rejects."""
+    rows = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    keys = np.zeros((len(signatures), BANDS), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(ROWS):
+            keys = keys * np.uint64(0x100000001B3) ^ rows[:, :, r]
+    return keys
+
+def group_near_duplicates(texts: List[str], threshold: float = 0.8) -> List[List[int]]:
+    """
+    Indices of `texts` grouped by near-identity, in order of first appearance; each group starts
+    with its representative. threshold is the minimum Jaccard similarity (>= 1.0: exact text only).
+    """
+    normalized = [normalize(t) for t in texts]
+    groups: List[List[int]] = []
+    exact: Dict[str, int] = {}
+    for i, text in enumerate(normalized):
+        group = exact.get(text)
+        if group is None:
+            exact[text] = len(groups)
+            groups.append([i])
+        else:
+            groups[group].append(i)
+    if threshold >= 1.0:
+        return groups
+
+    # Texts without any token (emoji-only, bare links) are only grouped exactly
+    candidates = [g for g in range(len(groups)) if normalized[groups[g][0]]]
+    if len(candidates) < 2:
+        return groups
+    sets = {g: shingles(normalized[groups[g][0]]) for g in candidates}
+    signatures = minhash_signatures([sets[g] for g in candidates])
+
+    buckets: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+    leader_of = list(range(len(groups)))
+    for g, keys in zip(candidates, _band_keys(signatures).tolist()):
+        match = None
+        seen = set()
+        for b, key in enumerate(keys):
+            for leader in buckets[b].get(key, ()):
+                if leader not in seen:
+                    seen.add(leader)
+                    if jaccard(sets[g], sets[leader]) >= threshold:
+                        match = leader
+                        break
+            if match is not None:
+                break
+        if match is None:
+            for b, key in enumerate(keys):
+                buckets[b].setdefault(key, []).append(g)
+        else:
+            leader_of[g] = match
+
+    merged: Dict[int, List[int]] = {}
+    for g, leader in enumerate(leader_of):
+        merged.setdefault(leader, []).extend(groups[g])
+    return [sorted(members) for members in merged.values()]
@@ -1,37 +1,181 @@
+import hashlib
 import json
 import os
-from typing import List, Dict, Any
-from datetime import datetime
-from ..core.schemas import Comment, AuthorType, IntentType, EmotionalIntensity
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+from ..core.schemas import Comment, AuthorType, IntentType, EmotionalIntensity, Watermark
 from ..core.semantic import SemanticEngine
+from ..core.metrics import metrics
+from .dedup import group_near_duplicates
+from .topics import TopicClusterer, label
+
+import numpy as np
+
+# Near-duplicate collapsing: minimum word-shingle Jaccard similarity for grouping comments (1.0 = exact text only)
+DEDUP_ENABLED = os.environ.get("MNEMOSYNE_DEDUP", "1") != "0"
+DEDUP_THRESHOLD = float(os.environ.get("MNEMOSYNE_DEDUP_THRESHOLD", "0.8"))
+
+# Embedding-based topic clustering with persisted centroids; MNEMOSYNE_TOPICS=0 keeps the keyword heuristic only.
+# Centroids live in <memory storage_dir>/topics.npz unless MNEMOSYNE_TOPICS_PATH names a file.
+TOPICS_ENABLED = os.environ.get("MNEMOSYNE_TOPICS", "1") != "0"
+TOPICS_PATH = os.environ.get("MNEMOSYNE_TOPICS_PATH") or None
+TOPICS_FILE = "topics.npz"
+
+def topics_for(storage_dir: Optional[str]) -> Optional[TopicClusterer]:
+    """
+    The shared clusterer for a memory storage dir (or MNEMOSYNE_TOPICS_PATH); without either, the
+    process-wide in-memory one. None if topic clustering is disabled.
+    """
+    if not TOPICS_ENABLED:
+        return None
+    return TopicClusterer.shared(TOPICS_PATH or (os.path.join(storage_dir, TOPICS_FILE) if storage_dir else None))
 
 class CommentIngestor:
     """
     V0 Comment Ingestor. 
     Classifies raw comment data based on heuristics.
+    With dedup on, near-identical comments (bot floods, copy-paste replies) that also classify alike
+    (intent and intensity) are collapsed into the earliest one, which carries the group size in
+    duplicate_count; only representatives are embedded.
+    topic_cluster comes from the given TopicClusterer (default: topics_for(None), in memory unless
+    MNEMOSYNE_TOPICS_PATH is set) when embeddings are available and from keyword heuristics
+    otherwise. History replays only look topics up; centroids are saved by the caller
+    (save_topics()) after live ingestion, or by the clusterer's refresh.
+    ingest_since() only classifies and embeds comments newer than a Watermark (by timestamp, then ID
+    for ties; undated comments by an ID from text and author), so repeated cycles over a growing
+    export cost in proportion to what is new.
     """
-    def __init__(self):
+    def __init__(self, dedup: bool = DEDUP_ENABLED, threshold: float = DEDUP_THRESHOLD, topics: Optional[TopicClusterer] = None):
         self.semantic = SemanticEngine()
+        self.dedup = dedup
+        self.threshold = threshold
+        self.topics = topics if topics is not None else topics_for(None)
     
-    def ingest_from_file(self, file_path: str, post_id: str) -> List[Comment]:
+    def ingest_from_file(self, file_path: str, post_id: str, until: Optional[Watermark] = None) -> List[Comment]:
+        """All comments in the export, or with `until` only those the watermark already covers."""
+        return self.ingest_records(self._read(file_path), post_id, until=until)
+
+    def ingest_since(self, file_path: str, post_id: str, watermark: Watermark) -> Tuple[List[Comment], Watermark]:
+        return self.ingest_records_since(self._read(file_path), post_id, watermark)
+
+    def ingest_records(self, raw_data: List[Dict[str, Any]], post_id: str, until: Optional[Watermark] = None) -> List[Comment]:
+        """Comments from raw export records (e.g. fetched by a SignalConnector); with `until`, a history replay."""
+        if until is not None:
+            raw_data = [raw for raw in raw_data if not self._is_new(raw, until)]
+            # Replayed comments were counted into the centroids when first ingested; only look their topics up
+            return self._ingest(raw_data, post_id, learn_topics=False)
+        return self._ingest(raw_data, post_id)
+
+    def save_topics(self):
+        """Persists topic centroids updated by live ingestion."""
+        if self.topics is not None:
+            self.topics.save()
+
+    def ingest_records_since(self, raw_data: List[Dict[str, Any]], post_id: str, watermark: Watermark) -> Tuple[List[Comment], Watermark]:
+        """
+        Comments the watermark does not cover yet, and a copy of the watermark advanced past them.
+        The advanced copy is not saved here: the caller persists it once the comments are accounted for.
+        """
+        raw_data = [raw for raw in raw_data if self._is_new(raw, watermark)]
+        comments = self._ingest(raw_data, post_id)
+
+        advanced = watermark.model_copy(deep=True)
+        advanced.processed_count += len(raw_data)
+        advanced.updated_at = datetime.utcnow()
+        positions = list(map(self._position, raw_data))
+        # Comments without a timestamp cannot be placed, so they are remembered by ID instead
+        undated = [cid for ts, cid in positions if ts is None and cid not in advanced.undated_ids]
+        advanced.undated_ids += list(dict.fromkeys(undated))
+        positions = [(ts, cid) for ts, cid in positions if ts is not None]
+        if positions:
+            latest = max(ts for ts, _ in positions)
+            ids = [cid for ts, cid in positions if ts == latest]
+            if latest == advanced.last_timestamp:
+                ids = advanced.last_ids + ids
+            advanced.last_timestamp, advanced.last_ids = latest, ids
+        return comments, advanced
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
         if not os.path.exists(file_path):
             return []
-            
         with open(file_path, "r") as f:
-            raw_data = json.load(f)
-            
+            return json.load(f)
+
+    def _position(self, raw: Dict[str, Any]) -> Tuple[Optional[datetime], str]:
+        """(naive UTC timestamp or None, comment ID) used to order comments against a watermark."""
+        if not raw.get("timestamp"):
+            return None, raw.get("comment_id") or self._comment_id(raw)
+        timestamp = self._timestamp(raw)
+        comment_id = raw.get("comment_id") or self._comment_id(raw, timestamp)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp, comment_id
+
+    def _is_new(self, raw: Dict[str, Any], watermark: Watermark) -> bool:
+        timestamp, comment_id = self._position(raw)
+        if timestamp is None:
+            return comment_id not in watermark.undated_ids
+        if watermark.last_timestamp is None or timestamp > watermark.last_timestamp:
+            return True
+        return timestamp == watermark.last_timestamp and comment_id not in watermark.last_ids
+
+    def _ingest(self, raw_data: List[Dict[str, Any]], post_id: str, learn_topics: bool = True) -> List[Comment]:
+        if not self.dedup:
+            comments = [self._classify(raw, post_id) for raw in raw_data]
+            self._embed(comments, learn_topics)
+            return comments
+
+        groups = group_near_duplicates([raw.get("text", "") for raw in raw_data], self.threshold)
         comments = []
-        for raw in raw_data:
-            comment = self._classify(raw, post_id)
-            comments.append(comment)
+        for members in groups:
+            # Normalisation drops the punctuation and casing the heuristics read, so a group only
+            # collapses members classified like its representative ("bad!" and "bad?" stay apart)
+            classified: Dict[Tuple[IntentType, EmotionalIntensity], List[Comment]] = {}
+            for i in members:
+                member = self._classify(raw_data[i], post_id)
+                classified.setdefault((member.intent, member.emotional_intensity), []).append(member)
+            for comment, *duplicates in classified.values():
+                if duplicates:
+                    comment.duplicate_count = 1 + len(duplicates)
+                    comment.duplicate_ids = [d.id for d in duplicates]
+                comments.append(comment)
+        metrics.inc("mnemosyne_comments_collapsed_total", len(raw_data) - len(comments))
+        self._embed(comments, learn_topics)
         return comments
 
+    def _embed(self, comments: List[Comment], learn_topics: bool = True):
+        # V1 Semantic Embedding, batched
+        for comment, embedding in zip(comments, self.semantic.encode_many([c.content for c in comments])):
+            comment.embedding = embedding
+        self._assign_topics(comments, learn_topics)
+
+    def _assign_topics(self, comments: List[Comment], learn: bool = True):
+        embedded = [c for c in comments if c.embedding]
+        if self.topics is None or not embedded:
+            return
+        topic_ids = self.topics.assign(np.asarray([c.embedding for c in embedded], dtype=np.float32), [c.content for c in embedded], learn=learn)
+        for comment, topic_id in zip(embedded, topic_ids):
+            if topic_id >= 0:
+                comment.topic_cluster = label(topic_id)
+
+    def _timestamp(self, raw: Dict[str, Any]) -> datetime:
+        timestamp_str = raw.get("timestamp")
+        return datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.utcnow()
+
+    def _comment_id(self, raw: Dict[str, Any], timestamp: Optional[datetime] = None) -> str:
+        # Stable across processes (unlike hash()), so watermarks and stored contradictions can refer to it.
+        # Undated records are keyed by author instead of the ingestion-time fallback timestamp.
+        if not raw.get("timestamp"):
+            key = raw.get('text', '') + "\x00" + raw.get("author", "anonymous")
+        else:
+            key = raw.get('text', '') + str(timestamp or self._timestamp(raw))
+        return f"cmt_{hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()}"
+
     def _classify(self, raw: Dict[str, Any], post_id: str) -> Comment:
         text = raw.get("text", "")
         author = raw.get("author", "anonymous")
         author_type = AuthorType(raw.get("author_type", "unknown"))
-        timestamp_str = raw.get("timestamp")
-        timestamp = datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.utcnow()
+        timestamp = self._timestamp(raw)
         
         # Heuristic Intent Classification
         intent = IntentType.PRAISE
@@ -42,7 +186,7 @@ class CommentIngestor:
         elif len(text.split()) < 3:
             intent = IntentType.SPAM
             
-        # Topic Cluster Heuristic (lightweight)
+        # Topic Cluster Heuristic (lightweight; replaced by embedding topics in _assign_topics)
         topic_cluster = "general"
         if any(word in text.lower() for word in ["memory", "brain", "continuity"]):
             topic_cluster = "architecture"
@@ -57,11 +201,10 @@ class CommentIngestor:
             intensity = EmotionalIntensity.MEDIUM
             
         return Comment(
-            id=f"cmt_{hash(text + str(timestamp))}",
+            id=self._comment_id(raw, timestamp),
             post_id=post_id,
             author=author,
             author_type=author_type,
-            embedding=self.semantic.encode(text), # V1 Semantic Embedding
             content=text,
             intent=intent,
             topic_cluster=topic_cluster,
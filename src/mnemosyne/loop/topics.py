@@ -0,0 +1,363 @@
+"""
+Online topic clustering over comment embeddings.
+
+New comments are assigned to the nearest centroid with one matrix product; a comment whose best
+cosine is below `new_topic_threshold` starts a new topic (until max_topics). Assigned vectors
+nudge their centroid towards them (running mean, learning rate 1/count). Every `refresh_every`
+assignments a background thread runs a few mini-batch k-means passes over a reservoir sample of
+recent vectors and merges topics whose centroids have converged, so topics sharpen over time
+without re-clustering the corpus.
+
+Topic ids are stable integers (labels "topic_<id>"); merged ids are kept as aliases. Centroids,
+counts and top keywords are persisted to an .npz file so assignments stay consistent across
+restarts and processes (the last process to save wins; centroids are approximate anyway).
+"""
+import io
+import json
+import os
+import random
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.log import get_logger
+from ..core.metrics import metrics
+from ..memory.storage import atomic_write, file_stamp
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"[a-z][a-z']{2,}")
+_STOPWORDS = frozenset(
+    "the and for are but not you your with this that have has was were they them their what when "
+    "where who how why can could would should will just about from into more most very really "
+    "than then there here its it's i'm don't all any our out get got like one also been being".split()
+)
+# Keyword counts kept per topic (enough to name it without growing without bound)
+_KEYWORDS_KEPT = 50
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+def _sum_by_row(vectors: np.ndarray, rows: np.ndarray, size: int) -> np.ndarray:
+    """Per-row sums of the vectors assigned to each row (np.add.at without its per-element overhead)."""
+    sums = np.zeros((size, vectors.shape[1]), dtype=np.float32)
+    order = np.argsort(rows, kind="stable")
+    present, starts = np.unique(rows[order], return_index=True)
+    sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+    return sums
+
+class TopicClusterer:
+    """Incremental centroid clustering; thread-safe. Use shared() for the process-wide instance per path."""
+    _shared: Dict[Optional[str], "TopicClusterer"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        new_topic_threshold: float = 0.45,
+        merge_threshold: float = 0.85,
+        max_topics: int = 256,
+        refresh_every: int = 2000,
+        sample_size: int = 4096,
+        background: bool = True,
+    ):
+        self.path = path
+        self.new_topic_threshold = new_topic_threshold
+        self.merge_threshold = merge_threshold
+        self.max_topics = max_topics
+        self.refresh_every = refresh_every
+        self.sample_size = sample_size
+        self.background = background
+        self._lock = threading.RLock()
+        # Bumped (under _lock) when topics are reset or reloaded, which invalidates a running refresh
+        self._epoch = 0
+        # (vectors, rows) assigned while refresh() runs k-means; None when no refresh is running
+        self._replay: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._rng = random.Random(0)
+        self._reset()
+        if path:
+            self._load()
+
+    @classmethod
+    def shared(cls, path: Optional[str]) -> "TopicClusterer":
+        """The process-wide instance for `path`; path None is an in-memory clusterer that is never saved."""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def _reset(self, dims: int = 0):
+        self.centroids = np.zeros((0, dims), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.keywords: Dict[int, Counter] = {}
+        self.aliases: Dict[int, int] = {}
+        self.next_id = 0
+        self._sample: List[np.ndarray] = []
+        self._seen = 0
+        self._since_refresh = 0
+        self._dirty = False
+        self._stamp = None
+        self._epoch += 1
+
+    # --- Assignment ---
+
+    def assign(self, vectors: np.ndarray, texts: Optional[List[str]] = None, learn: bool = True) -> List[int]:
+        """
+        Topic id per row of `vectors` (L2-normalised internally). Rows that are all zero get -1.
+        With learn=False (re-reading comments already counted) nothing is updated: rows get their
+        nearest existing topic, or -1 if none is within new_topic_threshold.
+        """
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        if not len(vectors):
+            return []
+        with self._lock:
+            self._reload_if_changed()
+            if not learn:
+                return self._lookup(vectors)
+            if self.centroids.shape[1] != vectors.shape[1]:
+                if len(self.centroids):
+                    logger.warning("Embedding size changed (%d -> %d); starting topics afresh", self.centroids.shape[1], vectors.shape[1])
+                self._reset(vectors.shape[1])
+            rows = self._nearest(vectors)
+            valid = rows >= 0
+            self._update_centroids(vectors[valid], rows[valid])
+            topic_ids = np.where(valid, self.ids[np.maximum(rows, 0)] if len(self.ids) else -1, -1).tolist()
+            if texts is not None:
+                by_topic: Dict[int, List[str]] = {}
+                for topic, text in zip(topic_ids, texts):
+                    if topic >= 0:
+                        by_topic.setdefault(topic, []).append(text)
+                for topic, topic_texts in by_topic.items():
+                    self._add_keywords(topic, " ".join(topic_texts))
+            self._remember(vectors[valid])
+            if self._replay is not None:
+                self._replay.append((vectors[valid], rows[valid]))
+            self._dirty = True
+            refresh_due = self._since_refresh >= self.refresh_every
+        metrics.inc("mnemosyne_topic_assignments_total", len(topic_ids))
+        if refresh_due:
+            self._schedule_refresh()
+        return topic_ids
+
+    def _lookup(self, vectors: np.ndarray) -> List[int]:
+        if not len(self.centroids) or self.centroids.shape[1] != vectors.shape[1]:
+            return [-1] * len(vectors)
+        scores = vectors @ self.centroids.T
+        rows = scores.argmax(axis=1)
+        best = scores[np.arange(len(vectors)), rows]
+        return np.where(best >= self.new_topic_threshold, self.ids[rows], -1).tolist()
+
+    def _nearest(self, vectors: np.ndarray) -> np.ndarray:
+        """Centroid row per vector, creating topics for vectors that fit none. -1 for zero vectors."""
+        rows = np.full(len(vectors), -1, dtype=np.int64)
+        if len(self.centroids):
+            scores = vectors @ self.centroids.T
+            rows = scores.argmax(axis=1)
+            best = scores[np.arange(len(vectors)), rows]
+        else:
+            best = np.full(len(vectors), -np.inf, dtype=np.float32)
+        nonzero = np.any(vectors != 0, axis=1)
+        rows[~nonzero] = -1
+        # Outliers are handled one by one so that several similar outliers in a batch share a new topic
+        for i in np.flatnonzero(nonzero & (best < self.new_topic_threshold)):
+            if len(self.centroids):
+                scores = self.centroids @ vectors[i]
+                j = int(scores.argmax())
+                if scores[j] >= self.new_topic_threshold or len(self.centroids) >= self.max_topics:
+                    rows[i] = j
+                    continue
+            rows[i] = self._new_topic(vectors[i])
+        return rows
+
+    def _new_topic(self, vector: np.ndarray) -> int:
+        self.centroids = np.vstack([self.centroids, vector[None, :]])
+        self.ids = np.append(self.ids, self.next_id)
+        self.counts = np.append(self.counts, 0)
+        self.next_id += 1
+        metrics.inc("mnemosyne_topics_created_total")
+        return len(self.centroids) - 1
+
+    def _update_centroids(self, vectors: np.ndarray, rows: np.ndarray):
+        """Running-mean update: each centroid moves to the mean of everything assigned to it so far."""
+        if not len(rows):
+            return
+        sums = _sum_by_row(vectors, rows, len(self.centroids))
+        added = np.bincount(rows, minlength=len(self.centroids))
+        touched = added > 0
+        counts = self.counts + added
+        self.centroids[touched] = _normalize(
+            self.centroids[touched] * self.counts[touched, None] + sums[touched]
+        )
+        self.counts = counts
+        self._since_refresh += len(rows)
+
+    def _remember(self, vectors: np.ndarray):
+        """Reservoir sample of assigned vectors for refresh()."""
+        for vector in vectors:
+            self._seen += 1
+            if len(self._sample) < self.sample_size:
+                self._sample.append(vector)
+            else:
+                k = self._rng.randrange(self._seen)
+                if k < self.sample_size:
+                    self._sample[k] = vector
+
+    def _add_keywords(self, topic: int, text: str):
+        counter = self.keywords.setdefault(topic, Counter())
+        counter.update(t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS)
+        if len(counter) > 4 * _KEYWORDS_KEPT:
+            self.keywords[topic] = Counter(dict(counter.most_common(_KEYWORDS_KEPT)))
+
+    # --- Lookup ---
+
+    def resolve(self, topic_id: int) -> int:
+        """Current id of a topic that may since have been merged into another."""
+        while topic_id in self.aliases:
+            topic_id = self.aliases[topic_id]
+        return topic_id
+
+    def describe(self, top: int = 3) -> Dict[str, Dict[str, object]]:
+        """label -> {"size", "keywords"} for every live topic, largest first."""
+        with self._lock:
+            order = np.argsort(-self.counts, kind="stable")
+            return {
+                label(int(self.ids[i])): {
+                    "size": int(self.counts[i]),
+                    "keywords": [w for w, _ in self.keywords.get(int(self.ids[i]), Counter()).most_common(top)],
+                }
+                for i in order
+            }
+
+    # --- Refresh ---
+
+    def _schedule_refresh(self):
+        if not self.background:
+            self.refresh()
+            return
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh, name="topic-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def refresh(self, iterations: int = 3):
+        """
+        Mini-batch k-means over the reservoir sample, then merges converged topics and saves.
+        Assignments made while k-means runs are logged and folded into the refreshed centroids
+        afterwards, so they are not lost; only a reset or reload in the meantime discards the result.
+        """
+        with self._lock:
+            if not len(self.centroids) or not self._sample or self._replay is not None:
+                return
+            centroids = self.centroids.copy()
+            known = len(centroids)
+            counts = self.counts.copy()
+            sample = np.stack(self._sample)
+            epoch = self._epoch
+            self._replay = []
+            self._since_refresh = 0
+
+        try:
+            with metrics.timer("mnemosyne_topic_refresh_seconds"):
+                for _ in range(iterations):
+                    rows = (sample @ centroids.T).argmax(axis=1)
+                    sums = _sum_by_row(sample, rows, known)
+                    members = np.bincount(rows, minlength=known) > 0
+                    centroids[members] = _normalize(sums[members])
+        finally:
+            with self._lock:
+                replay, self._replay = self._replay, None
+
+        with self._lock:
+            if self._epoch != epoch:
+                metrics.inc("mnemosyne_topic_refreshes_discarded_total")
+                logger.debug("Discarding topic refresh: topics were reset or reloaded while it ran")
+                return
+            if replay:
+                # Same running-mean update assign() made to the old centroids, now on the refreshed ones
+                vectors = np.concatenate([v for v, _ in replay])
+                rows = np.concatenate([r for _, r in replay])
+                old = rows < known
+                sums = _sum_by_row(vectors[old], rows[old], known)
+                touched = np.bincount(rows[old], minlength=known) > 0
+                centroids[touched] = _normalize(centroids[touched] * counts[touched, None] + sums[touched])
+            # Topics created while refreshing keep their current centroid
+            centroids = np.vstack([centroids, self.centroids[known:]])
+            merge_into = self._merge_plan(centroids)
+            keep = merge_into == np.arange(len(merge_into))
+            counts = np.bincount(merge_into, weights=self.counts, minlength=len(merge_into)).astype(np.int64)
+            for source in np.flatnonzero(~keep):
+                target = int(self.ids[merge_into[source]])
+                old = int(self.ids[source])
+                self.aliases[old] = target
+                self.keywords.setdefault(target, Counter()).update(self.keywords.pop(old, Counter()))
+            self.centroids, self.ids, self.counts = centroids[keep], self.ids[keep], counts[keep]
+            self._dirty = True
+            if (~keep).any():
+                metrics.inc("mnemosyne_topics_merged_total", int((~keep).sum()))
+            self.save()
+
+    def _merge_plan(self, centroids: np.ndarray) -> np.ndarray:
+        """Row each centroid merges into (itself if it survives); earlier topics absorb later ones."""
+        merge_into = np.arange(len(centroids))
+        similar = centroids @ centroids.T >= self.merge_threshold
+        for i in range(len(centroids)):
+            if merge_into[i] != i:
+                continue
+            later = np.flatnonzero(similar[i, i + 1:]) + i + 1
+            later = later[merge_into[later] == later]
+            merge_into[later] = i
+        return merge_into
+
+    # --- Persistence ---
+
+    def save(self):
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            buffer = io.BytesIO()
+            np.savez(
+                buffer,
+                centroids=self.centroids,
+                ids=self.ids,
+                counts=self.counts,
+                next_id=np.array(self.next_id),
+                keywords=np.array(json.dumps({str(k): dict(v.most_common(_KEYWORDS_KEPT)) for k, v in self.keywords.items()})),
+                aliases=np.array(json.dumps({str(k): v for k, v in self.aliases.items()})),
+            )
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            atomic_write(self.path, buffer.getvalue())
+            self._stamp = file_stamp(self.path)
+            self._dirty = False
+
+    def _load(self):
+        stamp = file_stamp(self.path)
+        if stamp is None:
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self.centroids = data["centroids"].astype(np.float32)
+                self.ids = data["ids"]
+                self.counts = data["counts"]
+                self.next_id = int(data["next_id"])
+                self.keywords = {int(k): Counter(v) for k, v in json.loads(str(data["keywords"])).items()}
+                self.aliases = {int(k): v for k, v in json.loads(str(data["aliases"])).items()}
+            self._stamp = stamp
+            self._dirty = False
+            self._epoch += 1
+        except Exception as e:
+            logger.warning("Could not load topic centroids from %s: %s", self.path, e)
+
+    def _reload_if_changed(self):
+        """Picks up centroids saved by another process, unless this one has unsaved changes."""
+        if self.path and not self._dirty and file_stamp(self.path) != self._stamp:
+            self._load()
+
+def label(topic_id: int) -> str:
+    return f"topic_{topic_id}"
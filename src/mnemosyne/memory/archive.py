@@ -0,0 +1,154 @@
+"""
+Tiered storage for append-mostly memory collections.
+
+Hot records live in MemoryManager (and its JSON files); records older than the retention window
+are rolled into immutable gzip segments under <storage>/archive/<collection>/. Each collection has
+a manifest listing its segments with time range, sequence range and record keys, so lookbacks and
+point lookups only decompress the segments they need.
+
+A segment is first written as "pending" and only marked committed after the hot JSON without those
+records has been saved. On startup, pending segments have their records dropped from the hot set,
+so a crash between the two writes never duplicates or loses history.
+Writers are expected to hold MemoryManager's storage lock.
+"""
+import gzip
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from .storage import atomic_write, file_stamp
+
+class RetentionPolicy:
+    """How much history stays resident. Records older than hot_days (or beyond max_hot_records) are archived."""
+    def __init__(self, hot_days: int = 30, max_hot_records: Optional[int] = None, check_interval: float = 300.0):
+        self.hot_days = hot_days
+        self.max_hot_records = max_hot_records
+        # Seconds between cold-record scans triggered from MemoryManager._save()
+        self.check_interval = check_interval
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.utcnow()) - timedelta(days=self.hot_days)
+
+    @classmethod
+    def from_env(cls) -> Optional["RetentionPolicy"]:
+        """MNEMOSYNE_HOT_DAYS enables archival; MNEMOSYNE_MAX_HOT_RECORDS optionally caps hot rows."""
+        hot_days = os.environ.get("MNEMOSYNE_HOT_DAYS")
+        if not hot_days:
+            return None
+        max_hot = os.environ.get("MNEMOSYNE_MAX_HOT_RECORDS")
+        return cls(hot_days=int(hot_days), max_hot_records=int(max_hot) if max_hot else None)
+
+class ArchiveStore:
+    """Immutable, compressed segments plus a per-collection manifest."""
+    def __init__(self, root: str, cache_segments: int = 4):
+        self.root = root
+        self.cache_segments = cache_segments
+        self._manifests: Dict[str, List[Dict[str, Any]]] = {}
+        self._manifest_stamps: Dict[str, Any] = {}
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+    # --- Write path ---
+
+    def write_segment(
+        self,
+        collection: str,
+        records: List[Dict[str, Any]],
+        timestamps: List[datetime],
+        keys: Optional[List[str]] = None,
+        seqs: Optional[List[int]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Persists records as a new pending segment. Call commit() once the hot copy is saved without them."""
+        if not records:
+            return None
+        manifest = self.manifest(collection)
+        directory = os.path.join(self.root, collection)
+        os.makedirs(directory, exist_ok=True)
+        name = f"{len(manifest):06d}.jsonl.gz"
+        payload = gzip.compress("".join(json.dumps(r, default=str) + "\n" for r in records).encode("utf-8"))
+        atomic_write(os.path.join(directory, name), payload)
+
+        entry = {
+            "file": name,
+            "count": len(records),
+            "min_ts": min(timestamps).isoformat(),
+            "max_ts": max(timestamps).isoformat(),
+            "committed": False,
+        }
+        if keys is not None:
+            entry["keys"] = keys
+        if seqs:
+            entry["min_seq"], entry["max_seq"] = min(seqs), max(seqs)
+        manifest.append(entry)
+        self._write_manifest(collection)
+        return entry
+
+    def commit(self, collection: str):
+        manifest = self.manifest(collection)
+        if any(not e["committed"] for e in manifest):
+            for entry in manifest:
+                entry["committed"] = True
+            self._write_manifest(collection)
+
+    def pending(self, collection: str) -> List[Dict[str, Any]]:
+        return [e for e in self.manifest(collection) if not e["committed"]]
+
+    # --- Read path ---
+
+    def manifest(self, collection: str) -> List[Dict[str, Any]]:
+        """Segment list for a collection, re-read whenever another process has replaced the file."""
+        path = os.path.join(self.root, collection, "manifest.json")
+        stamp = file_stamp(path)
+        if collection not in self._manifests or stamp != self._manifest_stamps.get(collection):
+            if stamp is not None:
+                with open(path, "r") as f:
+                    self._manifests[collection] = json.load(f)
+            else:
+                self._manifests[collection] = []
+            self._manifest_stamps[collection] = stamp
+        return self._manifests[collection]
+
+    def count(self, collection: str) -> int:
+        return sum(e["count"] for e in self.manifest(collection))
+
+    def read_segment(self, collection: str, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        path = os.path.join(self.root, collection, entry["file"])
+        records = self._cache.get(path)
+        if records is None:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            self._cache[path] = records
+            if len(self._cache) > self.cache_segments:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(path)
+        return records
+
+    def iter_records(self, collection: str, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Records from segments whose time range overlaps [since, until]; callers filter individual rows."""
+        for entry in self.manifest(collection):
+            if since is not None and datetime.fromisoformat(entry["max_ts"]) < since:
+                continue
+            if until is not None and datetime.fromisoformat(entry["min_ts"]) > until:
+                continue
+            yield from self.read_segment(collection, entry)
+
+    def find_key(self, collection: str, key_field: str, key: str) -> Optional[Dict[str, Any]]:
+        for entry in reversed(self.manifest(collection)):
+            if key in entry.get("keys", ()):
+                return next((r for r in self.read_segment(collection, entry) if r.get(key_field) == key), None)
+        return None
+
+    def find_seq(self, collection: str, seq: int) -> Optional[Dict[str, Any]]:
+        for entry in self.manifest(collection):
+            if entry.get("min_seq", 0) <= seq <= entry.get("max_seq", -1):
+                record = next((r for r in self.read_segment(collection, entry) if r.get("seq") == seq), None)
+                if record is not None:
+                    return record
+        return None
+
+    def _write_manifest(self, collection: str):
+        path = os.path.join(self.root, collection, "manifest.json")
+        atomic_write(path, json.dumps(self._manifests[collection], indent=2).encode("utf-8"))
+        self._manifest_stamps[collection] = file_stamp(path)
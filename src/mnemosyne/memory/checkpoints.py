@@ -0,0 +1,101 @@
+"""
+Durable per-stage checkpoints for ReasoningLoop execution.
+
+After each completed stage LoopOrchestrator saves the loop together with the context artifacts the
+stages produced (comments, contradictions, watermarks, pivot data, the draft post, ...) to
+<root>/<loop_id>.json. After a crash, resume() restores both and the loop continues at the first stage
+that had not completed, without re-ingesting or re-embedding.
+
+Only durable values are checkpointed: Pydantic models from core.schemas (alone or in lists) and plain
+JSON data. Live objects such as the MemoryManager, connectors or loader callables are skipped, as are
+LoopOrchestrator.LIVE_KEYS (current assumptions); they must be supplied again in the context passed
+to resume(), whose own values always win over checkpointed ones.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+
+from ..core import schemas
+from ..core.log import get_logger
+from ..core.metrics import metrics
+from ..core.schemas import ReasoningLoop
+from .storage import atomic_write
+
+logger = get_logger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+class CheckpointStore:
+    """One JSON checkpoint per loop, replaced atomically after every stage."""
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, loop_id: str) -> str:
+        return os.path.join(self.root, f"{loop_id}.json")
+
+    def save(self, loop: ReasoningLoop, context: Dict[str, Any]):
+        artifacts: Dict[str, Any] = {}
+        skipped = []
+        for key, value in context.items():
+            encoded = _encode(value)
+            if encoded is None:
+                skipped.append(key)
+            else:
+                artifacts[key] = encoded
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "saved_at": datetime.utcnow(),
+            "completed_stage": loop.steps[-1].stage if loop.steps else None,
+            "loop": loop,
+            "artifacts": artifacts,
+            "skipped": skipped,
+        }
+        with metrics.timer("mnemosyne_checkpoint_save_seconds"):
+            os.makedirs(self.root, exist_ok=True)
+            atomic_write(self._path(loop.id), pydantic_core.to_json(payload))
+
+    def load(self, loop_id: str) -> Optional[Tuple[ReasoningLoop, Dict[str, Any]]]:
+        """(loop, restored context artifacts), or None without a checkpoint."""
+        path = self._path(loop_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            payload = pydantic_core.from_json(f.read())
+        context = {}
+        for key, encoded in payload["artifacts"].items():
+            try:
+                context[key] = _decode(encoded)
+            except (AttributeError, ValueError) as e:
+                logger.warning("Dropping checkpoint artifact %s: %s", key, e, extra={"loop_id": loop_id})
+        return ReasoningLoop.model_validate(payload["loop"]), context
+
+    def clear(self, loop_id: str):
+        if os.path.exists(self._path(loop_id)):
+            os.remove(self._path(loop_id))
+
+def _encode(value: Any) -> Optional[Dict[str, Any]]:
+    """{"model": name, "data": ...} / {"models": name, "data": [...]} / {"json": ...}, or None if not durable."""
+    if isinstance(value, BaseModel) and getattr(schemas, type(value).__name__, None) is type(value):
+        return {"model": type(value).__name__, "data": value}
+    if isinstance(value, list) and value and all(type(v) is type(value[0]) for v in value):
+        encoded = _encode(value[0])
+        if encoded is not None and "model" in encoded:
+            return {"models": encoded["model"], "data": value}
+    try:
+        # Round-trips plain data only; anything pydantic would stringify (callables, clients) is not durable
+        if json.loads(json.dumps(value)) == value:
+            return {"json": value}
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def _decode(encoded: Dict[str, Any]) -> Any:
+    if "json" in encoded:
+        return encoded["json"]
+    if "model" in encoded:
+        return getattr(schemas, encoded["model"]).model_validate(encoded["data"])
+    return TypeAdapter(list[getattr(schemas, encoded["models"])]).validate_python(encoded["data"])
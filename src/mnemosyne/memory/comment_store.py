@@ -0,0 +1,312 @@
+"""
+Persistent comment store, partitioned by post and UTC day.
+
+Layout under the store root:
+    <post_id>/<YYYY-MM-DD>/<segment>.npz   columnar metadata (snapshot encoding, see snapshot.py)
+    <post_id>/<YYYY-MM-DD>/<segment>.npy   float32 embedding matrix, row-aligned with the .npz
+
+Segments are immutable: append() writes a new one per touched partition (embeddings first, the
+metadata file last, so a segment only becomes visible once complete), skipping comment IDs the
+partition already holds. Once a partition has more than MAX_SEGMENTS segments they are merged: a
+<merged>.replaces file listing the old segments is written before the merged segment, so listings
+hide the old ones as soon as the merged one is complete, even if a crash keeps them from being
+deleted (the next append to the partition finishes the job).
+
+scan() prunes partitions by post and day from directory names, then filters rows on the dictionary
+codes of intent / author_type / emotional_intensity / topic_cluster and on the timestamp column
+without decoding other rows. Embedding matrices are memory-mapped, so only the selected rows are
+read, and scanned comments come back with their stored embeddings (no re-embedding). Reads take no
+lock: a partition whose listed segments a concurrent merge deleted is simply listed again.
+"""
+import io
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from ..core.metrics import metrics
+from ..core.schemas import Comment
+from .snapshot import SnapshotTable, _encode_records, _naive_utc
+from .storage import StorageLock, atomic_write
+
+# Segments per partition before append() merges them into one
+MAX_SEGMENTS = int(os.environ.get("MNEMOSYNE_COMMENT_MAX_SEGMENTS", "8"))
+# Opened segments (metadata table + embedding mmap) kept per store, least recently used evicted first
+SEGMENT_CACHE = int(os.environ.get("MNEMOSYNE_COMMENT_SEGMENT_CACHE", "64"))
+# Lock-free listings of a partition scan() tries before listing it under the storage lock
+_SCAN_ATTEMPTS = 2
+
+_DAY = "%Y-%m-%d"
+_REPLACES = ".replaces"
+
+class CommentStore:
+    """Comments partitioned by post and day, with memory-mapped embeddings."""
+    def __init__(self, root: str):
+        self.root = root
+        self._lock: Optional[StorageLock] = None
+        # Segments are immutable, so opened ones stay valid until a merge deletes them. Scans run
+        # without the storage lock, so the cache has its own
+        self._segments: "OrderedDict[str, Tuple[SnapshotTable, Optional[np.ndarray]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    # --- Write path ---
+
+    def append(self, comments: Iterable[Comment]) -> int:
+        """Stores comments not already in their partition. Returns how many were new."""
+        by_partition: Dict[Tuple[str, str], List[Comment]] = defaultdict(list)
+        for comment in comments:
+            by_partition[(comment.post_id, _naive_utc(comment.timestamp).strftime(_DAY))].append(comment)
+        if not by_partition:
+            return 0
+
+        written = 0
+        with self._storage_lock():
+            for (post_id, day), batch in by_partition.items():
+                directory = os.path.join(self.root, quote(post_id, safe=""), day)
+                os.makedirs(directory, exist_ok=True)
+                self._finish_merges(directory)
+                known = {cid for name in self._segment_names(directory) for cid in self._open(os.path.join(directory, name))[0].strings("id")}
+                fresh: Dict[str, Comment] = {}
+                for comment in batch:
+                    if comment.id not in known:
+                        fresh.setdefault(comment.id, comment)
+                if fresh:
+                    self._write_segment(directory, list(fresh.values()))
+                    written += len(fresh)
+                if len(self._segment_names(directory)) > MAX_SEGMENTS:
+                    self._merge(directory)
+        metrics.inc("mnemosyne_comment_store_appended_total", written)
+        return written
+
+    def _write_segment(self, directory: str, comments: List[Comment], name: Optional[str] = None):
+        name = name or _segment_name()
+        width = max((len(c.embedding) for c in comments if c.embedding), default=0)
+        if width:
+            matrix = np.zeros((len(comments), width), dtype=np.float32)
+            for i, comment in enumerate(comments):
+                if comment.embedding:
+                    matrix[i, :len(comment.embedding)] = comment.embedding
+            atomic_write(os.path.join(directory, f"{name}.npy"), _to_bytes(np.save, matrix))
+        arrays = _encode_records([c.model_copy(update={"embedding": None}) for c in comments])
+        arrays["has_embedding"] = np.array([bool(c.embedding) for c in comments], dtype=bool)
+        atomic_write(os.path.join(directory, f"{name}.npz"), _to_bytes(np.savez, **arrays))
+
+    def _merge(self, directory: str):
+        names = self._segment_names(directory)
+        comments = [c for name in names for c in self._rows(os.path.join(directory, name), None, embeddings=True)]
+        merged = _segment_name()
+        atomic_write(os.path.join(directory, merged + _REPLACES), json.dumps(names).encode("utf-8"))
+        self._write_segment(directory, comments, merged)
+        self._finish_merges(directory)
+        metrics.inc("mnemosyne_comment_store_merges_total")
+
+    def _finish_merges(self, directory: str):
+        """
+        Under the storage lock: deletes segments replaced by a complete merge, then its .replaces
+        file, and clears what a crashed write left behind (embeddings or merge lists without a segment).
+        """
+        files = os.listdir(directory)
+        complete = {name[:-4] for name in files if name.endswith(".npz")}
+        for name in files:
+            if name.endswith(_REPLACES) and name[:-len(_REPLACES)] in complete:
+                for replaced in _read_replaces(os.path.join(directory, name)):
+                    self._delete_segment(os.path.join(directory, replaced))
+                os.remove(os.path.join(directory, name))
+            elif (name.endswith(_REPLACES) and name[:-len(_REPLACES)] not in complete) or (name.endswith(".npy") and name[:-4] not in complete):
+                os.remove(os.path.join(directory, name))
+
+    def _delete_segment(self, base: str):
+        with self._cache_lock:
+            self._segments.pop(base, None)
+        # Metadata first: without it the segment is no longer listed
+        for suffix in (".npz", ".npy"):
+            if os.path.exists(base + suffix):
+                os.remove(base + suffix)
+
+    def prune(self, before: date) -> int:
+        """Deletes day partitions older than `before`. Returns how many were removed."""
+        removed = 0
+        with self._storage_lock():
+            for directory, _ in self._partitions(None, None, before - timedelta(days=1)):
+                with self._cache_lock:
+                    for base in [k for k in self._segments if k.startswith(directory + os.sep)]:
+                        del self._segments[base]
+                shutil.rmtree(directory)
+                removed += 1
+        return removed
+
+    # --- Read path ---
+
+    def scan(
+        self,
+        post_ids: Optional[Sequence[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        intents: Optional[Sequence[str]] = None,
+        author_types: Optional[Sequence[str]] = None,
+        intensities: Optional[Sequence[str]] = None,
+        topics: Optional[Sequence[str]] = None,
+        embeddings: bool = True,
+    ) -> List[Comment]:
+        """
+        Stored comments matching every given filter (None = no filter), in partition order.
+        since/until bound the timestamp (inclusive, naive UTC); enum filters take values or members,
+        e.g. scan(post_ids=narrative_posts, since=week_start, intents=[IntentType.CRITIQUE],
+        intensities=[EmotionalIntensity.HIGH]).
+        """
+        since = _naive_utc(since) if since else None
+        until = _naive_utc(until) if until else None
+        filters = {
+            "intent": intents,
+            "author_type": author_types,
+            "emotional_intensity": intensities,
+            "topic_cluster": topics,
+        }
+        results: List[Comment] = []
+        with metrics.timer("mnemosyne_comment_store_scan_seconds"):
+            for directory, _ in self._partitions(post_ids, since.date() if since else None, until.date() if until else None):
+                results.extend(self._scan_partition(directory, filters, since, until, embeddings))
+        return results
+
+    def _scan_partition(self, directory: str, filters: Dict[str, Optional[Sequence]], since: Optional[datetime],
+                        until: Optional[datetime], embeddings: bool) -> List[Comment]:
+        # Reads take no lock, so another process's merge or prune may delete segments just listed;
+        # the partition is then listed again, and finally read under the lock
+        for _ in range(_SCAN_ATTEMPTS):
+            try:
+                return self._scan_segments(directory, filters, since, until, embeddings)
+            except FileNotFoundError:
+                metrics.inc("mnemosyne_comment_store_scan_retries_total")
+        with self._storage_lock():
+            return self._scan_segments(directory, filters, since, until, embeddings)
+
+    def _scan_segments(self, directory: str, filters: Dict[str, Optional[Sequence]], since: Optional[datetime],
+                       until: Optional[datetime], embeddings: bool) -> List[Comment]:
+        results: List[Comment] = []
+        if not os.path.isdir(directory):
+            return results
+        for name in self._segment_names(directory):
+            path = os.path.join(directory, name)
+            table, _ = self._open(path)
+            mask = np.ones(len(table), dtype=bool)
+            for column, values in filters.items():
+                if values is not None:
+                    mask &= _matches(table, column, values)
+            if since is not None:
+                mask &= table["timestamp"] >= np.datetime64(since, "us")
+            if until is not None:
+                mask &= table["timestamp"] <= np.datetime64(until, "us")
+            if mask.any():
+                results.extend(self._rows(path, np.flatnonzero(mask), embeddings))
+        return results
+
+    def post_ids(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(unquote(name) for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def _partitions(self, post_ids: Optional[Sequence[str]], first: Optional[date], last: Optional[date]) -> List[Tuple[str, date]]:
+        """(directory, day) for every partition of the given posts within [first, last]."""
+        partitions = []
+        for post_id in (post_ids if post_ids is not None else self.post_ids()):
+            post_dir = os.path.join(self.root, quote(post_id, safe=""))
+            if not os.path.isdir(post_dir):
+                continue
+            for name in sorted(os.listdir(post_dir)):
+                try:
+                    day = datetime.strptime(name, _DAY).date()
+                except ValueError:
+                    continue
+                if (first is None or day >= first) and (last is None or day <= last):
+                    partitions.append((os.path.join(post_dir, name), day))
+        return partitions
+
+    def _segment_names(self, directory: str) -> List[str]:
+        """Complete segments (those whose metadata file exists) not replaced by a complete merge, oldest first."""
+        files = os.listdir(directory)
+        complete = {name[:-4] for name in files if name.endswith(".npz")}
+        replaced = set()
+        for name in files:
+            if name.endswith(_REPLACES) and name[:-len(_REPLACES)] in complete:
+                replaced.update(_read_replaces(os.path.join(directory, name)))
+        return sorted(complete - replaced)
+
+    def _open(self, base: str) -> Tuple[SnapshotTable, Optional[np.ndarray]]:
+        """The segment's table and embedding mmap; FileNotFoundError if a merge has deleted it."""
+        with self._cache_lock:
+            segment = self._segments.get(base)
+            if segment is not None:
+                self._segments.move_to_end(base)
+                return segment
+        # Loaded outside the cache lock; two threads may both load a segment, which is harmless
+        with np.load(base + ".npz", allow_pickle=False) as data:
+            table = SnapshotTable({k: data[k] for k in data.files})
+        # Segments with embeddings always have their .npy, so a missing one means it was deleted meanwhile
+        matrix = np.load(base + ".npy", mmap_mode="r") if table.arrays["has_embedding"].any() else None
+        segment = (table, matrix)
+        with self._cache_lock:
+            self._segments[base] = segment
+            while len(self._segments) > max(1, SEGMENT_CACHE):
+                self._segments.popitem(last=False)
+        return segment
+
+    def _rows(self, base: str, rows: Optional[np.ndarray], embeddings: bool) -> List[Comment]:
+        """Comments for the given rows of one segment (all rows if None), decoding only those rows."""
+        table, matrix = self._open(base)
+        rows = np.arange(len(table)) if rows is None else rows
+        columns: Dict[str, list] = {}
+        for column, encoding in table.columns.items():
+            if encoding == "vector":
+                continue
+            if encoding == "str":
+                dictionary = table.dictionary(column)
+                columns[column] = [dictionary[c] if c >= 0 else None for c in table.codes(column)[rows].tolist()]
+            elif encoding == "list":
+                values = table.lists(column)
+                columns[column] = [values[i] for i in rows.tolist()]
+            elif encoding == "datetime":
+                columns[column] = table[column][rows].astype(datetime).tolist()
+            elif encoding == "float":
+                columns[column] = [None if np.isnan(v) else v for v in table[column][rows].tolist()]
+            else:
+                columns[column] = table[column][rows].tolist()
+        present = table.arrays["has_embedding"][rows]
+        vectors = np.asarray(matrix[rows]).tolist() if embeddings and matrix is not None else None
+        return [
+            Comment(
+                **{column: values[n] for column, values in columns.items()},
+                embedding=vectors[n] if vectors is not None and present[n] else None,
+            )
+            for n in range(len(rows))
+        ]
+
+    def _storage_lock(self) -> StorageLock:
+        if self._lock is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._lock = StorageLock(os.path.join(self.root, ".lock"))
+        return self._lock
+
+def _segment_name() -> str:
+    # Sorts by creation time, so listings come out oldest first
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+
+def _read_replaces(path: str) -> List[str]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _matches(table: SnapshotTable, column: str, values: Sequence) -> np.ndarray:
+    wanted = {getattr(v, "value", v) for v in values}
+    codes = [code for code, value in enumerate(table.dictionary(column)) if value in wanted]
+    return np.isin(table.codes(column), codes)
+
+def _to_bytes(save, *args, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    save(buffer, *args, **kwargs)
+    return buffer.getvalue()
@@ -0,0 +1,296 @@
+"""
+Compact, append-only storage for contradictions.
+
+Rows live in typed arrays (struct-of-arrays) instead of one Pydantic object each: ids and
+rationales are interned in string pools, link strength is a small enum code and timestamps are
+int64 microseconds. Every row gets a stable sequence number so assumptions can reference it
+(see signal_ref) instead of copying the rationale into invalidation_signals.
+InsightContradiction models are only built when a caller iterates or indexes the table.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from ..core.schemas import InsightContradiction, LinkStrength
+
+# invalidation_signals entries of this form point at a contradiction row instead of holding its text
+SIGNAL_REF_PREFIX = "ref:contradiction:"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_LINK_STRENGTHS = list(LinkStrength)
+_LINK_CODES = {s: i for i, s in enumerate(_LINK_STRENGTHS)}
+
+_DTYPES = {"q": np.int64, "i": np.int32, "d": np.float64, "b": np.int8}
+
+def signal_ref(seq: int) -> str:
+    return f"{SIGNAL_REF_PREFIX}{seq}"
+
+def parse_signal_ref(signal: str) -> Optional[int]:
+    """Returns the referenced sequence number, or None for a free-text signal."""
+    if signal.startswith(SIGNAL_REF_PREFIX):
+        try:
+            return int(signal[len(SIGNAL_REF_PREFIX):])
+        except ValueError:
+            return None
+    return None
+
+def format_signal(recorded_at: datetime, link_strength: Optional[str], rationale: str) -> str:
+    """Invalidation signal text, as written by MemoryManager.process_contradictions."""
+    rating = f"({link_strength})" if link_strength else ""
+    return f"[{recorded_at.strftime('%Y-%m-%d %H:%M')}] Contradiction {rating}: {rationale}"
+
+class StringPool:
+    """Interns strings to dense int codes so repeated ids/rationales are stored once."""
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+class ContradictionTable:
+    """
+    Struct-of-arrays contradiction log. Behaves like a read-mostly list of InsightContradiction
+    (len, iteration, indexing, extend) while holding roughly 50 bytes per row plus pooled strings.
+    """
+    def __init__(self, contradictions: Iterable[InsightContradiction] = ()):
+        self.ids = StringPool()          # insight_id and source_id share one pool
+        self.rationales = StringPool()
+        self._seq = array("q")
+        self._insight = array("i")
+        self._source = array("i")
+        self._rationale = array("i")
+        self._delta = array("d")
+        self._score = array("d")         # NaN = no semantic score
+        self._link = array("b")          # -1 = no link strength
+        self._multiplicity = array("i")  # near-duplicate signals collapsed into the row
+        self._timestamp = array("q")
+        self._recorded_at = array("q")   # when memory processed the row (drives signal text)
+        self.next_seq = 0
+        self.extend(contradictions)
+
+    # --- Write path ---
+
+    def append(self, contradiction: InsightContradiction, recorded_at: Optional[datetime] = None, seq: Optional[int] = None) -> int:
+        """Adds one row and returns its sequence number."""
+        timestamp = _to_micros(contradiction.timestamp)
+        return self._append_row(
+            seq,
+            contradiction.insight_id,
+            contradiction.source_id,
+            contradiction.rationale,
+            contradiction.confidence_delta,
+            contradiction.semantic_score,
+            -1 if contradiction.link_strength is None else _LINK_CODES[contradiction.link_strength],
+            timestamp,
+            _to_micros(recorded_at) if recorded_at else timestamp,
+            contradiction.multiplicity,
+        )
+
+    def _append_row(self, seq, insight_id, source_id, rationale, delta, score, link, timestamp, recorded_at, multiplicity=1) -> int:
+        if seq is None:
+            seq = self.next_seq
+        elif self._seq and seq <= self._seq[-1]:
+            raise ValueError(f"Sequence numbers must increase (got {seq} after {self._seq[-1]})")
+        self.next_seq = seq + 1
+        self._seq.append(seq)
+        self._insight.append(self.ids.intern(insight_id))
+        self._source.append(self.ids.intern(source_id))
+        self._rationale.append(self.rationales.intern(rationale))
+        self._delta.append(delta)
+        self._score.append(math.nan if score is None else score)
+        self._link.append(link)
+        self._timestamp.append(timestamp)
+        self._recorded_at.append(recorded_at)
+        self._multiplicity.append(multiplicity)
+        return seq
+
+    def extend(self, contradictions: Iterable[InsightContradiction], recorded_at: Optional[datetime] = None) -> List[int]:
+        return [self.append(c, recorded_at) for c in contradictions]
+
+    # --- Read path (materializes models) ---
+
+    def __len__(self) -> int:
+        return len(self._seq)
+
+    def __iter__(self) -> Iterator[InsightContradiction]:
+        for i in range(len(self._seq)):
+            yield self._row(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self._seq)))]
+        if index < 0:
+            index += len(self._seq)
+        if not 0 <= index < len(self._seq):
+            raise IndexError("contradiction index out of range")
+        return self._row(index)
+
+    def position(self, seq: int) -> Optional[int]:
+        i = bisect_left(self._seq, seq)
+        return i if i < len(self._seq) and self._seq[i] == seq else None
+
+    def get(self, seq: int) -> Optional[InsightContradiction]:
+        i = self.position(seq)
+        return None if i is None else self._row(i)
+
+    def for_insight(self, insight_id: str) -> List[InsightContradiction]:
+        """All rows for one insight/assumption, filtered on the code column without building other rows."""
+        code = self.ids.code(insight_id)
+        if code is None or not self._seq:
+            return []
+        positions = np.flatnonzero(np.frombuffer(self._insight, dtype=np.int32) == code)
+        return [self._row(int(i)) for i in positions]
+
+    def signal_text(self, seq: int) -> Optional[str]:
+        """Human-readable invalidation signal for a row, or None if the row is not in this table."""
+        i = self.position(seq)
+        if i is None:
+            return None
+        code = self._link[i]
+        return format_signal(
+            _from_micros(self._recorded_at[i]),
+            _LINK_STRENGTHS[code].value if code >= 0 else None,
+            self.rationales.values[self._rationale[i]],
+        )
+
+    def _row(self, i: int) -> InsightContradiction:
+        score = self._score[i]
+        code = self._link[i]
+        # Values were validated on the way in, so skip re-validation
+        return InsightContradiction.model_construct(
+            insight_id=self.ids.values[self._insight[i]],
+            source_id=self.ids.values[self._source[i]],
+            rationale=self.rationales.values[self._rationale[i]],
+            confidence_delta=self._delta[i],
+            timestamp=_from_micros(self._timestamp[i]),
+            link_strength=_LINK_STRENGTHS[code] if code >= 0 else None,
+            semantic_score=None if math.isnan(score) else score,
+            multiplicity=self._multiplicity[i],
+        )
+
+    # --- Persistence ---
+
+    def to_records(self, positions: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """JSON-ready rows: the InsightContradiction fields plus seq and recorded_at."""
+        ids, rationales = self.ids.values, self.rationales.values
+        records = []
+        for i in (range(len(self._seq)) if positions is None else positions):
+            score = self._score[i]
+            code = self._link[i]
+            records.append({
+                "insight_id": ids[self._insight[i]],
+                "source_id": ids[self._source[i]],
+                "rationale": rationales[self._rationale[i]],
+                "confidence_delta": self._delta[i],
+                "timestamp": _from_micros(self._timestamp[i]).isoformat(),
+                "link_strength": _LINK_STRENGTHS[code].value if code >= 0 else None,
+                "semantic_score": None if math.isnan(score) else score,
+                "multiplicity": self._multiplicity[i],
+                "seq": self._seq[i],
+                "recorded_at": _from_micros(self._recorded_at[i]).isoformat(),
+            })
+        return records
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], trusted: bool = False) -> "ContradictionTable":
+        """
+        Inverse of to_records(). Also accepts legacy rows without seq/recorded_at/multiplicity.
+        trusted=True skips model validation and reads the columns straight from rows this class wrote.
+        """
+        table = cls()
+        if trusted:
+            link_codes = {s.value: i for s, i in _LINK_CODES.items()}
+            for r in records:
+                timestamp = _to_micros(datetime.fromisoformat(r["timestamp"]))
+                recorded_at = r.get("recorded_at")
+                table._append_row(
+                    r.get("seq"), r["insight_id"], r["source_id"], r["rationale"], r["confidence_delta"], r.get("semantic_score"),
+                    link_codes[r["link_strength"]] if r.get("link_strength") else -1,
+                    timestamp, _to_micros(datetime.fromisoformat(recorded_at)) if recorded_at else timestamp,
+                    r.get("multiplicity", 1),
+                )
+            return table
+        for record in records:
+            recorded_at = record.get("recorded_at")
+            table.append(
+                InsightContradiction(**record),
+                recorded_at=datetime.fromisoformat(recorded_at) if recorded_at else None,
+                seq=record.get("seq"),
+            )
+        return table
+
+    # --- Tiering ---
+
+    def split_cold(self, cutoff: datetime, max_hot: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Removes rows older than cutoff (and the oldest rows beyond max_hot) and returns them as records.
+        Sequence numbers are preserved, so references to the removed rows stay resolvable from the archive.
+        """
+        if not self._seq:
+            return []
+        cold = np.frombuffer(self._timestamp, dtype=np.int64) < _to_micros(cutoff)
+        if max_hot is not None:
+            hot_positions = np.flatnonzero(~cold)
+            if len(hot_positions) > max_hot:
+                cold[hot_positions[:len(hot_positions) - max_hot]] = True
+        if not cold.any():
+            return []
+        records = self.to_records(int(i) for i in np.flatnonzero(cold))
+        self._keep(~cold)
+        return records
+
+    def discard(self, seqs: Set[int]):
+        """Removes the rows with the given sequence numbers."""
+        if seqs and self._seq:
+            self._keep(~np.isin(np.frombuffer(self._seq, dtype=np.int64), list(seqs)))
+
+    def _keep(self, mask: np.ndarray):
+        """Drops rows where mask is False and compacts the string pools to the surviving values."""
+        def take(column: array) -> np.ndarray:
+            return np.frombuffer(column, dtype=_DTYPES[column.typecode])[mask]
+
+        for name in ("_seq", "_delta", "_score", "_link", "_timestamp", "_recorded_at", "_multiplicity"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, take(column).tobytes()))
+
+        insight, source = take(self._insight), take(self._source)
+        self.ids, (insight, source) = _compact(self.ids, insight, source)
+        self._insight, self._source = array("i", insight.tobytes()), array("i", source.tobytes())
+        self.rationales, (rationale,) = _compact(self.rationales, take(self._rationale))
+        self._rationale = array("i", rationale.tobytes())
+
+def _compact(pool: StringPool, *code_columns: np.ndarray):
+    """Rebuilds a pool with only the values still referenced and remaps the code columns."""
+    used = np.unique(np.concatenate(code_columns))
+    remap = np.full(len(pool), -1, dtype=np.int32)
+    remap[used] = np.arange(len(used), dtype=np.int32)
+    compacted = StringPool()
+    for code in used.tolist():
+        compacted.intern(pool.values[code])
+    return compacted, tuple(remap[c] for c in code_columns)
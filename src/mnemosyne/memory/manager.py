@@ -1,116 +1,383 @@
 import json
 import os
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import pydantic_core
+from pydantic import TypeAdapter
+from ..core.metrics import metrics, timed
+from ..core.log import get_logger
 from ..core.schemas import (
     Organization, Narrative, ReasoningLoop, Insight, InsightContradiction, StrategyChange, Assumption, RiskLevel,
-    Override
+    Override, Watermark
 )
+from .contradiction_table import ContradictionTable, signal_ref, parse_signal_ref, format_signal
+from .archive import ArchiveStore, RetentionPolicy
+from .comment_store import CommentStore
+from .checkpoints import CheckpointStore
+from .storage import StorageLock, atomic_write, file_stamp
 
 MAX_CONFIDENCE_DROP_PER_CYCLE = 0.20
 
+# Persisted collections (one <name>.json each) and their record models
+COLLECTIONS = {
+    "organizations": Organization,
+    "narratives": Narrative,
+    "loops": ReasoningLoop,
+    "insights": Insight,
+    "contradictions": InsightContradiction,
+    "assumptions": Assumption,
+    "strategy_changes": StrategyChange,
+    "overrides": Override,
+    "watermarks": Watermark,
+}
+
+# Whole-collection codecs: one Rust-side encode/validate per file instead of one call per record
+_ADAPTERS = {
+    name: TypeAdapter(List[model] if name in ("strategy_changes", "overrides") else Dict[str, model])
+    for name, model in COLLECTIONS.items() if name != "contradictions"
+}
+
+# Collections that can be rolled into archive segments (see memory/archive.py)
+ARCHIVED_COLLECTIONS = ("contradictions", "loops", "strategy_changes")
+
+VERSIONS_FILE = "versions.json"
+LOCK_FILE = ".memory.lock"
+
+logger = get_logger(__name__)
+
 class MemoryManager:
     """
     V0 Memory Manager with simple JSON persistence and Strategic Rationale support.
+
+    Several processes may share one storage_dir: mutations run under a cross-process lock,
+    refresh the collections they touch from disk first, and write only those collections back
+    (atomic rename). versions.json stamps each collection, so readers reload only what another
+    process changed (polled at most every poll_interval seconds).
     """
-    def __init__(self, storage_dir: str = "storage"):
+    def __init__(
+        self,
+        storage_dir: str = "storage",
+        retention: Optional[RetentionPolicy] = None,
+        poll_interval: float = 1.0,
+        compact_json: Optional[bool] = None,
+        trust_storage: Optional[bool] = None,
+    ):
         self.storage_dir = storage_dir
+        # compact_json drops indentation from saved files; trust_storage skips per-row validation of
+        # contradictions on load (only for files this code wrote). Env: MNEMOSYNE_MEMORY_COMPACT / _TRUSTED.
+        self.compact_json = os.environ.get("MNEMOSYNE_MEMORY_COMPACT") == "1" if compact_json is None else compact_json
+        self.trust_storage = os.environ.get("MNEMOSYNE_MEMORY_TRUSTED") == "1" if trust_storage is None else trust_storage
+        # No policy (and no MNEMOSYNE_HOT_DAYS) keeps every record hot, as before
+        self.retention = retention or RetentionPolicy.from_env()
+        self.archive = ArchiveStore(os.path.join(storage_dir, "archive"))
+        # Ingested comments with embeddings, partitioned by post/day (written by ObserveAgent)
+        self.comment_store = CommentStore(os.path.join(storage_dir, "comments"))
+        # Per-stage loop checkpoints for LoopOrchestrator(checkpoints=...)
+        self.checkpoints = CheckpointStore(os.path.join(storage_dir, "checkpoints"))
+        self.poll_interval = poll_interval
+        self._next_retention_check = 0.0
+        self._next_poll = 0.0
         self.organizations: Dict[str, Organization] = {}
         self.narratives: Dict[str, Narrative] = {}
         self.loops: Dict[str, ReasoningLoop] = {}
         self.insights: Dict[str, Insight] = {}
         self.assumptions: Dict[str, Assumption] = {}
-        self.contradictions: List[InsightContradiction] = []
+        self._contradictions = ContradictionTable()
         self.strategy_changes: List[StrategyChange] = []
         self.overrides: List[Override] = []
+        self.watermarks: Dict[str, Watermark] = {}
+
+        # Collection versions as loaded by this instance vs. last seen in versions.json
+        self._versions: Dict[str, int] = {}
+        self._disk_versions: Dict[str, int] = {}
+        self._versions_stamp = None
         
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
+        self._lock = StorageLock(os.path.join(self.storage_dir, LOCK_FILE))
         self._load()
+        with self._lock:
+            self._recover_pending_archive()
+
+    @property
+    def contradictions(self) -> ContradictionTable:
+        """Compact contradiction log; iterating or indexing it yields InsightContradiction models."""
+        return self._contradictions
+
+    @contradictions.setter
+    def contradictions(self, value):
+        self._contradictions = value if isinstance(value, ContradictionTable) else ContradictionTable(value)
 
     def _get_path(self, name: str) -> str:
         return os.path.join(self.storage_dir, f"{name}.json")
 
-    def _save(self):
-        with open(self._get_path("organizations"), "w") as f:
-            json.dump({k: v.model_dump(mode='json') for k, v in self.organizations.items()}, f, indent=2)
-        with open(self._get_path("narratives"), "w") as f:
-            json.dump({k: v.model_dump(mode='json') for k, v in self.narratives.items()}, f, indent=2)
-        with open(self._get_path("loops"), "w") as f:
-            json.dump({k: v.model_dump(mode='json') for k, v in self.loops.items()}, f, indent=2)
-        with open(self._get_path("insights"), "w") as f:
-            json.dump({k: v.model_dump(mode='json') for k, v in self.insights.items()}, f, indent=2)
-        with open(self._get_path("contradictions"), "w") as f:
-            json.dump([v.model_dump(mode='json') for v in self.contradictions], f, indent=2)
-        with open(self._get_path("assumptions"), "w") as f:
-            json.dump({k: v.model_dump(mode='json') for k, v in self.assumptions.items()}, f, indent=2)
-        with open(self._get_path("strategy_changes"), "w") as f:
-            json.dump([v.model_dump(mode='json') for v in self.strategy_changes], f, indent=2)
-        with open(self._get_path("overrides"), "w") as f:
-            json.dump([v.model_dump(mode='json') for v in self.overrides], f, indent=2)
-
-    def _load(self):
+    # --- Persistence ---
+
+    @contextmanager
+    def _transaction(self, *collections: str):
+        """
+        Cross-process read-modify-write: takes the storage lock, reloads any of `collections`
+        another process has saved since we read them, runs the mutation, then saves just those.
+        """
+        with self._lock:
+            self.refresh(collections, force=True)
+            yield
+            self._save(*collections)
+
+    @timed("mnemosyne_memory_save_seconds")
+    def _save(self, *collections: str):
+        """
+        Writes the given collections (all when none are named) and bumps their versions.
+        A full save first reloads collections another process has saved since, so it never writes
+        stale copies over them; in-memory edits should go through _transaction() instead.
+        """
+        names = set(collections or COLLECTIONS)
+        with self._lock:
+            if not collections:
+                self.refresh(force=True)
+            if self.retention and time.monotonic() >= self._next_retention_check:
+                self.refresh(ARCHIVED_COLLECTIONS, force=True)
+                names.update(self._roll_cold())
+            self._read_versions()
+            for name in COLLECTIONS:
+                if name in names:
+                    atomic_write(self._get_path(name), self._serialize(name))
+                    self._disk_versions[name] = self._disk_versions.get(name, 0) + 1
+                    self._versions[name] = self._disk_versions[name]
+            versions_path = os.path.join(self.storage_dir, VERSIONS_FILE)
+            atomic_write(versions_path, json.dumps(self._disk_versions, indent=2).encode("utf-8"))
+            self._versions_stamp = file_stamp(versions_path)
+            # Hot files no longer hold the newly archived records, so their segments become authoritative
+            for collection in ARCHIVED_COLLECTIONS:
+                self.archive.commit(collection)
+
+    @timed("mnemosyne_memory_load_seconds")
+    def _load(self, *collections: str):
+        """Reads the given collections (all when none are named) from disk."""
+        self._read_versions()
+        for name in collections or COLLECTIONS:
+            path = self._get_path(name)
+            # Record the version before reading: a concurrent save can only make the file newer
+            version = self._disk_versions.get(name, 0)
+            try:
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        self._deserialize(name, f.read())
+                self._versions[name] = version
+            except Exception as e:
+                logger.warning("Could not load memory: %s", e, extra={"storage_dir": self.storage_dir, "collection": name})
+
+    def refresh(self, collections: Optional[Iterable[str]] = None, force: bool = False) -> List[str]:
+        """
+        Reloads collections that another process saved since this instance read them and returns
+        their names. Without force, checks versions.json at most every poll_interval seconds.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return []
+        self._next_poll = now + self.poll_interval
+        collections = list(collections or COLLECTIONS)
+        self._read_versions()
+        if not self._stale(collections):
+            return []
+        # Swap collections in under the storage lock, so a reload never interleaves with a transaction
+        with self._lock:
+            self._read_versions()
+            stale = self._stale(collections)
+            if stale:
+                self._load(*stale)
+        return stale
+
+    def _stale(self, collections: Iterable[str]) -> List[str]:
+        return [n for n in collections if self._disk_versions.get(n, 0) != self._versions.get(n, 0)]
+
+    def _read_versions(self):
+        """Re-reads versions.json only when its stamp changed (a stat call otherwise)."""
+        path = os.path.join(self.storage_dir, VERSIONS_FILE)
+        stamp = file_stamp(path)
+        if stamp is None or stamp == self._versions_stamp:
+            return
         try:
-            if os.path.exists(self._get_path("organizations")):
-                with open(self._get_path("organizations"), "r") as f:
-                    data = json.load(f)
-                    self.organizations = {k: Organization(**v) for k, v in data.items()}
-            if os.path.exists(self._get_path("narratives")):
-                with open(self._get_path("narratives"), "r") as f:
-                    data = json.load(f)
-                    self.narratives = {k: Narrative(**v) for k, v in data.items()}
-            if os.path.exists(self._get_path("loops")):
-                with open(self._get_path("loops"), "r") as f:
-                    data = json.load(f)
-                    self.loops = {k: ReasoningLoop(**v) for k, v in data.items()}
-            if os.path.exists(self._get_path("insights")):
-                with open(self._get_path("insights"), "r") as f:
-                    data = json.load(f)
-                    self.insights = {k: Insight(**v) for k, v in data.items()}
-            if os.path.exists(self._get_path("contradictions")):
-                with open(self._get_path("contradictions"), "r") as f:
-                    data = json.load(f)
-                    self.contradictions = [InsightContradiction(**v) for v in data]
-            if os.path.exists(self._get_path("assumptions")):
-                with open(self._get_path("assumptions"), "r") as f:
-                    data = json.load(f)
-                    self.assumptions = {k: Assumption(**v) for k, v in data.items()}
-            if os.path.exists(self._get_path("strategy_changes")):
-                with open(self._get_path("strategy_changes"), "r") as f:
-                    data = json.load(f)
-                    self.strategy_changes = [StrategyChange(**v) for v in data]
-            if os.path.exists(self._get_path("overrides")):
-                with open(self._get_path("overrides"), "r") as f:
-                    data = json.load(f)
-                    self.overrides = [Override(**v) for v in data]
-        except Exception as e:
-            print(f"Warning: Could not load memory: {e}")
+            with open(path, "r") as f:
+                self._disk_versions = json.load(f)
+            self._versions_stamp = stamp
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read memory versions: %s", e, extra={"storage_dir": self.storage_dir})
+
+    def _serialize(self, name: str) -> bytes:
+        indent = None if self.compact_json else 2
+        if name == "contradictions":
+            return pydantic_core.to_json(self._contradictions.to_records(), indent=indent)
+        return _ADAPTERS[name].dump_json(getattr(self, name), indent=indent)
+
+    def _deserialize(self, name: str, raw: bytes):
+        if name == "contradictions":
+            table = ContradictionTable.from_records(pydantic_core.from_json(raw), trusted=self.trust_storage)
+            # Never reuse sequence numbers of archived rows, even if none of them are hot any more
+            archived_seq = max((e.get("max_seq", -1) for e in self.archive.manifest("contradictions")), default=-1)
+            table.next_seq = max(table.next_seq, archived_seq + 1)
+            self._contradictions = table
+            return
+        # Nested models, enums and datetimes need conversion, so these always go through
+        # (Rust-side) validation rather than model_construct
+        setattr(self, name, _ADAPTERS[name].validate_json(raw))
+
+    def export_snapshot(self, out_dir: Optional[str] = None, compress: bool = False) -> Dict[str, str]:
+        """
+        Writes contradictions, assumptions and strategy changes as columnar .npz files for analytics
+        (see memory/snapshot.py). Defaults to <storage_dir>/snapshots/<UTC timestamp>/.
+        Returns collection name -> written path.
+        """
+        from .snapshot import export_collections
+
+        if out_dir is None:
+            out_dir = os.path.join(self.storage_dir, "snapshots", datetime.utcnow().strftime("%Y%m%dT%H%M%S"))
+        collections = {
+            "contradictions": self.iter_contradictions(),
+            "assumptions": [self.materialize_assumption(a) for a in self.assumptions.values()],
+            "strategy_changes": self.iter_strategy_changes(),
+        }
+        paths = export_collections(collections, out_dir, compress=compress)
+        logger.info("Exported memory snapshot to %s", out_dir, extra={"contradictions": len(self.contradictions)})
+        return paths
+
+    # --- Tiered history ---
+
+    def archive_cold(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Moves records outside the retention window into archive segments now. Returns counts per collection."""
+        with self._lock:
+            self.refresh(ARCHIVED_COLLECTIONS, force=True)
+            archived = self._roll_cold(now)
+            self._save(*archived)
+        return archived
+
+    def _roll_cold(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        policy = self.retention or RetentionPolicy()
+        self._next_retention_check = time.monotonic() + policy.check_interval
+        cutoff = policy.cutoff(now)
+        archived = {}
+
+        records = self._contradictions.split_cold(cutoff, policy.max_hot_records)
+        if records:
+            self.archive.write_segment(
+                "contradictions", records,
+                timestamps=[datetime.fromisoformat(r["timestamp"]) for r in records],
+                seqs=[r["seq"] for r in records],
+            )
+            archived["contradictions"] = len(records)
+
+        cold_changes = [c for c in self.strategy_changes if c.timestamp < cutoff]
+        if cold_changes:
+            self.archive.write_segment(
+                "strategy_changes", [c.model_dump(mode='json') for c in cold_changes],
+                timestamps=[c.timestamp for c in cold_changes],
+                keys=[c.id for c in cold_changes],
+            )
+            cold_ids = {c.id for c in cold_changes}
+            self.strategy_changes = [c for c in self.strategy_changes if c.id not in cold_ids]
+            archived["strategy_changes"] = len(cold_changes)
+
+        # Loops age by their latest step; loops without steps stay hot
+        cold_loops = [l for l in self.loops.values() if l.steps and max(s.timestamp for s in l.steps) < cutoff]
+        if cold_loops:
+            self.archive.write_segment(
+                "loops", [l.model_dump(mode='json') for l in cold_loops],
+                timestamps=[max(s.timestamp for s in l.steps) for l in cold_loops],
+                keys=[l.id for l in cold_loops],
+            )
+            for loop in cold_loops:
+                del self.loops[loop.id]
+            archived["loops"] = len(cold_loops)
+
+        if archived:
+            logger.info("Archived cold memory records", extra={"archived": archived, "cutoff": cutoff.isoformat()})
+        return archived
+
+    def _recover_pending_archive(self):
+        """Drops hot copies of records whose segment was written but whose hot save never completed."""
+        recovered = False
+        for collection in ARCHIVED_COLLECTIONS:
+            for entry in self.archive.pending(collection):
+                records = self.archive.read_segment(collection, entry)
+                if collection == "contradictions":
+                    self._contradictions.discard({r["seq"] for r in records})
+                elif collection == "strategy_changes":
+                    ids = {r["id"] for r in records}
+                    self.strategy_changes = [c for c in self.strategy_changes if c.id not in ids]
+                else:
+                    for record in records:
+                        self.loops.pop(record["id"], None)
+                recovered = True
+        if recovered:
+            self._save(*ARCHIVED_COLLECTIONS)
+
+    def iter_contradictions(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None, insight_id: Optional[str] = None
+    ) -> Iterator[InsightContradiction]:
+        """Contradictions from archive segments and the hot table, filtered by time and insight/assumption."""
+        self.refresh()
+        def wanted(c: InsightContradiction) -> bool:
+            return ((insight_id is None or c.insight_id == insight_id)
+                    and (since is None or c.timestamp >= since)
+                    and (until is None or c.timestamp <= until))
+
+        for record in self.archive.iter_records("contradictions", since, until):
+            if insight_id is None or record["insight_id"] == insight_id:
+                contradiction = InsightContradiction(**record)
+                if wanted(contradiction):
+                    yield contradiction
+        hot = self._contradictions.for_insight(insight_id) if insight_id is not None else self._contradictions
+        for contradiction in hot:
+            if wanted(contradiction):
+                yield contradiction
+
+    def iter_strategy_changes(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[StrategyChange]:
+        self.refresh()
+        for record in self.archive.iter_records("strategy_changes", since, until):
+            change = StrategyChange(**record)
+            if (since is None or change.timestamp >= since) and (until is None or change.timestamp <= until):
+                yield change
+        for change in self.strategy_changes:
+            if (since is None or change.timestamp >= since) and (until is None or change.timestamp <= until):
+                yield change
 
     def add_insight(self, insight: Insight):
-        self.insights[insight.id] = insight
-        self._save()
+        with self._transaction("insights"):
+            self.insights[insight.id] = insight
 
-    def process_contradictions(self, contradictions: List[InsightContradiction]):
+    def process_contradictions(self, contradictions: List[InsightContradiction], watermarks: Sequence[Watermark] = ()):
         """
         V1 Safety Rail: Processes a batch of contradictions with specific safety caps.
         Aggregates confidence drops per assumption and enforces MAX_CONFIDENCE_DROP_PER_CYCLE.
+        Watermarks are saved in the same transaction, so the signals they cover are recorded exactly once.
         """
+        collections = ("contradictions", "assumptions", "insights") + (("watermarks",) if watermarks else ())
+        with self._transaction(*collections):
+            self._apply_contradictions(contradictions)
+            for watermark in watermarks:
+                self.watermarks[watermark.key] = watermark
+
+    def _apply_contradictions(self, contradictions: List[InsightContradiction]):
         # 1. Archive raw contradictions (History Preservation)
-        self.contradictions.extend(contradictions)
+        now = datetime.utcnow()
+        seqs = self._contradictions.extend(contradictions, recorded_at=now)
+        metrics.inc("mnemosyne_contradictions_processed_total", len(contradictions))
         
         # 2. Aggregate Deltas by ID
         active_deltas: Dict[str, float] = {}
-        affected_assumptions: Dict[str, List[InsightContradiction]] = {}
+        affected_assumptions: Dict[str, List[int]] = {}
         
-        for c in contradictions:
+        for c, seq in zip(contradictions, seqs):
             if c.insight_id not in active_deltas:
                 active_deltas[c.insight_id] = 0.0
                 affected_assumptions[c.insight_id] = []
             active_deltas[c.insight_id] += c.confidence_delta
-            affected_assumptions[c.insight_id].append(c)
+            affected_assumptions[c.insight_id].append(seq)
             
         # 3. Apply Updates with Safety Rail
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M")
+        timestamp = now.strftime("%Y-%m-%d %H:%M")
         
         for a_id, total_delta in active_deltas.items():
             if a_id in self.assumptions:
@@ -119,22 +386,22 @@ class MemoryManager:
                 # Apply Safety Cap
                 final_delta = total_delta
                 if final_delta > MAX_CONFIDENCE_DROP_PER_CYCLE:
-                    print(f"\n[SAFETY RAIL ACTIVATED]")
-                    print(f"Assumption: {a_id}")
-                    print(f"Calculated Delta: -{total_delta:.2f}")
-                    print(f"Capped Delta: -{MAX_CONFIDENCE_DROP_PER_CYCLE:.2f}")
-                    print(f"Reason: Single-cycle confidence drop exceeded allowed maximum")
+                    metrics.inc("mnemosyne_safety_rail_activations_total")
+                    logger.warning(
+                        "[SAFETY RAIL ACTIVATED] Assumption %s: calculated delta -%.2f capped at -%.2f "
+                        "(single-cycle confidence drop exceeded allowed maximum)",
+                        a_id, total_delta, MAX_CONFIDENCE_DROP_PER_CYCLE,
+                        extra={"assumption_id": a_id, "calculated_delta": total_delta, "capped_delta": MAX_CONFIDENCE_DROP_PER_CYCLE}
+                    )
                     final_delta = MAX_CONFIDENCE_DROP_PER_CYCLE
                 
                 # Apply update
                 assumption.current_confidence = max(0.0, assumption.current_confidence - final_delta)
                 assumption.last_validated_at = datetime.utcnow()
                 
-                # Record Invalidating Signals (logging the cap in the signal history too)
-                for c in affected_assumptions[a_id]:
-                    rating = f"({c.link_strength.value})" if c.link_strength else ""
-                    signal_text = f"[{timestamp}] Contradiction {rating}: {c.rationale}"
-                    assumption.invalidation_signals.append(signal_text)
+                # Record Invalidating Signals (logging the cap in the signal history too).
+                # Contradictions are referenced by sequence number; resolve_signals() renders the text.
+                assumption.invalidation_signals.extend(signal_ref(seq) for seq in affected_assumptions[a_id])
 
                 if final_delta != total_delta:
                     assumption.invalidation_signals.append(f"[{timestamp}] SAFETY RAIL: Confidence drop capped at {MAX_CONFIDENCE_DROP_PER_CYCLE} (Calculated: {total_delta}).")
@@ -144,34 +411,43 @@ class MemoryManager:
                 insight = self.insights[a_id]
                 insight.confidence = max(0.0, insight.confidence - total_delta)
                 insight.last_updated = datetime.utcnow()
-        
-        self._save()
+
+    def get_watermark(self, key: str) -> Optional[Watermark]:
+        self.refresh()
+        watermark = self.watermarks.get(key)
+        return watermark.model_copy(deep=True) if watermark else None
+
+    def save_watermark(self, watermark: Watermark):
+        with self._transaction("watermarks"):
+            self.watermarks[watermark.key] = watermark
 
     def record_contradiction(self, contradiction: InsightContradiction):
         # Legacy Wrapper: Forward to batch processor
         self.process_contradictions([contradiction])
 
     def add_strategy_change(self, change: StrategyChange):
-        self.strategy_changes.append(change)
-        self._save()
+        with self._transaction("strategy_changes"):
+            self.strategy_changes.append(change)
 
     def get_strategy_changes(self, insight_id: str = None) -> List[StrategyChange]:
-        changes = sorted(self.strategy_changes, key=lambda x: x.timestamp)
+        self.refresh()
+        changes = sorted(self.iter_strategy_changes(), key=lambda x: x.timestamp)
         if insight_id:
             changes = [c for c in changes if c.insight_id == insight_id]
         return changes
 
     def add_override(self, override: Override):
         """V3 Governance: Explicitly logs a human override."""
-        # Deactivate any previous overrides for this target
-        for o in self.overrides:
-            if o.target_id == override.target_id and o.active:
-                o.active = False
-        self.overrides.append(override)
-        self._save()
+        with self._transaction("overrides"):
+            # Deactivate any previous overrides for this target
+            for o in self.overrides:
+                if o.target_id == override.target_id and o.active:
+                    o.active = False
+            self.overrides.append(override)
 
     def get_active_override(self, target_id: str) -> Optional[Override]:
         """Returns the active override for a target, if any."""
+        self.refresh()
         for o in reversed(self.overrides):
             if o.target_id == target_id and o.active:
                 return o
@@ -179,17 +455,48 @@ class MemoryManager:
 
     def get_override_debt(self) -> List[Override]:
         """Returns all currently active overrides (Debt)."""
+        self.refresh()
         return [o for o in self.overrides if o.active]
 
     def add_assumption(self, assumption: Assumption):
-        self.assumptions[assumption.id] = assumption
-        self._save()
+        with self._transaction("assumptions"):
+            self.assumptions[assumption.id] = assumption
 
     def get_assumptions(self) -> List[Assumption]:
-        return list(self.assumptions.values())
+        """Detached copies with invalidation signals rendered as text, like get_assumption()."""
+        self.refresh()
+        return [self.materialize_assumption(a) for a in self.assumptions.values()]
+
+    def get_assumption(self, assumption_id: str) -> Optional[Assumption]:
+        """Returns a detached copy with invalidation signals rendered as text (for APIs and reports)."""
+        self.refresh()
+        assumption = self.assumptions.get(assumption_id)
+        return self.materialize_assumption(assumption) if assumption else None
+
+    def resolve_signals(self, assumption: Assumption) -> List[str]:
+        """Invalidation signals as text, expanding contradiction references from the contradiction log."""
+        resolved = []
+        for signal in assumption.invalidation_signals:
+            seq = parse_signal_ref(signal)
+            text = None
+            if seq is not None:
+                text = self._contradictions.signal_text(seq)
+                if text is None:
+                    record = self.archive.find_seq("contradictions", seq)
+                    if record:
+                        text = format_signal(datetime.fromisoformat(record["recorded_at"]), record["link_strength"], record["rationale"])
+            resolved.append(text if text is not None else signal)
+        return resolved
+
+    def materialize_assumption(self, assumption: Assumption) -> Assumption:
+        return assumption.model_copy(update={"invalidation_signals": self.resolve_signals(assumption)})
 
     def apply_decay(self):
         """Apply time-based confidence decay to all insights and assumptions."""
+        with self._transaction("insights", "assumptions"):
+            self._decay()
+
+    def _decay(self):
         now = datetime.utcnow()
         for insight in self.insights.values():
             days_passed = (now - insight.last_updated).days
@@ -212,29 +519,34 @@ class MemoryManager:
                     assumption.risk_level = RiskLevel.MEDIUM
                 else:
                     assumption.risk_level = RiskLevel.LOW
-                    
-        self._save()
 
     def get_insights(self) -> List[Insight]:
+        self.refresh()
         return list(self.insights.values())
 
     def add_organization(self, org: Organization):
-        self.organizations[org.id] = org
-        self._save()
+        with self._transaction("organizations"):
+            self.organizations[org.id] = org
 
     def add_narrative(self, narrative: Narrative):
-        self.narratives[narrative.id] = narrative
-        self._save()
+        with self._transaction("narratives"):
+            self.narratives[narrative.id] = narrative
 
     def get_active_narrative(self, org_id: str) -> Optional[Narrative]:
+        self.refresh()
         for n in self.narratives.values():
             if n.org_id == org_id and n.active:
                 return n
         return None
 
     def store_loop(self, loop: ReasoningLoop):
-        self.loops[loop.id] = loop
-        self._save()
+        with self._transaction("loops"):
+            self.loops[loop.id] = loop
 
     def get_loop(self, loop_id: str) -> Optional[ReasoningLoop]:
-        return self.loops.get(loop_id)
+        self.refresh()
+        loop = self.loops.get(loop_id)
+        if loop is None:
+            record = self.archive.find_key("loops", "id", loop_id)
+            loop = ReasoningLoop(**record) if record else None
+        return loop
@@ -0,0 +1,188 @@
+"""
+Columnar snapshot export of memory collections for analytics.
+
+Each collection is written as one NumPy .npz file (no pickle) with one or more arrays per column:
+- numbers / bools          -> <col>                         (float64 with NaN for None, int64, bool)
+- datetimes                -> <col>                         (datetime64[us], NaT for None)
+- strings / enums          -> <col>.codes (int32, -1 = None) + <col>.dict_data (utf-8 bytes) + <col>.dict_offsets
+- lists of strings         -> <col>.list_offsets (int64) + dictionary-encoded flattened values as above
+- float vectors (embedding)-> <col>.matrix (float32, zero rows where missing) + <col>.present (bool)
+
+Aggregations can run directly on codes, e.g. total delta per assumption:
+    table = load_snapshot(path)["contradictions"]
+    totals = np.bincount(table.codes("insight_id"), weights=table["confidence_delta"])
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+class SnapshotTable:
+    """Read side of one exported collection. String columns are decoded on demand."""
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.meta = json.loads(str(arrays["__meta__"]))
+        self._dictionaries: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        """Column name -> encoding."""
+        return self.meta["columns"]
+
+    def __getitem__(self, column: str) -> Any:
+        encoding = self.columns[column]
+        if encoding in ("float", "int", "bool", "datetime"):
+            return self.arrays[column]
+        if encoding == "str":
+            return self.strings(column)
+        if encoding == "list":
+            return self.lists(column)
+        if encoding == "vector":
+            return self.arrays[f"{column}.matrix"]
+        raise KeyError(column)
+
+    def codes(self, column: str) -> np.ndarray:
+        return self.arrays[f"{column}.codes"]
+
+    def dictionary(self, column: str) -> List[str]:
+        if column not in self._dictionaries:
+            data = self.arrays[f"{column}.dict_data"].tobytes()
+            offsets = self.arrays[f"{column}.dict_offsets"]
+            self._dictionaries[column] = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+        return self._dictionaries[column]
+
+    def strings(self, column: str) -> List[Optional[str]]:
+        dictionary = self.dictionary(column)
+        return [dictionary[c] if c >= 0 else None for c in self.codes(column).tolist()]
+
+    def lists(self, column: str) -> List[List[str]]:
+        values = self.strings(column)
+        offsets = self.arrays[f"{column}.list_offsets"].tolist()
+        return [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+def export_collections(collections: Dict[str, Iterable[Any]], out_dir: str, compress: bool = False) -> Dict[str, str]:
+    """Writes each collection of Pydantic models to <out_dir>/<name>.npz. Returns name -> path."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name, records in collections.items():
+        arrays = _encode_records(list(records))
+        path = os.path.join(out_dir, f"{name}.npz")
+        (np.savez_compressed if compress else np.savez)(path, **arrays)
+        paths[name] = path
+    return paths
+
+def load_snapshot(path: str) -> Dict[str, SnapshotTable]:
+    """Loads every collection in a snapshot directory."""
+    tables = {}
+    for name in sorted(os.listdir(path)):
+        if name.endswith(".npz"):
+            with np.load(os.path.join(path, name), allow_pickle=False) as data:
+                tables[name[:-4]] = SnapshotTable({k: data[k] for k in data.files})
+    return tables
+
+def _encode_records(records: List[Any]) -> Dict[str, np.ndarray]:
+    fields = list(type(records[0]).model_fields) if records else []
+    arrays: Dict[str, np.ndarray] = {}
+    columns: Dict[str, str] = {}
+    for field in fields:
+        values = [getattr(r, field) for r in records]
+        kind = columns[field] = _column_kind(type(records[0]), field, values)
+        if kind == "bool":
+            arrays[field] = np.array([bool(v) for v in values], dtype=bool)
+        elif kind == "int":
+            arrays[field] = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+        elif kind == "float":
+            arrays[field] = np.array([v if v is not None else np.nan for v in values], dtype=np.float64)
+        elif kind == "datetime":
+            arrays[field] = np.array([_naive_utc(v) if v is not None else "NaT" for v in values], dtype="datetime64[us]")
+        elif kind == "vector":
+            arrays.update(_encode_vectors(field, values))
+        elif kind == "list":
+            lengths = [len(v) if v else 0 for v in values]
+            arrays[f"{field}.list_offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+            arrays.update(_encode_strings(field, [str(x) for v in values if v for x in v]))
+        else:
+            arrays.update(_encode_strings(field, [_as_text(v) for v in values]))
+    meta = {"version": SNAPSHOT_VERSION, "rows": len(records), "columns": columns, "exported_at": datetime.utcnow().isoformat()}
+    arrays["__meta__"] = np.array(json.dumps(meta))
+    return arrays
+
+def _column_kind(model: Any, field: str, values: List[Any]) -> str:
+    """Picks an encoding from the first populated value, falling back to the field annotation."""
+    sample = next((v for v in values if v is not None and v != []), None)
+    if sample is None:
+        annotation = str(model.model_fields[field].annotation)
+        if "List[float]" in annotation or "list[float]" in annotation:
+            return "vector"
+        if "List" in annotation or "list" in annotation:
+            return "list"
+        if "float" in annotation:
+            return "float"
+        if "datetime" in annotation:
+            return "datetime"
+        return "str"
+    if isinstance(sample, bool):
+        return "bool"
+    if isinstance(sample, int) and not isinstance(sample, Enum):
+        return "int"
+    if isinstance(sample, float):
+        return "float"
+    if isinstance(sample, datetime):
+        return "datetime"
+    if isinstance(sample, list):
+        return "vector" if isinstance(sample[0], float) else "list"
+    return "str"
+
+def _naive_utc(value: datetime) -> datetime:
+    # Ingested timestamps can be tz-aware ("...Z"); datetime64 has no zone, so store everything as UTC
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.value if isinstance(value, Enum) else str(value)
+
+def _encode_strings(column: str, values: List[Optional[str]]) -> Dict[str, np.ndarray]:
+    lookup: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        codes[i] = -1 if value is None else lookup.setdefault(value, len(lookup))
+    encoded = [s.encode("utf-8") for s in lookup]
+    offsets = np.concatenate(([0], np.cumsum([len(b) for b in encoded], dtype=np.int64))).astype(np.int64)
+    return {
+        f"{column}.codes": codes,
+        f"{column}.dict_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        f"{column}.dict_offsets": offsets,
+    }
+
+def _encode_vectors(column: str, values: List[Optional[List[float]]]) -> Dict[str, np.ndarray]:
+    width = max((len(v) for v in values if v), default=0)
+    matrix = np.zeros((len(values), width), dtype=np.float32)
+    present = np.zeros(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        if v:
+            matrix[i, :len(v)] = v
+            present[i] = True
+    return {f"{column}.matrix": matrix, f"{column}.present": present}
+
+if __name__ == "__main__":
+    # python -m src.mnemosyne.memory.snapshot --storage storage --out storage/snapshots/latest
+    from .manager import MemoryManager
+
+    parser = argparse.ArgumentParser(description="Export memory collections to columnar .npz snapshots")
+    parser.add_argument("--storage", default="storage")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    for name, path in MemoryManager(storage_dir=args.storage).export_snapshot(args.out, compress=args.compress).items():
+        print(f"{name}: {path}")
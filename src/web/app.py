@@ -1,13 +1,24 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm heavy models in background threads so the server accepts requests immediately."""
+    if os.environ.get("MNEMOSYNE_WARM_MODELS", "1") != "0":
+        editor.get_decomposer().warm_up(background=True)
+        SemanticEngine().warm_up(background=True)
+    yield
+
 # Setup
-app = FastAPI(title="Mnemosyne Production Agent")
+app = FastAPI(title="Mnemosyne Production Agent", lifespan=lifespan)
 
 # Mount Static
 app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
@@ -21,9 +32,27 @@ templates = Jinja2Templates(directory="src/web/templates")
 
 # Routers
 from src.web.routers import planning, editor
+from src.mnemosyne.core.semantic import SemanticEngine
+from src.mnemosyne.core.metrics import metrics
 app.include_router(planning.router, prefix="/api/plan")
 app.include_router(editor.router, prefix="/api/editor")
 
+@app.get("/health")
+async def health():
+    """Readiness of lazily loaded models."""
+    return {
+        "status": "ok",
+        "decomposer_ready": editor.get_decomposer().ready,
+        "semantic_engine": SemanticEngine.status(),
+        "semantic_backend": SemanticEngine.backend(),
+        "semantic_model_backend": SemanticEngine.model_backend()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (disable collection with MNEMOSYNE_METRICS=0)."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """Landing: Company Setup"""
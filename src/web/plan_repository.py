@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.mnemosyne.core.log import get_logger
+from src.mnemosyne.memory.storage import StorageLock, atomic_write, file_stamp
+
+logger = get_logger(__name__)
+
+LATEST = "latest"
+
+class PlanRepository:
+    """
+    Concurrent-safe store for generated plans.
+
+    Each plan lives in its own file (plans/<plan_id>.json) written via temp file + rename,
+    with an append-only <plan_id>.history.jsonl of every version. A commit appends and fsyncs
+    the history entry first, then replaces the plan file; if a crash falls in between, loading
+    rolls the plan forward to its last history entry. Reads are served from an in-memory index;
+    writers hold the plan's file lock (<plan_id>.lock, shared by all worker processes; index.json
+    has its own) and swap in a new record (copy-on-write), so readers never observe a
+    half-applied update. A plan is reloaded whenever its history file has changed since it was
+    read (another process wrote a version), before reads and before read-modify-write updates.
+    """
+    def __init__(self, storage_dir: str = "storage/plans", legacy_path: Optional[str] = "storage/prototype_db.json"):
+        self.storage_dir = storage_dir
+        self._plans: Dict[str, Dict[str, Any]] = {}
+        # History file stamp (see storage.file_stamp) each plan was loaded at; size/mtime change on every commit
+        self._stamps: Dict[str, Any] = {}
+        self._latest_id: Optional[str] = None
+        self._index_stamp = None
+
+        os.makedirs(self.storage_dir, exist_ok=True)
+        self._locks: Dict[str, StorageLock] = {}
+        self._locks_guard = threading.Lock()
+        self._index_lock = StorageLock(os.path.join(self.storage_dir, ".index.lock"))
+        self._load()
+        if not self._plans and legacy_path:
+            self._migrate_legacy(legacy_path)
+
+    # --- Reads (in-memory) ---
+
+    def resolve(self, plan_id: str) -> Optional[str]:
+        """Maps the 'latest' alias to a concrete plan id."""
+        if plan_id != LATEST:
+            return plan_id
+        self._refresh_index()
+        return self._latest_id
+
+    def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the current record ({"plan": ..., "assets": ...}) or None."""
+        entry = self._refresh(self.resolve(plan_id))
+        return entry["record"] if entry else None
+
+    def get_version(self, plan_id: str) -> Optional[int]:
+        entry = self._refresh(self.resolve(plan_id))
+        return entry["version"] if entry else None
+
+    def list_ids(self) -> List[str]:
+        self._load()
+        return list(self._plans.keys())
+
+    def history(self, plan_id: str) -> List[Dict[str, Any]]:
+        """All stored versions of a plan, oldest first."""
+        resolved = self.resolve(plan_id)
+        if self._refresh(resolved) is None:
+            return []
+        path = self._history_path(resolved)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Torn by a crash mid-append; the commit that wrote it never reached the plan file
+                    logger.warning("Skipping unreadable history entry for plan %s", resolved)
+        return entries
+
+    # --- Writes ---
+
+    def create(self, record: Dict[str, Any], change: str = "generated") -> str:
+        """Stores a new plan, marks it as latest and returns its id."""
+        plan_id = f"plan_{uuid.uuid4().hex[:12]}"
+        with self._lock_for(plan_id):
+            self._commit(plan_id, record, version=1, change=change)
+        with self._index_lock:
+            self._latest_id = plan_id
+            self._write_index()
+        return plan_id
+
+    def update(self, plan_id: str, mutate: Callable[[Dict[str, Any]], None], change: str) -> Dict[str, Any]:
+        """
+        Applies `mutate` to a copy of the current record under the plan's file lock and persists it.
+        Raises KeyError if the plan does not exist.
+        """
+        resolved = self.resolve(plan_id)
+        if resolved is None:
+            raise KeyError(plan_id)
+        with self._lock_for(resolved):
+            # Another process may have committed a newer version since this one last read the plan
+            entry = self._refresh(resolved)
+            if entry is None:
+                raise KeyError(plan_id)
+            # Deep copy through JSON: records are JSON documents by construction
+            record = json.loads(json.dumps(entry["record"], default=str))
+            mutate(record)
+            self._commit(resolved, record, version=entry["version"] + 1, change=change)
+        return record
+
+    # --- Internals ---
+
+    def _lock_for(self, plan_id: str) -> StorageLock:
+        with self._locks_guard:
+            lock = self._locks.get(plan_id)
+            if lock is None:
+                lock = self._locks[plan_id] = StorageLock(os.path.join(self.storage_dir, f"{plan_id}.lock"))
+            return lock
+
+    def _refresh(self, plan_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The plan's entry, reloaded from disk first if its history file changed since it was read."""
+        if plan_id is None:
+            return None
+        stamp = file_stamp(self._history_path(plan_id))
+        if plan_id not in self._plans or stamp != self._stamps.get(plan_id):
+            self._load_plan(plan_id, stamp)
+        return self._plans.get(plan_id)
+
+    def _refresh_index(self):
+        index_path = os.path.join(self.storage_dir, "index.json")
+        stamp = file_stamp(index_path)
+        if stamp is None or stamp == self._index_stamp:
+            return
+        self._index_stamp = stamp
+        try:
+            with open(index_path, "r") as f:
+                latest = json.load(f).get(LATEST)
+        except Exception as e:
+            logger.warning("Could not load plan index: %s", e)
+            return
+        if latest is not None and self._refresh(latest) is not None:
+            self._latest_id = latest
+
+    def _commit(self, plan_id: str, record: Dict[str, Any], version: int, change: str):
+        entry = {
+            "id": plan_id,
+            "version": version,
+            "updated_at": datetime.utcnow().isoformat(),
+            "change": change,
+            "record": record
+        }
+        payload = json.dumps(entry, default=str)
+        # History first: a version is durable once recorded there, whatever happens to the plan file
+        with open(self._history_path(plan_id), "ab+") as f:
+            # A torn last line (crash mid-append) must not swallow this entry
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(payload.encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        atomic_write(self._plan_path(plan_id), payload.encode("utf-8"))
+        self._plans[plan_id] = entry
+        self._stamps[plan_id] = file_stamp(self._history_path(plan_id))
+
+    def _write_index(self):
+        index_path = os.path.join(self.storage_dir, "index.json")
+        atomic_write(index_path, json.dumps({LATEST: self._latest_id}).encode("utf-8"))
+        self._index_stamp = file_stamp(index_path)
+
+    def _plan_path(self, plan_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{plan_id}.json")
+
+    def _history_path(self, plan_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{plan_id}.history.jsonl")
+
+    def _load(self):
+        """Loads plans that are new or changed on disk, then the 'latest' alias."""
+        for name in os.listdir(self.storage_dir):
+            if name.endswith(".json") and name != "index.json":
+                self._refresh(name[:-len(".json")])
+        self._refresh_index()
+        if self._latest_id not in self._plans:
+            # Fall back to the most recently updated plan
+            self._latest_id = max(self._plans, key=lambda k: self._plans[k]["updated_at"], default=None)
+
+    def _load_plan(self, plan_id: str, stamp):
+        path = self._plan_path(plan_id)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning("Could not load plan %s: %s", plan_id, e)
+            return
+        last = self._last_history_entry(plan_id)
+        if last is not None and last.get("version", 0) > entry.get("version", 0):
+            # Crashed between the history append and the plan file replace
+            logger.warning("Plan %s file is behind its history; using version %s", plan_id, last["version"])
+            entry = last
+        self._plans[plan_id] = entry
+        self._stamps[plan_id] = stamp
+
+    def _last_history_entry(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """The last complete history entry, read from the end of the file."""
+        path = self._history_path(plan_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            tail = b""
+            # Grow the window until it holds a whole line (a complete entry ends with a newline)
+            while end - len(tail) > 0 and tail.count(b"\n") < 2:
+                step = min(64 * 1024, end - len(tail))
+                f.seek(end - len(tail) - step)
+                tail = f.read(step) + tail
+        lines = tail.split(b"\n")
+        # lines[-1] is after the final newline: empty, or a torn entry
+        for line in reversed(lines[:-1]):
+            if line.strip():
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    return None
+        return None
+
+    def _migrate_legacy(self, legacy_path: str):
+        """Imports the single 'latest' plan from the old prototype_db.json."""
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.warning("Could not read legacy plan store %s: %s", legacy_path, e)
+            return
+        if LATEST in legacy:
+            self.create(legacy[LATEST], change="migrated from prototype_db.json")
@@ -2,25 +2,44 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
 import os
+import threading
 
-from src.web.routers.planning import plan_store
+from src.web.routers.planning import plans
+from src.web.plan_repository import LATEST
 from sandbox.decomposer import ImageDecomposer
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 decomposer = None
+_decomposer_lock = threading.Lock()
 
 def get_decomposer():
+    """
+    Shared decomposer. Construction is cheap; models load on first use or warm-up.
+    DECOMPOSER_SINGLE_PASS_INPAINT=1 inpaints once at the end, so SAM segments the image with its
+    text still in place and object cut-outs include any text pixels overlapping them.
+    DECOMPOSER_ROI_INPAINT=1 inpaints only tiles around masked regions.
+    """
     global decomposer
-    if decomposer is None:
-        decomposer = ImageDecomposer()
+    with _decomposer_lock:
+        if decomposer is None:
+            analysis_max_side = int(os.environ.get("DECOMPOSER_ANALYSIS_MAX_SIDE", "0")) or None
+            decomposer = ImageDecomposer(
+                single_pass_inpaint=os.environ.get("DECOMPOSER_SINGLE_PASS_INPAINT", "0") == "1",
+                roi_inpaint=os.environ.get("DECOMPOSER_ROI_INPAINT", "0") == "1",
+                analysis_max_side=analysis_max_side,
+            )
     return decomposer
 
 @router.get("/decompose/{post_id}")
 async def decompose_image(post_id: str):
-    if "latest" not in plan_store or post_id not in plan_store["latest"]["assets"]:
+    record = plans.get(LATEST)
+    if record is None or post_id not in record["assets"]:
         raise HTTPException(status_code=404, detail="Post or asset not found")
         
-    asset_path = plan_store["latest"]["assets"][post_id]
+    asset_path = record["assets"][post_id]
     
     # Resolve path (Handle storage update)
     if not os.path.exists(asset_path):
@@ -38,5 +57,5 @@ async def decompose_image(post_id: str):
         return result.to_dict()
         
     except Exception as e:
-        print(f"Error decomposing image: {e}")
+        logger.exception("Error decomposing image: %s", e, extra={"post_id": post_id})
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,35 +1,48 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+import asyncio
+import os
+import re
+import tempfile
+import uuid
 
 from src.monthly_production.agent import MonthlyProductionAgent
 from src.monthly_production.schemas import CompanyContext, MonthPlan, CompanyStage, TonePreference
 from sandbox.executor import ContentExecutor
+from sandbox.audit_log import default_audit_log
+from src.web.plan_repository import PlanRepository, LATEST
+from src.mnemosyne.core.log import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
-import json
-import os
+# Per-plan persistence with an in-memory read index (migrates storage/prototype_db.json on first run)
+plans = PlanRepository()
 
-DB_PATH = "storage/prototype_db.json"
+ASSET_DIR = "generated_assets"
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+POST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
 
-def load_db():
-    if os.path.exists(DB_PATH):
-        try:
-            with open(DB_PATH, "r") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+# Magic numbers of accepted image formats -> file extension
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+]
 
-def save_db(data):
-    # Ensure storage dir exists
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    with open(DB_PATH, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+def edit_asset_name(post_id: str, extension: str) -> str:
+    """A fresh file name per edit: plan history keeps pointing at the asset each version used."""
+    return f"sandbox_output_EDIT_{post_id}_{uuid.uuid4().hex[:8]}.{extension}"
 
-# Load on startup
-plan_store = load_db() 
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """Identifies the image format from its first bytes without decoding the image."""
+    for signature, extension in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
 
 class GenerateRequest(BaseModel):
     name: str
@@ -58,39 +71,40 @@ async def generate_plan(request: GenerateRequest):
         generated_assets = {}
         
         for post in plan.posts:
-            print(f"Generating assets for {post.id}...")
+            logger.info("Generating assets", extra={"post_id": post.id})
             assets = executor.generate_assets(post)
             # Store just the path for the UI (Accessing the first variant)
             if assets:
                 generated_assets[post.id] = assets[0].path
             
         # 5. Store Result
-        plan_store["latest"] = {
+        plan_id = plans.create({
             "plan": plan.model_dump(mode='json'), # Ensure serialization
             "assets": generated_assets
-        }
-        save_db(plan_store)
+        })
         
-        return {"status": "success", "plan_id": "latest"}
+        return {"status": "success", "plan_id": plan_id}
     
     except Exception as e:
-        print(f"Error generating plan: {e}")
+        logger.exception("Error generating plan: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/latest")
 async def get_latest_plan():
-    if "latest" not in plan_store:
+    record = plans.get(LATEST)
+    if record is None:
         raise HTTPException(status_code=404, detail="No plan generated yet")
-    return plan_store["latest"]
+    return record
 
 class EditRequest(BaseModel):
     post_id: str
     image_data: str # Base64
     change_description: str
+    plan_id: str = LATEST
 
 @router.post("/edit/save")
 async def save_edit(request: EditRequest):
-    if "latest" not in plan_store:
+    if plans.get(request.plan_id) is None:
         raise HTTPException(status_code=404, detail="No plan found")
     
     # 1. Decode and Save Image
@@ -105,23 +119,100 @@ async def save_edit(request: EditRequest):
             encoded = request.image_data
             
         data = base64.b64decode(encoded)
-        # Fix: Save to generated_assets directory
-        basename = f"sandbox_output_EDIT_{request.post_id}.png"
+        # Fix: Save to generated_assets directory (one file per edit, so plan history keeps earlier ones)
+        basename = edit_asset_name(request.post_id, "png")
         filename = os.path.join("generated_assets", basename)
         
         with open(filename, "wb") as f:
             f.write(data)
             
         # 2. Update Store (Store only basename for Frontend compatibility)
-        plan_store["latest"]["assets"][request.post_id] = basename
-        save_db(plan_store)
+        plans.update(
+            request.plan_id,
+            lambda record: record["assets"].__setitem__(request.post_id, basename),
+            change=f"edit {request.post_id}: {request.change_description}"
+        )
         
         # 3. Log Override (Traceability)
         # In a real system, we'd persist this to the MemoryManager's override log.
-        print(f"[HUMAN_OVERRIDE] Post: {request.post_id} | Action: {request.change_description} | New Asset: {filename}")
+        logger.info("HUMAN_OVERRIDE", extra={"post_id": request.post_id, "action": request.change_description, "asset": filename})
         
         return {"status": "success", "new_asset": filename}
         
     except Exception as e:
-        print(f"Error saving edit: {e}")
+        logger.exception("Error saving edit: %s", e, extra={"post_id": request.post_id})
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/audit/prompts/{post_id}")
+async def get_prompt_audit(post_id: str):
+    """Compliance lookup: every prompt compiled for a post (brief), oldest first."""
+    records = default_audit_log().lookup(post_id)
+    if not records:
+        raise HTTPException(status_code=404, detail="No audit records for this post")
+    return {"post_id": post_id, "records": records}
+
+@router.get("/{plan_id}")
+async def get_plan(plan_id: str):
+    record = plans.get(plan_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return record
+
+@router.get("/{plan_id}/history")
+async def get_plan_history(plan_id: str):
+    if plans.get(plan_id) is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return {"plan_id": plans.resolve(plan_id), "versions": plans.history(plan_id)}
+
+@router.post("/edit/upload/{post_id}")
+async def upload_edit(post_id: str, request: Request, change_description: str = "Manual edit", plan_id: str = LATEST):
+    """
+    Streaming variant of /edit/save: the request body is the raw image (e.g. Content-Type: image/png).
+    Chunks go straight to a temp file in generated_assets, which is renamed into place once complete.
+    """
+    if not POST_ID_PATTERN.match(post_id):
+        raise HTTPException(status_code=400, detail="Invalid post id")
+    if plans.get(plan_id) is None:
+        raise HTTPException(status_code=404, detail="No plan found")
+
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=ASSET_DIR, prefix=".upload_", suffix=".part", delete=False)
+    try:
+        header = b""
+        extension = None
+        size = 0
+        with tmp:
+            async for chunk in request.stream():
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Image too large")
+                if extension is None:
+                    header += chunk[:12]
+                    if len(header) >= 12:
+                        extension = sniff_image_type(header)
+                        if extension is None:
+                            raise HTTPException(status_code=415, detail="Unsupported image format")
+                # File writes block; keep them off the event loop
+                await asyncio.to_thread(tmp.write, chunk)
+        if extension is None:
+            extension = sniff_image_type(header)
+            if extension is None:
+                raise HTTPException(status_code=415, detail="Unsupported image format")
+
+        basename = edit_asset_name(post_id, extension)
+        filename = os.path.join(ASSET_DIR, basename)
+        os.replace(tmp.name, filename)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+        raise
+
+    def set_asset(record):
+        record["assets"][post_id] = basename
+
+    plans.update(plan_id, set_asset, change=f"edit {post_id}: {change_description}")
+
+    logger.info("HUMAN_OVERRIDE", extra={"post_id": post_id, "action": change_description, "asset": filename, "bytes": size})
+    return {"status": "success", "new_asset": filename}